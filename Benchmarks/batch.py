@@ -0,0 +1,39 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.lexer import LexLinear
+from Interpreter.parser import Parse
+from Interpreter.vectorize import RunBatch, ScalarBatch
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+Program = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.AAP")
+
+def Measure(run: Callable, rows: List[List[int]]) -> Tuple[float, List[str]]:
+    """ Call sommig for every row and measure the time.
+    Haskell notation:
+        Measure :: Callable -> [Integer] -> Tuple
+    Parameters:
+        run (Callable): RunBatch or ScalarBatch.
+        rows (Lst): The arguments of every call.
+    Returns:
+        seconds (float): The time it took to call the function for all rows.
+        results (Lst): The results of the calls as text.
+    """
+    with open(Program) as file:
+        ast = Parse(LexLinear(text=file.readlines()), index=0)
+    start = perf_counter()
+    results = run(ast, "sommig", rows)
+    seconds = perf_counter() - start
+    return seconds, list(map(repr, results))
+
+if __name__ == '__main__':
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = list(map(lambda index: [index % 100], range(amount)))
+    scalar, scalarResults = Measure(ScalarBatch, rows)
+    batch, batchResults = Measure(RunBatch, rows)
+    if scalarResults != batchResults:
+        raise Exception("The results of RunBatch and the interpreter are different..")
+    print(f"{'rows':>10} {'scalar':>10} {'batch':>10} {'speedup':>10}")
+    print(f"{amount:>10} {scalar:>10.2f} {batch:>10.2f} {scalar / batch:>9.1f}x")
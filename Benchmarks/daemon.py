@@ -0,0 +1,58 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client import Request
+from time import perf_counter, sleep
+import subprocess
+import tempfile
+
+Root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+Program = os.path.join(Root, "main.AAP")
+
+def MeasureProcess(amount: int) -> float:
+    """ Measure the time of interpreting main.AAP with a new Python process, like every call without the server.
+    Haskell notation:
+        MeasureProcess :: Integer -> Float
+    Parameters:
+        amount (int): The amount of processes.
+    Returns:
+        time (float): The average time of a process in milliseconds.
+    """
+    start = perf_counter()
+    list(map(lambda index: subprocess.run([sys.executable, os.path.join(Root, "main.py"), Program], capture_output=True), range(amount)))
+    return (perf_counter() - start) / amount * 1000
+
+def MeasureServer(path: str, amount: int, connections: bool) -> float:
+    """ Measure the time of calling sommig on a running server.
+    Haskell notation:
+        MeasureServer :: String -> Integer -> Boolean -> Float
+    Parameters:
+        path (str): The path of the socket of the server.
+        amount (int): The amount of requests.
+        connections (bool): Whether every request opens its own connection, otherwise all requests share one.
+    Returns:
+        time (float): The average time of a request in milliseconds.
+    """
+    requests = list(map(lambda index: {"file": Program, "function": "sommig", "arguments": [index % 10]}, range(amount)))
+    start = perf_counter()
+    if connections:
+        list(map(lambda request: Request(path, [request]), requests))
+    else:
+        Request(path, requests)
+    return (perf_counter() - start) / amount * 1000
+
+if __name__ == '__main__':
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    path = os.path.join(tempfile.mkdtemp(), "aap.sock")
+    server = subprocess.Popen([sys.executable, os.path.join(Root, "main.py"), f"--serve={path}", "--workers=1"])
+    try:
+        while not os.path.exists(path):
+            sleep(0.05)
+        Request(path, [{"file": Program, "function": "sommig", "arguments": [1]}])
+        print(f"{'new process':>20} {MeasureProcess(10):>10.3f} ms")
+        print(f"{'connection':>20} {MeasureServer(path, amount, True):>10.3f} ms")
+        print(f"{'shared connection':>20} {MeasureServer(path, amount, False):>10.3f} ms")
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,57 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.context import Context, SymbolDictionary
+from Interpreter.interpreter import VisitNode
+from Interpreter.function import Function
+from Interpreter.lexer import LexLinear
+from Interpreter.parser import Parse
+from Interpreter.vm import Execute
+from Interpreter.closures import Evaluate
+from Interpreter.shortcircuit import ShortCircuit
+from time import perf_counter
+from typing import Callable, Tuple
+
+Engines = {"tree": VisitNode, "vm": Execute, "closures": Evaluate}
+Program = os.path.join(os.path.dirname(os.path.abspath(__file__)), "guards.AAP")
+
+def Measure(iterations: int, execute: Callable = VisitNode, shortCircuit: bool = False) -> Tuple[float, str]:
+    """ Run the guard benchmark and measure the time.
+    Haskell notation:
+        Measure :: Integer -> Callable -> Boolean -> Tuple
+    Every iteration evaluates an Or whose left side is true and an And whose left side is false,
+    the right side of both calls a function. Only the execution is measured.
+    Parameters:
+        iterations (int): The amount of iterations of the loop.
+        execute (Callable): The engine which interprets the AST.
+        shortCircuit (bool): Whether the right side is skipped when the left side decides the result.
+    Returns:
+        seconds (float): The time it took to run the loop.
+        result (str): The numbers which the program results in, the function is left out.
+    """
+    with open(Program) as file:
+        text = list(map(lambda line: line.replace("100000", str(iterations)), file.readlines()))
+    ast = Parse(LexLinear(text=text), index=0)
+    if shortCircuit:
+        ast = ShortCircuit(ast)
+    context = Context()
+    context.symbolDictionary = SymbolDictionary()
+
+    start = perf_counter()
+    result = execute(ast, context)
+    seconds = perf_counter() - start
+    return seconds, repr(list(filter(lambda value: not isinstance(value, Function), result)))
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'engine':>10} {'seconds':>10} {'short':>10} {'speedup':>10}")
+
+    def Compare(engine: str) -> None:
+        """ Run the benchmark with and without short circuiting and check whether the results are the same. """
+        seconds, result = Measure(iterations, Engines[engine])
+        short, shortResult = Measure(iterations, Engines[engine], True)
+        if result != shortResult:
+            raise Exception(f"The results of {engine} are different: {result} and {shortResult}..")
+        print(f"{engine:>10} {seconds:>10.2f} {short:>10.2f} {seconds / short:>9.1f}x")
+    list(map(Compare, Engines))
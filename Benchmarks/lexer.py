@@ -0,0 +1,55 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.compact import LexCompact
+from Interpreter.lexer import GenerateTokens, LexLinear
+from itertools import islice, cycle
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, List
+
+Program = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.AAP")
+
+def Lines(amount: int) -> List[str]:
+    """ Create a program by repeating the lines of main.AAP.
+    Haskell notation:
+        Lines :: Integer -> [String]
+    Parameters:
+        amount (int): The amount of lines.
+    Returns:
+        lines (Lst): The lines of the program.
+    """
+    with open(Program) as file:
+        lines = list(map(lambda line: line.rstrip("\n") + "\n", file.readlines()))
+    return list(islice(cycle(lines), amount))
+
+def Measure(lex: Callable[[str], Any], filename: str) -> float:
+    """ Measure the time it takes to lex a file.
+    Haskell notation:
+        Measure :: Callable -> String -> Float
+    Parameters:
+        lex (Callable): The lexer, it gets the filename and has to read all tokens.
+        filename (str): The name of the .AAP file.
+    Returns:
+        seconds (float): The time it took to lex the file.
+    """
+    start = perf_counter()
+    lex(filename)
+    return perf_counter() - start
+
+Lexers = {
+    "linear": lambda filename: LexLinear(filename=filename),
+    "compact": lambda filename: LexCompact(filename=filename),
+    "stream": lambda filename: list(GenerateTokens(filename)),
+}
+
+if __name__ == '__main__':
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "lexer.AAP")
+        with open(filename, "w") as file:
+            file.write("".join(Lines(amount)))
+        print(f"{'lexer':<10} {'lines':>10} {'seconds':>10} {'lines/s':>12}")
+        results = map(lambda name: (name, Measure(Lexers[name], filename)), Lexers)
+        list(map(lambda result: print(f"{result[0]:<10} {amount:>10} {result[1]:>10.2f} {amount / result[1]:>12.0f}"), results))
@@ -0,0 +1,67 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Compiler.allocator import Branches, IsLabel, Parse
+from Compiler.compiler import Compiler, Passes
+from Compiler.loops import OptimizeLoops
+from Compiler.peephole import Cycles
+from Interpreter.compact import LexCompact
+from Interpreter.compactparser import ParseCompact
+from Interpreter.optimizer import IsImmediate, Optimize
+from glob import glob
+from itertools import chain
+from tempfile import TemporaryDirectory
+from typing import List
+
+Directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "MicroController", "Functions", "AAP")
+
+def CompileLines(filename: str, loops: bool) -> List[str]:
+    """ Compile the first function of a .AAP file and read the assembler lines.
+    Haskell notation:
+        CompileLines :: String -> Boolean -> [String]
+    Parameters:
+        filename (str): The name of the .AAP file.
+        loops (bool): Whether the loops are optimized.
+    Returns:
+        lines (Lst): The lines of the assembler file.
+    """
+    ast = Optimize(ParseCompact(LexCompact(filename=filename), index=0), IsImmediate)
+    passes = Passes if loops else list(filter(lambda optimize: optimize != OptimizeLoops, Passes))
+    with TemporaryDirectory() as directory:
+        output = os.path.join(directory, "loops.asm")
+        Compiler(ast.elements[0], passes).Compile(ast, output)
+        with open(output) as file:
+            return file.readlines()
+
+def IterationCycles(lines: List[str]) -> List[int]:
+    """ Count the cycles of a single iteration of every loop in an assembler file.
+    Haskell notation:
+        IterationCycles :: [String] -> [Integer]
+    A loop is a branch back to an earlier label. Every instruction from that label to the branch is
+    counted once, the branch back is taken and the other conditional branches aren't.
+    Parameters:
+        lines (Lst): The lines of the assembler file.
+    Returns:
+        cycles (Lst): The cycles of every loop.
+    """
+    labels = dict(map(lambda index: (Parse(lines[index])[0][:-1], index), filter(lambda index: IsLabel(lines[index]), range(len(lines)))))
+    backwards = filter(lambda index: Parse(lines[index])[0] in Branches and labels.get(Parse(lines[index])[1][0], index) < index, range(len(lines)))
+
+    def Iteration(branch: int) -> int:
+        """ Count the cycles from the label of a branch back up to and including the branch. """
+        body = lines[labels[Parse(lines[branch])[1][0]]:branch]
+        return sum(map(lambda line: 1 if Parse(line)[0] in Branches - {"B"} else Cycles(line), body)) + Cycles(lines[branch])
+    return list(map(Iteration, backwards))
+
+if __name__ == '__main__':
+    sources = sys.argv[1:] or [Directory]
+    files = sorted(chain.from_iterable(map(lambda source: glob(os.path.join(source, "*.AAP")) if os.path.isdir(source) else [source], sources)))
+    print(f"{'function':<24} {'loop':>6} {'before':>10} {'after':>10}")
+
+    def Compare(filename: str) -> None:
+        """ Print the cycles of every loop of a file without and with the loop optimizations. """
+        before, after = IterationCycles(CompileLines(filename, False)), IterationCycles(CompileLines(filename, True))
+        name = os.path.splitext(os.path.basename(filename))[0]
+        list(map(lambda loop, cycles: print(f"{name:<24} {loop:>6} {cycles[0]:>10} {cycles[1]:>10}"), range(len(before)), zip(before, after)))
+    list(map(Compare, files))
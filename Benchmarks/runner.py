@@ -0,0 +1,39 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.interpreter import VisitNode
+from Interpreter.lexer import LexLinear
+from Interpreter.parser import Parse
+from Interpreter.runner import StreamResults
+from time import perf_counter
+
+Program = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.AAP")
+
+def ReadLinear(filename: str) -> 'ListNode':
+    """ Read a .AAP file with the linear lexer. """
+    with open(filename) as file:
+        return Parse(LexLinear(text=file.readlines()), index=0)
+
+def Measure(amount: int, workers: int) -> float:
+    """ Call sommig in a batch and measure the amount of jobs per second.
+    Haskell notation:
+        Measure :: Integer -> Integer -> Float
+    Parameters:
+        amount (int): The amount of jobs.
+        workers (int): The amount of worker processes.
+    Returns:
+        throughput (float): The amount of finished jobs per second, including the start of the workers.
+    """
+    jobs = list(map(lambda index: (Program, "sommig", [index % 500]), range(amount)))
+    start = perf_counter()
+    lines = list(StreamResults(jobs, ReadLinear, VisitNode, True, 0, workers))
+    return len(lines) / (perf_counter() - start)
+
+if __name__ == '__main__':
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    counts = sorted(set([1, 2, os.cpu_count() or 1]))
+    print(f"{'workers':>10} {'jobs/s':>10} {'scaling':>10}")
+    base = Measure(amount, 1)
+    results = map(lambda workers: (workers, base if workers == 1 else Measure(amount, workers)), counts)
+    list(map(lambda result: print(f"{result[0]:>10} {result[1]:>10.0f} {result[1] / base:>9.2f}x"), results))
@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Interpreter.context import Context, SymbolDictionary
+from Interpreter.interpreter import VisitNode
+from Interpreter.lexer import LexLinear
+from Interpreter.parser import Parse
+from Interpreter.vm import Execute
+from Interpreter.closures import Evaluate
+from time import perf_counter
+from typing import Callable, Tuple
+import tracemalloc
+
+Engines = {"tree": VisitNode, "vm": Execute, "closures": Evaluate}
+Program = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spin.AAP")
+
+def Measure(iterations: int, execute: Callable = VisitNode) -> Tuple[float, int]:
+    """ Run the SpinWhile benchmark and measure the time and the peak memory.
+    Haskell notation:
+        Measure :: Integer -> Callable -> Tuple
+    Only the execution is measured, the program is parsed before tracing starts.
+    Parameters:
+        iterations (int): The amount of iterations of the loop.
+        execute (Callable): The engine which interprets the AST.
+    Returns:
+        seconds (float): The time it took to run the loop.
+        peak (int): The highest amount of traced memory in bytes.
+    """
+    with open(Program) as file:
+        text = list(map(lambda line: line.replace("10000000", str(iterations)), file.readlines()))
+    ast = Parse(LexLinear(text=text), index=0)
+    context = Context()
+    context.symbolDictionary = SymbolDictionary()
+
+    tracemalloc.start()
+    start = perf_counter()
+    execute(ast, context)
+    seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+if __name__ == '__main__':
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    engine = sys.argv[2] if len(sys.argv) > 2 else "tree"
+    print(f"{'iterations':>12} {'seconds':>10} {'peak':>12}")
+    results = map(lambda amount: (amount, *Measure(amount, Engines[engine])), [1000, iterations])
+    list(map(lambda result: print(f"{result[0]:>12} {result[1]:>10.2f} {result[2]:>12}"), results))
@@ -0,0 +1,280 @@
+from Interpreter.loop import Iterate, Repeat
+from itertools import chain, count
+from typing import Dict, List, Optional, Set, Tuple
+import re
+
+Registers = ["R0", "R1", "R2", "R3", "R4", "R5", "R6", "R7"]
+Arguments = Registers[:4]
+Saved = Registers[4:]
+Accumulating = {"ADD", "ADDS", "SUB", "SUBS", "ADC", "ADCS", "SBC", "SBCS", "AND", "ANDS", "ORR", "ORRS", "EOR", "EORS", "BIC", "BICS", "MUL", "MULS"}
+Comparing = {"CMP", "CMN", "TST", "STR"}
+Branches = {"B", "BEQ", "BNE", "BGT", "BGE", "BLT", "BLE", "BHI", "BLS", "BCS", "BCC", "BHS", "BLO", "BMI", "BPL", "BVS", "BVC"}
+Moves = {"MOV", "MOVS"}
+
+def Call(function: str, arguments: List[str]) -> str:
+    """ Create the instruction which calls a function.
+    Haskell notation notation:
+        Call :: String -> [String] -> String
+    The registers of the arguments are written in a comment after the call, so the allocator
+    knows which of R0-R3 are read by the call.
+    Parameters:
+        function (str): The name of the function.
+        arguments (Lst): The registers which contain the arguments, R0-R3.
+    Returns:
+        instruction (str): The BL instruction.
+    """
+    if not arguments:
+        return f"\tBL  \t{function}\n"
+    return f"\tBL  \t{function}\t@ {', '.join(arguments)}\n"
+
+def Parse(instruction: str) -> Tuple[str, List[str]]:
+    """ Split an instruction into its operation and operands.
+    Haskell notation notation:
+        Parse :: String -> (String, [String])
+    Parameters:
+        instruction (str): The instruction, like "\tADD \tV3, V1, V2\n" or "LOOP:\n".
+    Returns:
+        operation (str): The operation, a label keeps its colon.
+        operands (Lst): The operands, [SP, #4] and { R4, LR } are single operands.
+    """
+    text = instruction.split("@")[0].strip()
+    operation, operands = (re.split(r"\s+", text, 1) + [""])[:2]
+    return operation.upper(), list(map(str.strip, re.findall(r"\[[^\]]*\]|\{[^}]*\}|[^,\s][^,]*", operands)))
+
+def IsRegister(operand: str) -> bool:
+    """ Check whether an operand is a low register or a virtual register, like R3 or V12. """
+    return re.fullmatch(r"R[0-7]|V\d+", operand) != None
+
+def IsLabel(instruction: str) -> bool:
+    """ Check whether an instruction is a label. """
+    return Parse(instruction)[0].endswith(":")
+
+def Effects(instruction: str) -> Tuple[Set[str], Set[str]]:
+    """ Get the registers which an instruction reads and writes.
+    Haskell notation notation:
+        Effects :: String -> (Set, Set)
+    A call reads the registers of its arguments and overwrites R0-R3. An accumulating operation
+    with two operands, like ADD V1, #1 or MUL V1, V2, reads its first operand as well.
+    Parameters:
+        instruction (str): The instruction.
+    Returns:
+        uses (Set): The registers which are read.
+        defines (Set): The registers which are written.
+    """
+    operation, operands = Parse(instruction)
+    registers = list(filter(IsRegister, operands))
+    if operation == "BL":
+        return set(re.findall(r"R[0-3]", instruction.partition("@")[2])), set(Arguments)
+    elif operation in Comparing or operation in Branches:
+        return set(registers), set()
+    elif operation in Accumulating and len(operands) == 2:
+        return set(registers), set(registers[:1])
+    return set(registers[1:]), set(registers[:1])
+
+def Successors(instructions: List[str]) -> List[List[int]]:
+    """ Get the indices of the instructions which can be executed after every instruction.
+    Haskell notation notation:
+        Successors :: [String] -> [[Integer]]
+    The index after the last instruction stands for the end of the function.
+    Parameters:
+        instructions (Lst): The instructions of a function.
+    Returns:
+        successors (Lst): The successors of every instruction.
+    """
+    labels = dict(map(lambda index: (Parse(instructions[index])[0][:-1], index), filter(lambda index: IsLabel(instructions[index]), range(len(instructions)))))
+
+    def Next(index: int) -> List[int]:
+        """ Get the successors of a single instruction. """
+        operation, operands = Parse(instructions[index])
+        if operation == "B":
+            return [labels[operands[0]]]
+        elif operation in Branches:
+            return [labels[operands[0]], index + 1]
+        return [index + 1]
+    return list(map(Next, range(len(instructions))))
+
+def Liveness(instructions: List[str], exit: Set[str]) -> Tuple[List[Set[str]], List[Set[str]]]:
+    """ Find the registers which are live before and after every instruction.
+    Haskell notation notation:
+        Liveness :: [String] -> Set -> ([Set], [Set])
+    A register is live when its value can still be read. The instructions are visited from the
+    last to the first until nothing changes, which is needed for the loops.
+    Parameters:
+        instructions (Lst): The instructions of a function.
+        exit (Set): The registers which are live at the end of the function, like R0 for the result.
+    Returns:
+        liveIn (Lst): The live registers before every instruction.
+        liveOut (Lst): The live registers after every instruction.
+    """
+    effects = list(map(Effects, instructions))
+    successors = Successors(instructions)
+    liveIn = list(map(lambda _: set(), instructions)) + [set(exit)]
+
+    def Out(index: int) -> Set[str]:
+        """ Get the live registers after an instruction. """
+        return set(chain.from_iterable(map(lambda successor: liveIn[successor], successors[index])))
+
+    def Pass(_: None) -> bool:
+        """ Update every instruction once, returns whether anything changed. """
+        def Update(index: int) -> bool:
+            """ Update the live registers before a single instruction. """
+            uses, defines = effects[index]
+            live = uses | (Out(index) - defines)
+            changed = live != liveIn[index]
+            liveIn[index] = live
+            return changed
+        return any(list(map(Update, reversed(range(len(instructions))))))
+    Repeat(Pass, None)
+    return liveIn[:-1], list(map(Out, range(len(instructions))))
+
+def Positions(instructions: List[str], exit: Set[str]) -> Dict[str, Set[int]]:
+    """ Find the positions where every register is live.
+    Haskell notation notation:
+        Positions :: [String] -> Set -> Dict
+    Instruction i reads its registers at position 2i and writes them at position 2i + 1, so a
+    register which is read for the last time can be written by the same instruction.
+    Parameters:
+        instructions (Lst): The instructions of a function.
+        exit (Set): The registers which are live at the end of the function.
+    Returns:
+        positions (Dict): The positions of every register.
+    """
+    liveIn, liveOut = Liveness(instructions, exit)
+    effects = list(map(Effects, instructions))
+    points = chain.from_iterable(map(lambda index: chain(
+        map(lambda register: (register, 2 * index - 1), liveIn[index]),
+        map(lambda register: (register, 2 * index), effects[index][0]),
+        map(lambda register: (register, 2 * index + 1), effects[index][1] | liveOut[index])), range(len(instructions))))
+    positions = {}
+    list(map(lambda point: positions.setdefault(point[0], set()).add(point[1]), points))
+    return positions
+
+def Hints(instructions: List[str]) -> Dict[str, List[str]]:
+    """ Find the registers which are moved into each other, they are allocated to the same register when possible. """
+    moves = filter(lambda operands: len(operands) == 2 and all(map(IsRegister, operands)),
+                   map(lambda instruction: Parse(instruction)[1], filter(lambda instruction: Parse(instruction)[0] in Moves, instructions)))
+    hints = {}
+    list(map(lambda operands: (hints.setdefault(operands[0], []).append(operands[1]), hints.setdefault(operands[1], []).append(operands[0])), moves))
+    return hints
+
+def LinearScan(positions: Dict[str, Set[int]], hints: Dict[str, List[str]], unspillable: Set[str]) -> Tuple[Dict[str, str], Set[str]]:
+    """ Allocate a register to every virtual register with linear scan.
+    Haskell notation notation:
+        LinearScan :: Dict -> Dict -> Set -> (Dict, Set)
+    The virtual registers are visited in the order in which they become live. Their intervals
+    have holes, so a register can be shared by values which are never live at the same position.
+    A virtual register gets the register of a move partner when it is free, otherwise the first
+    free one, so R0-R3 are preferred and R4-R7 only have to be saved when more values are live at
+    once. A register isn't free while it is used for a call, an argument or the result, so values
+    which live across a call end up in R4-R7. When no register is free, the value which stays live
+    the longest is spilled.
+    Parameters:
+        positions (Dict): The positions of every register, see Positions.
+        hints (Dict): The move partners of every register, see Hints.
+        unspillable (Set): The virtual registers which load or store a spilled value, they can't be spilled again.
+    Returns:
+        allocation (Dict): The register of every virtual register which isn't spilled.
+        spilled (Set): The virtual registers which have to be spilled.
+    """
+    intervals = dict(map(lambda register: (register, (min(positions[register]), max(positions[register]))), filter(lambda register: register not in Registers, positions)))
+    fixed = dict(map(lambda register: (register, positions.get(register, set())), Registers))
+    allocation = {}
+    spilled = set()
+    active = []
+
+    def Holders(register: str, virtual: str) -> List[str]:
+        """ Get the active virtual registers which use the register while the virtual register is live. """
+        return list(filter(lambda other: allocation[other] == register and positions[other] & positions[virtual], active))
+
+    def Allocate(virtual: str) -> None:
+        """ Allocate a register to a single virtual register. """
+        start, end = intervals[virtual]
+        active[:] = list(filter(lambda other: intervals[other][1] >= start, active))
+        preferred = list(map(lambda hint: allocation.get(hint, hint), hints.get(virtual, [])))
+        possible = list(filter(lambda register: register in Registers and not fixed[register] & positions[virtual], chain(preferred, Registers)))
+        free = list(filter(lambda register: not Holders(register, virtual), possible))
+        if free:
+            allocation[virtual] = free[0]
+            active.append(virtual)
+            return
+        candidates = list(chain.from_iterable(filter(lambda holders: len(holders) == 1 and holders[0] not in unspillable, map(lambda register: Holders(register, virtual), possible))))
+        victim = max(candidates, key=lambda other: intervals[other][1], default=None)
+        if victim == None and virtual in unspillable:
+            raise Exception(f"Not enough registers to compile the instructions which use {virtual}..")
+        elif victim == None or (virtual not in unspillable and intervals[victim][1] <= end):
+            spilled.add(virtual)
+            return
+        allocation[virtual] = allocation.pop(victim)
+        active.remove(victim)
+        active.append(virtual)
+        spilled.add(victim)
+    list(map(Allocate, sorted(intervals, key=lambda register: intervals[register])))
+    return allocation, spilled
+
+def Spill(instructions: List[str], spilled: Set[str], slots: Dict[str, int], unspillable: Set[str]) -> List[str]:
+    """ Keep spilled virtual registers in stack slots.
+    Haskell notation notation:
+        Spill :: [String] -> Set -> Dict -> Set -> [String]
+    Every instruction which reads a spilled register loads it into a new virtual register first,
+    every instruction which writes it stores the new virtual register afterwards. Those new
+    registers are only live for a single instruction, so they can't be spilled.
+    Parameters:
+        instructions (Lst): The instructions of a function.
+        spilled (Set): The virtual registers which are spilled.
+        slots (Dict): The stack slot of every spilled virtual register, new slots are added.
+        unspillable (Set): The registers which can't be spilled, the new virtual registers are added.
+    Returns:
+        instructions (Lst): The instructions with the loads and stores.
+    """
+    numbers = count(max(map(int, re.findall(r"\bV(\d+)\b", "".join(instructions))), default=0) + 1)
+    list(map(lambda virtual: slots.setdefault(virtual, len(slots)), sorted(spilled)))
+
+    def Rewrite(instruction: str) -> List[str]:
+        """ Load and store the spilled registers of a single instruction. """
+        uses, defines = Effects(instruction)
+        replaced = sorted((uses | defines) & spilled)
+        if not replaced:
+            return [instruction]
+        temporaries = dict(map(lambda virtual: (virtual, f"V{next(numbers)}"), replaced))
+        unspillable.update(temporaries.values())
+        loads = map(lambda virtual: f"\tLDR \t{temporaries[virtual]}, [SP, #{4 * slots[virtual]}]\n", filter(lambda virtual: virtual in uses, replaced))
+        stores = map(lambda virtual: f"\tSTR \t{temporaries[virtual]}, [SP, #{4 * slots[virtual]}]\n", filter(lambda virtual: virtual in defines, replaced))
+        return [*loads, Rename(instruction, temporaries), *stores]
+    return list(chain.from_iterable(map(Rewrite, instructions)))
+
+def Rename(instruction: str, registers: Dict[str, str]) -> str:
+    """ Replace the virtual registers of an instruction, the target of a branch or call is left alone. """
+    if Parse(instruction)[0] in Branches or Parse(instruction)[0] == "BL":
+        return instruction
+    return re.sub(r"\bV\d+\b", lambda match: registers.get(match.group(0), match.group(0)), instruction)
+
+def Allocate(instructions: List[str], exit: Set[str]) -> Tuple[List[str], List[str], int]:
+    """ Replace the virtual registers of a function by R0-R7 and stack slots.
+    Haskell notation notation:
+        Allocate :: [String] -> Set -> ([String], [String], Integer)
+    The instructions are allocated with LinearScan. When registers are spilled, their loads and
+    stores are added and the instructions are allocated again, until nothing has to be spilled.
+    Moves of a register into itself are left out afterwards.
+    Parameters:
+        instructions (Lst): The instructions of a function, they may use R0-R3 for calls and virtual registers V0, V1, ... for everything else.
+        exit (Set): The registers which are live at the end of the function, like R0 for the result.
+    Returns:
+        instructions (Lst): The instructions which only use R0-R7 and the stack.
+        saved (Lst): The registers R4-R7 which are used, the function has to save them.
+        frame (int): The size of the stack slots in bytes.
+    """
+    slots = {}
+    unspillable = set()
+
+    def Round(state: Tuple[List[str], Optional[Dict[str, str]]]) -> Tuple[List[str], Optional[Dict[str, str]]]:
+        """ Allocate the instructions once, spilled registers give new instructions without an allocation. """
+        instructions, _ = state
+        allocation, spilled = LinearScan(Positions(instructions, exit), Hints(instructions), unspillable)
+        if spilled:
+            return Spill(instructions, spilled, slots, unspillable), None
+        return instructions, allocation
+    instructions, allocation = Iterate(Round, (instructions, None), lambda state: state[1] != None)
+    instructions = list(map(lambda instruction: Rename(instruction, allocation), instructions))
+    instructions = list(filter(lambda instruction: not (Parse(instruction)[0] in Moves and len(set(Parse(instruction)[1])) == 1), instructions))
+    saved = sorted(set(chain.from_iterable(map(lambda instruction: Effects(instruction)[1], instructions))) & set(Saved))
+    return instructions, saved, 4 * len(slots)
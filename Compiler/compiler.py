@@ -1,59 +1,67 @@
+from Compiler import ir
+from Compiler.allocator import Allocate, Arguments, Effects
 from Compiler.context import Context
 from Compiler.function import Function
+from Compiler.loops import OptimizeLoops
 from Compiler.number import Number
-from copy import copy
+from Compiler.peephole import Peephole
+from Compiler.thumb import Lower
 from functools import reduce, partial
 from Interpreter.nodes import *
 from itertools import chain
 from operator import is_not, add
+from typing import Callable, List
 import traceback
 
+Passes = [ir.RemoveUnreachable, ir.FoldImmediates, ir.FuseComparisons, ir.EliminateDeadCode, OptimizeLoops, ir.EliminateDeadCode]
+
 class Compiler():
-    def __init__(self, FunctionDefenitionNode: FunctionDefenitionNode) -> None:
+    def __init__(self, FunctionDefenitionNode: FunctionDefenitionNode, passes: List[Callable[[ir.Procedure], ir.Procedure]] = Passes) -> None:
         """ Initialize the instructions and context. 
         Haskell notation notation:
-            Init :: FunctionDefenitionNode -> None
+            Init :: FunctionDefenitionNode -> [Callable] -> None
         Parameters:
-            FunctionDefenitionNode (FunctionDefenitionNode): The function defenition node to write the name in the assembler file. """
-        self.instructions = [".cpu cortex-m0\n", ".text\n", ".align 2\n", f".global {FunctionDefenitionNode.token.value}\n\n", f'{FunctionDefenitionNode.token.value}:\n', set()]
+            FunctionDefenitionNode (FunctionDefenitionNode): The function defenition node to write the name in the assembler file.
+            passes (Lst): The passes which change the IR before it is lowered, in order. """
+        self.header = [".cpu cortex-m0\n", ".text\n", ".align 2\n", f".global {FunctionDefenitionNode.token.value}\n\n", f'{FunctionDefenitionNode.token.value}:\n']
         self.context = Context()
+        self.procedure = ir.Procedure(FunctionDefenitionNode.token.value, self.context)
+        self.passes = passes
+        self.savings = {}
         
     def Compile(self, ast: ListNode, output: str) -> None:
         """ Compile the Abstract Syntax Tree and write it to a file. 
         Haskell notation notation:
             Compile :: ListNode -> String -> None
+        The AST is compiled into the IR of Compiler.ir first, which is changed by the passes and lowered to Thumb
+        instructions with virtual registers, see Compiler.thumb. Those are allocated afterwards, see Compiler.allocator.
+        Only the registers R4-R7 which are used are pushed, the stack slots of spilled registers
+        are reserved below them. The allocated instructions are improved by Compiler.peephole, which
+        keeps what every rule saved in self.savings.
         Parameters:
             ast (ListNode): The AST which will be compiled.
             output (str): The name of the file where the assembler instructions will be written to.
         """
         self.VisitNode(ast, self.context)
+        self.procedure.Terminate(ir.Return(None))
+        procedure = reduce(lambda procedure, optimize: optimize(procedure), self.passes, self.procedure)
+        instructions, saved, frame = Allocate(Lower(procedure), {"R0"})
+        instructions, self.savings = Peephole(instructions, {"R0"})
+        saved = list(filter(lambda register: any(map(lambda instruction: register in Effects(instruction)[1], instructions)), saved))
 
-        registers = ["R4", "R5", "R6", "R7", "R8"]
-        try:
-            index: int = registers.index(max(self.instructions[5]))
-            usedRegisters: str = registers[0:index + 1]
-        except:
-            usedRegisters = []
-
-        usedRegisters: str = ', '.join(usedRegisters)
-        if len(usedRegisters) > 0:
-            popRegisters = f"\tPOP \t{{ {usedRegisters}, PC }}"
-            pushRegisters = f"\tPUSH \t{{ {usedRegisters}, LR }}\n"
-        else:
-            popRegisters = f"\tPOP \t{{ PC }}"
-            pushRegisters = f"\tPUSH \t{{ LR }}\n"
-        self.instructions.append(popRegisters)
-        self.instructions[5] = pushRegisters
+        pushRegisters = f"\tPUSH \t{{ {', '.join(saved + ['LR'])} }}\n"
+        popRegisters = f"\tPOP \t{{ {', '.join(saved + ['PC'])} }}"
+        reserve = [f"\tSUB \tSP, #{frame}\n"] if frame else []
+        release = [f"\tADD \tSP, #{frame}\n"] if frame else []
 
         with open(output, "w") as file:
-            self.instructions = map(lambda instruction:instruction, self.instructions)
-            file.writelines(self.instructions)
+            file.writelines(chain(self.header, [pushRegisters], reserve, instructions, release, [popRegisters]))
 
-    def VisitNode(self, node: 'AllNodes', context: Context = None) -> Union[FunctionCallNode, List[Number], Number]:
+    def VisitNode(self, node: 'AllNodes', context: Context = None) -> Union[List[Number], Number]:
         """ Visit the passed Node's function and compile this.
         Every node has a Visit{node} function which is responsible for compiling that node.
         Haskell notation notation:
-            VisitNode :: Node -> Context -> FunctionCallnode | [Number] | Number
+            VisitNode :: Node -> Context -> [Number] | Number
         Parameters:
             node (Node): The node which will be compiled.
             context (Context): The current existing context.
@@ -70,13 +78,13 @@ class Compiler():
             Returns:
                 number (Number): The result of compiling the NumberNode.
             """
-            register = context.registers.pop(0)
-            self.instructions[5].add(register)
-            self.instructions.append(f"\tMOVS\t{register}, #{node.token.value}\n")
+            register = self.procedure.NewRegister()
+            self.procedure.Emit(ir.Constant(register, node.token.value))
             return Number(node.token.value, context, register)
 
         def VisitReturnNode(node: ReturnNode, context: Context) -> Number:
             """ Compile a ReturnNode. 
+            The statements after the return are placed in a new block, which can't be reached.
             Haskell notation notation:
                 VisitReturnNode :: ReturnNode -> Context -> Number
             Parameters:
@@ -87,9 +95,8 @@ class Compiler():
             """
             if node.node:
                 result = self.VisitNode(node.node, context)
-                self.instructions.append("END:\n")
-                if result.register != "R0":
-                    self.instructions.append(f"\tMOVS\tR0, {result.register}\n")
+                self.procedure.Terminate(ir.Return(result.register))
+                self.procedure.Enter(self.procedure.NewBlock())
                 return result
         
         def VisitBinaryOperationNode(node: BinaryOperationNode, context: Context) -> Number:
@@ -106,15 +113,46 @@ class Compiler():
             right = self.VisitNode(node.right, context)
             method = getattr(left, f'{type(node.operator).__name__}')
             try:
-                return method(right, context, self.instructions)
+                return method(right, context, self.procedure)
             except Exception as ex:
                 template = "An exception of type {0} occurred. Arguments:\n{1!r}"
                 message = template.format(type(ex).__name__, ex.args)
                 print(message)
                 print(traceback.format_exc())
 
+        def VisitLogicalOperationNode(node: LogicalOperationNode, context: Context) -> Number:
+            """ Compile a LogicalOperationNode.
+            The result is set first, the branches skip the rest as soon as one side decides the result.
+            Haskell notation notation:
+                VisitLogicalOperationNode :: LogicalOperationNode -> Context -> Number
+            Parameters:
+                node (LogicalOperationNode): The LogicalOperationNode which will be compiled.
+                context (Context): The current existing context.
+            Returns:
+                number (Number): The result of compiling the LogicalOperationNode, either 1 (true) or 0 (false).
+            """
+            decided, other = (1, 0) if type(node.operator) == Or else (0, 1)
+            rightBlock, otherBlock, afterBlock = self.procedure.NewBlock(), self.procedure.NewBlock(), self.procedure.NewBlock()
+
+            def Decide(value: Number, following: ir.Block) -> None:
+                """ Branch to the end when the value decides the result, otherwise continue with the following block. """
+                self.procedure.Terminate(ir.Branch(value.register, afterBlock, following) if decided else ir.Branch(value.register, following, afterBlock))
+
+            resultRegister = self.procedure.NewRegister()
+            left = self.VisitNode(node.left, context)
+            self.procedure.Emit(ir.Copy(resultRegister, decided))
+            Decide(left, rightBlock)
+            self.procedure.Enter(rightBlock)
+            Decide(self.VisitNode(node.right, context), otherBlock)
+            self.procedure.Enter(otherBlock)
+            self.procedure.Emit(ir.Copy(resultRegister, other))
+            self.procedure.Terminate(ir.Jump(afterBlock))
+            self.procedure.Enter(afterBlock)
+            return Number(0, context, resultRegister)
+
         def VisitVariableAssignNode(node: VariableAssignNode, context: Context) -> Number:
             """ Compile a VariableAssignNode. 
+            Every variable has its own virtual register, the value is copied into it.
             Haskell notation notation:
                 VisitVariableAssignNode :: VariableAssignNode -> Context -> Number
             Parameters:
@@ -125,8 +163,12 @@ class Compiler():
             """
             name = node.token.value
             value = self.VisitNode(node.node, context)
-            context.symbolDictionary.SetValue(name, value)
-            return value
+            variable = context.symbolDictionary.GetValue(name)
+            if type(variable) != Number:
+                variable = Number(value.value, context, self.procedure.NewRegister())
+                context.symbolDictionary.SetValue(name, variable)
+            self.procedure.Emit(ir.Copy(variable.register, value.register))
+            return variable
 
         def VisitVariableAccessNode(node: VariableAccessNode, context: Context) -> Number:
             """ Compile a VariableAccessNode. 
@@ -180,6 +222,7 @@ class Compiler():
 
         def VisitIfNode(node: IfNode, context: Context) -> Number:
             """ Compile a IfNode. 
+            Both cases copy their value into the same register, without an else case the result is 0.
             Haskell notation notation:
                 VisitIfNode :: IfNode -> Context -> Number
             Parameters:
@@ -189,44 +232,51 @@ class Compiler():
                 number (Number): The result of compiling the IfNode.
             """
             condition, expression = node.case
-            registers = copy(context.registers)
             value = self.VisitNode(condition, context)
-            value = value
-            self.instructions.append(f"\tCMP \t{value.register}, #1\n")
-            afterIf = context.labels.pop(0)
-            afterElse = context.labels.pop(0)
-            self.instructions.append(f"\tBNE \t{afterIf}\n")
-            resultRegister = context.registers[0]
-            self.instructions[5].add(resultRegister)
-            result = self.VisitNode(expression, context)
-            remainingRegisters = context.registers
-            self.instructions.append(f"\tB   \t{afterElse}\n")
-            self.instructions.append(f"{afterIf}:\n")
-            context.registers = registers
+            thenBlock, elseBlock, afterBlock = self.procedure.NewBlock(), self.procedure.NewBlock(), self.procedure.NewBlock()
+            self.procedure.Terminate(ir.Branch(value.register, thenBlock, elseBlock))
+            result = Number(0, context, self.procedure.NewRegister())
+
+            def Result(value: Union[List[Number], Number, None]) -> None:
+                """ Copy the value of a case into the result, the last value of a list of statements. """
+                value = value[-1] if type(value) == list and value else value
+                if type(value) == Number:
+                    self.procedure.Emit(ir.Copy(result.register, value.register))
+
+            self.procedure.Enter(thenBlock)
+            Result(self.VisitNode(expression, context))
+            self.procedure.Terminate(ir.Jump(afterBlock))
+            self.procedure.Enter(elseBlock)
             if node.elseCase:
-                self.VisitNode(node.elseCase, context)
-                if type(node.elseCase) == FunctionCallNode:
-                    self.instructions.append(f"\tMOVS\t{resultRegister}, R0\n")
-            self.instructions.append(f"{afterElse}:\n")
-            context.registers = min(context.registers, remainingRegisters)
+                Result(self.VisitNode(node.elseCase, context))
+            else:
+                self.procedure.Emit(ir.Copy(result.register, 0))
+            self.procedure.Terminate(ir.Jump(afterBlock))
+            self.procedure.Enter(afterBlock)
             return result
 
         def VisitWhileNode(node: WhileNode, context: Context) -> None:
             """ Compile a WhileNode. 
+            The condition is checked before every iteration, the variables keep their registers.
             Haskell notation notation:
                 VisitWhileNode :: WhileNode -> Context -> None
             Parameters:
                 node (WhileNode): The WhileNode which will be compiled.
                 context (Context): The current existing context.
             """
-            self.instructions.append("LOOP:\n")
+            loopBlock, bodyBlock, afterBlock = self.procedure.NewBlock(), self.procedure.NewBlock(), self.procedure.NewBlock()
+            self.procedure.Terminate(ir.Jump(loopBlock))
+            self.procedure.Enter(loopBlock)
             condition = self.VisitNode(node.condition, context)
+            self.procedure.Terminate(ir.Branch(condition.register, bodyBlock, afterBlock))
+            self.procedure.Enter(bodyBlock)
             self.VisitNode(node.body, context)
-            self.instructions.append(f"\tCMP \t{condition.register}, #1\n")
-            self.instructions.append(f"\tBEQ \tLOOP\n")
+            self.procedure.Terminate(ir.Jump(loopBlock))
+            self.procedure.Enter(afterBlock)
 
         def VisitFunctionDefenitionNode(node: FunctionDefenitionNode, context: Context) -> Function:
             """ Compile a FunctionDefenitionNode.
+            The arguments arrive in R0-R3 and are copied into virtual registers.
             Haskell notation notation:
                 VisitFunctionDefenitionNode :: FunctionDefenitionNode -> Context -> Function
             Parameters:
@@ -238,25 +288,33 @@ class Compiler():
             function = Function(node.token.value, node.arguments, node.body, context) 
             if node.token:
                 context.symbolDictionary.SetValue(node.token.value, function)
-            arguments = list(map(lambda _: Number(0, context, context.registers.pop(0)), node.arguments))
+            if len(node.arguments) > len(Arguments):
+                raise Exception(f"{node.token.value} has {len(node.arguments)} arguments, only {len(Arguments)} fit in registers..")
+            arguments = list(map(lambda _: Number(0, context, self.procedure.NewRegister()), node.arguments))
+            self.procedure.arguments = list(map(lambda argument: argument.register, arguments))
             body, context = function.Compile(arguments, context)
             return self.VisitNode(body, context)
 
-        def VisitFunctionCallNode(node: FunctionCallNode, context: Context) -> None:
+        def VisitFunctionCallNode(node: FunctionCallNode, context: Context) -> Number:
             """ Compile a FunctionCallNode. 
             Haskell notation notation:
-                VisitFunctionCallNode :: FunctionCallNode -> Context -> None
+                VisitFunctionCallNode :: FunctionCallNode -> Context -> Number
             Parameters:
                 node (FunctionCallNode): The FunctionCallNode which will be compiled.
                 context (Context): The current existing context.
+            Returns:
+                number (Number): The result of the call.
             """
             arguments = [] 
             arguments = list(chain(*map(lambda node: [*arguments, self.VisitNode(node, context)], node.arguments)))
-            self.instructions.append(f"\tBL  \t{node.node.token.value}\n")
-            return self.instructions
+            if len(arguments) > len(Arguments):
+                raise Exception(f"{node.node.token.value} is called with {len(arguments)} arguments, only {len(Arguments)} fit in registers..")
+            result = Number(0, context, self.procedure.NewRegister())
+            self.procedure.Emit(ir.Call(result.register, node.node.token.value, list(map(lambda argument: argument.register, arguments))))
+            return result
         
         methodName: str = f'Visit{type(node).__name__}'
         method = locals()[methodName]
         return method(node, context)
 
-AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, VariableAccessNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAccessNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
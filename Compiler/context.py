@@ -1,8 +1,10 @@
 from Interpreter.nodes import Node
+from itertools import count
 from typing import Optional
 
 class Context:
-    """ This class contains the global symbols and the available registers. """
+    """ This class contains the global symbols, the virtual registers and the labels.
+    The virtual registers are replaced by R0-R7 and stack slots afterwards, see Compiler.allocator. """
     def __init__(self, parent: 'Context' = None) -> None:
         """ Initialize parent and create a SymbolDictionary. 
         Haskell notation notation:
@@ -13,8 +15,8 @@ class Context:
         self.parent = parent
         self.symbolDictionary = SymbolDictionary()
 
-        self.registers = ["R0", "R1", "R2", "R3", "R4", "R5", "R6", "R7"]
-        self.labels = [".L2", ".L4", ".L6", ".L8", ".L10"]
+        self.registers = map(lambda number: f"V{number}", count())
+        self.labels = map(lambda number: f".L{number}", count(2, 2))
 
 class SymbolDictionary:
     def __init__(self, parent: 'SymbolDictionary'=None) -> None:
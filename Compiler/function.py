@@ -35,7 +35,7 @@ class Function:
         elif len(arguments) < len(self.arguments):
             raise Exception(f"Too little arguments given for {FunctionDef.value} {self.name}.. Expected {len(self.arguments)}, got {len(arguments)}")
         
-        zippedArguments = list(zip(map(lambda a: a.value, self.arguments), map(lambda a: a, arguments)))
+        zippedArguments = list(zip(map(lambda a: a.value if isinstance(a, Token) else a.token.value, self.arguments), map(lambda a: a, arguments)))
         context.symbolDictionary.symbols.update(zippedArguments)
         return self.body, context
 
@@ -0,0 +1,382 @@
+from Compiler.context import Context
+from Interpreter.loop import Repeat
+from Interpreter.optimizer import IsImmediate
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Optional, Union
+
+Register = str
+Operand = Union[Register, int]
+Comparisons = {"Equals", "NotEquals", "GreaterThan", "GreaterThanEquals", "LessThan", "LessThanEquals"}
+
+class Constant:
+    def __init__(self, destination: Register, value: int) -> None:
+        """ Initialize the Constant, which places a number in a register.
+        Haskell notation notation:
+            Init :: String -> Integer -> None
+        Parameters:
+            destination (str): The virtual register which gets the number.
+            value (int): The number.
+        """
+        self.destination = destination
+        self.value = value
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return []
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+
+    def __str__(self) -> str:
+        """ Represent Constant as string. """
+        return f"{self.destination} = #{self.value}"
+
+class Copy:
+    def __init__(self, destination: Register, source: Operand) -> None:
+        """ Initialize the Copy, which places the value of an operand in a register.
+        Haskell notation notation:
+            Init :: String -> String | Integer -> None
+        Parameters:
+            destination (str): The virtual register which gets the value.
+            source (str, int): The register or number which is copied.
+        """
+        self.destination = destination
+        self.source = source
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers([self.source])
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.source = values.get(self.source, self.source)
+
+    def __str__(self) -> str:
+        """ Represent Copy as string. """
+        return f"{self.destination} = {Show(self.source)}"
+
+class Binary:
+    def __init__(self, destination: Register, operator: str, left: Operand, right: Operand) -> None:
+        """ Initialize the Binary operation.
+        Haskell notation notation:
+            Init :: String -> String -> String | Integer -> String | Integer -> None
+        Parameters:
+            destination (str): The virtual register which gets the result.
+            operator (str): The name of the operator token, like Plus or GreaterThanEquals.
+            left (str, int): The register or number on the left side.
+            right (str, int): The register or number on the right side.
+        """
+        self.destination = destination
+        self.operator = operator
+        self.left = left
+        self.right = right
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers([self.left, self.right])
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.left = values.get(self.left, self.left)
+        self.right = values.get(self.right, self.right)
+
+    def __str__(self) -> str:
+        """ Represent Binary as string. """
+        return f"{self.destination} = {self.operator} {Show(self.left)}, {Show(self.right)}"
+
+class Call:
+    def __init__(self, destination: Register, function: str, arguments: List[Operand]) -> None:
+        """ Initialize the Call of a function.
+        Haskell notation notation:
+            Init :: String -> String -> [String | Integer] -> None
+        Parameters:
+            destination (str): The virtual register which gets the result.
+            function (str): The name of the function.
+            arguments (Lst): The registers or numbers which are passed.
+        """
+        self.destination = destination
+        self.function = function
+        self.arguments = arguments
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers(self.arguments)
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.arguments = list(map(lambda argument: values.get(argument, argument), self.arguments))
+
+    def __str__(self) -> str:
+        """ Represent Call as string. """
+        return f"{self.destination} = {self.function}({', '.join(map(Show, self.arguments))})"
+
+class Jump:
+    def __init__(self, target: 'Block') -> None:
+        """ Initialize the Jump, which ends a block and continues with another block.
+        Haskell notation notation:
+            Init :: Block -> None
+        Parameters:
+            target (Block): The block which is executed next.
+        """
+        self.target = target
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return []
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+
+    def Targets(self) -> List['Block']:
+        """ Get the blocks which can be executed next. """
+        return [self.target]
+
+    def __str__(self) -> str:
+        """ Represent Jump as string. """
+        return f"jump {self.target.label}"
+
+class Branch:
+    def __init__(self, condition: Operand, ifTrue: 'Block', ifFalse: 'Block') -> None:
+        """ Initialize the Branch, which ends a block and chooses the next block with a condition.
+        Haskell notation notation:
+            Init :: String | Integer -> Block -> Block -> None
+        Parameters:
+            condition (str, int): The register or number which is checked.
+            ifTrue (Block): The block which is executed when the condition isn't 0.
+            ifFalse (Block): The block which is executed when the condition is 0.
+        """
+        self.condition = condition
+        self.ifTrue = ifTrue
+        self.ifFalse = ifFalse
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers([self.condition])
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.condition = values.get(self.condition, self.condition)
+
+    def Targets(self) -> List['Block']:
+        """ Get the blocks which can be executed next. """
+        return [self.ifTrue, self.ifFalse]
+
+    def __str__(self) -> str:
+        """ Represent Branch as string. """
+        return f"branch {Show(self.condition)} ? {self.ifTrue.label} : {self.ifFalse.label}"
+
+class CompareBranch:
+    def __init__(self, operator: str, left: Operand, right: Operand, ifTrue: 'Block', ifFalse: 'Block') -> None:
+        """ Initialize the CompareBranch, which ends a block and chooses the next block with a comparison.
+        Haskell notation notation:
+            Init :: String -> String | Integer -> String | Integer -> Block -> Block -> None
+        Parameters:
+            operator (str): The name of the comparison, like LessThan or GreaterThanEquals.
+            left (str, int): The register or number on the left side.
+            right (str, int): The register or number on the right side.
+            ifTrue (Block): The block which is executed when the comparison holds.
+            ifFalse (Block): The block which is executed when the comparison doesn't hold.
+        """
+        self.operator = operator
+        self.left = left
+        self.right = right
+        self.ifTrue = ifTrue
+        self.ifFalse = ifFalse
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers([self.left, self.right])
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.left = values.get(self.left, self.left)
+        self.right = values.get(self.right, self.right)
+
+    def Targets(self) -> List['Block']:
+        """ Get the blocks which can be executed next. """
+        return [self.ifTrue, self.ifFalse]
+
+    def __str__(self) -> str:
+        """ Represent CompareBranch as string. """
+        return f"branch {self.operator} {Show(self.left)}, {Show(self.right)} ? {self.ifTrue.label} : {self.ifFalse.label}"
+
+class Return:
+    def __init__(self, source: Optional[Operand]) -> None:
+        """ Initialize the Return, which ends a block and the function.
+        Haskell notation notation:
+            Init :: String | Integer | None -> None
+        Parameters:
+            source (str, int): The register or number which is returned, None when nothing is returned.
+        """
+        self.source = source
+
+    def Uses(self) -> List[Register]:
+        """ Get the registers which are read. """
+        return Registers([self.source])
+
+    def Replace(self, values: Dict[Register, Operand]) -> None:
+        """ Replace the registers which are read by the passed operands. """
+        self.source = values.get(self.source, self.source)
+
+    def Targets(self) -> List['Block']:
+        """ Get the blocks which can be executed next. """
+        return []
+
+    def __str__(self) -> str:
+        """ Represent Return as string. """
+        return f"return {Show(self.source)}" if self.source != None else "return"
+
+class Block:
+    def __init__(self, label: str) -> None:
+        """ Initialize the Block, a list of instructions which always ends with a single terminator.
+        Haskell notation notation:
+            Init :: String -> None
+        Parameters:
+            label (str): The label of the block.
+        """
+        self.label = label
+        self.instructions = []
+        self.terminator = None
+
+    def __str__(self) -> str:
+        """ Represent Block as string. """
+        return "\n".join(chain([f"{self.label}:"], map(lambda instruction: f"    {instruction}", self.instructions + [self.terminator])))
+
+class Procedure:
+    def __init__(self, name: str, context: Context) -> None:
+        """ Initialize the Procedure, the IR of a single function.
+        Haskell notation notation:
+            Init :: String -> Context -> None
+        Instructions are added to the current block, the blocks are kept in the order in which they are entered.
+        Parameters:
+            name (str): The name of the function, which is the label of the first block.
+            context (Context): The context which gives the virtual registers and labels.
+        """
+        self.name = name
+        self.context = context
+        self.arguments = []
+        self.block = Block(name)
+        self.blocks = [self.block]
+
+    def NewRegister(self) -> Register:
+        """ Get a new virtual register. """
+        return next(self.context.registers)
+
+    def NewBlock(self) -> Block:
+        """ Create a new block with a new label, it is added when it is entered. """
+        return Block(next(self.context.labels))
+
+    def Emit(self, instruction: Union[Constant, Copy, Binary, Call]) -> None:
+        """ Add an instruction to the current block. """
+        self.block.instructions.append(instruction)
+
+    def Terminate(self, terminator: Union[Jump, Branch, CompareBranch, Return]) -> None:
+        """ End the current block, a block which already ended keeps its first terminator. """
+        if self.block.terminator == None:
+            self.block.terminator = terminator
+
+    def Enter(self, block: Block) -> None:
+        """ Continue adding instructions to the passed block. """
+        self.blocks.append(block)
+        self.block = block
+
+    def __str__(self) -> str:
+        """ Represent Procedure as string. """
+        return "\n".join(map(str, self.blocks))
+
+def Registers(operands: List[Optional[Operand]]) -> List[Register]:
+    """ Get the operands which are registers. """
+    return list(filter(lambda operand: type(operand) == str, operands))
+
+def Show(operand: Operand) -> str:
+    """ Represent an operand as string, numbers get a #. """
+    return f"#{operand}" if type(operand) == int else f"{operand}"
+
+def Instructions(procedure: Procedure) -> List[Union[Constant, Copy, Binary, Call, Jump, Branch, CompareBranch, Return]]:
+    """ Get all instructions and terminators of a procedure. """
+    return list(chain.from_iterable(map(lambda block: block.instructions + [block.terminator], procedure.blocks)))
+
+def RemoveUnreachable(procedure: Procedure) -> Procedure:
+    """ Remove the blocks which can't be reached from the first block, like the statements after a Throw.
+    Haskell notation notation:
+        RemoveUnreachable :: Procedure -> Procedure
+    Parameters:
+        procedure (Procedure): The procedure which is changed.
+    Returns:
+        procedure (Procedure): The same procedure.
+    """
+    reachable = {id(procedure.blocks[0]): procedure.blocks[0]}
+
+    def Visit(_: None) -> bool:
+        """ Add the targets of the reachable blocks, returns whether any were new. """
+        targets = chain.from_iterable(map(lambda block: block.terminator.Targets(), list(reachable.values())))
+        new = list(filter(lambda block: id(block) not in reachable, targets))
+        reachable.update(map(lambda block: (id(block), block), new))
+        return len(new) > 0
+    Repeat(Visit, None)
+    procedure.blocks = list(filter(lambda block: id(block) in reachable, procedure.blocks))
+    return procedure
+
+def FoldImmediates(procedure: Procedure) -> Procedure:
+    """ Replace the registers which only ever contain a Constant by the number itself.
+    Haskell notation notation:
+        FoldImmediates :: Procedure -> Procedure
+    The lowering can then pick the immediate form of an instruction, the Constant
+    itself is left for EliminateDeadCode. Numbers which don't fit in a MOVS stay in their
+    register, so they are only loaded once.
+    Parameters:
+        procedure (Procedure): The procedure which is changed.
+    Returns:
+        procedure (Procedure): The same procedure.
+    """
+    instructions = Instructions(procedure)
+    definitions = Counter(map(lambda instruction: instruction.destination, filter(lambda instruction: hasattr(instruction, "destination"), instructions)))
+    constants = dict(map(lambda instruction: (instruction.destination, instruction.value),
+                         filter(lambda instruction: type(instruction) == Constant and IsImmediate(instruction.value) and definitions[instruction.destination] == 1, instructions)))
+    list(map(lambda instruction: instruction.Replace(constants), instructions))
+    return procedure
+
+def FuseComparisons(procedure: Procedure) -> Procedure:
+    """ Let a Branch on the result of a comparison compare the operands itself.
+    Haskell notation notation:
+        FuseComparisons :: Procedure -> Procedure
+    This only happens when the comparison is the last instruction of the block and its result isn't
+    read anywhere else, like the condition of an If or SpinWhile. The comparison is left for EliminateDeadCode.
+    Parameters:
+        procedure (Procedure): The procedure which is changed.
+    Returns:
+        procedure (Procedure): The same procedure.
+    """
+    uses = Counter(chain.from_iterable(map(lambda instruction: instruction.Uses(), Instructions(procedure))))
+
+    def Fuse(block: Block) -> None:
+        """ Replace the Branch of a single block when it only checks the comparison before it. """
+        comparison = block.instructions[-1] if block.instructions else None
+        if type(block.terminator) != Branch or type(comparison) != Binary or comparison.operator not in Comparisons:
+            return
+        elif comparison.destination != block.terminator.condition or uses[comparison.destination] != 1:
+            return
+        block.terminator = CompareBranch(comparison.operator, comparison.left, comparison.right, block.terminator.ifTrue, block.terminator.ifFalse)
+    list(map(Fuse, procedure.blocks))
+    return procedure
+
+def EliminateDeadCode(procedure: Procedure) -> Procedure:
+    """ Remove the instructions whose result is never read.
+    Haskell notation notation:
+        EliminateDeadCode :: Procedure -> Procedure
+    This is repeated until nothing changes, because removing an instruction can make the
+    instructions which calculated its operands dead as well. Calls are always kept.
+    Parameters:
+        procedure (Procedure): The procedure which is changed.
+    Returns:
+        procedure (Procedure): The same procedure.
+    """
+    def Pass(_: None) -> bool:
+        """ Remove the dead instructions once, returns whether any were removed. """
+        used = set(chain.from_iterable(map(lambda instruction: instruction.Uses(), Instructions(procedure))))
+        before = sum(map(lambda block: len(block.instructions), procedure.blocks))
+        list(map(lambda block: setattr(block, "instructions", list(filter(lambda instruction: type(instruction) == Call or instruction.destination in used, block.instructions))), procedure.blocks))
+        return sum(map(lambda block: len(block.instructions), procedure.blocks)) < before
+    Repeat(Pass, None)
+    return procedure
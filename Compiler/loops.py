@@ -0,0 +1,235 @@
+from Compiler import allocator
+from Compiler.ir import *
+from Interpreter.loop import Repeat
+from collections import Counter
+from copy import copy
+from functools import reduce
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+Loop = Tuple[Block, Block, List[Block]]
+Budget = len(allocator.Registers) - 1
+
+def FindLoops(procedure: Procedure) -> List[Loop]:
+    """ Find the loops of a SpinWhile, the innermost loops first.
+    Haskell notation notation:
+        FindLoops :: Procedure -> [(Block, Block, [Block])]
+    A loop starts with its header, which checks the condition, and ends with the block which jumps
+    back to it. The blocks are kept in the order in which they are entered, so the blocks of a loop
+    are next to each other. Only loops which are entered from a single block before the header, the
+    preheader, are returned.
+    Parameters:
+        procedure (Procedure): The IR of a function.
+    Returns:
+        loops (Lst): The preheader, header and blocks of every loop, the header is the first of the blocks.
+    """
+    blocks = procedure.blocks
+    index = dict(map(lambda position: (id(blocks[position]), position), range(len(blocks))))
+
+    def Find(latch: int) -> Optional[Loop]:
+        """ Get the loop of a block which jumps back to an earlier block. """
+        terminator = blocks[latch].terminator
+        header = index.get(id(terminator.target), latch + 1) if type(terminator) == Jump else latch + 1
+        if header > latch or header == 0:
+            return None
+        inside = set(map(id, blocks[header:latch + 1]))
+        entries = list(chain.from_iterable(map(lambda block: map(lambda target: (block, target), block.terminator.Targets()), filter(lambda block: id(block) not in inside, blocks))))
+        entries = list(filter(lambda entry: id(entry[1]) in inside, entries))
+        if entries != [(blocks[header - 1], blocks[header])] or type(blocks[header - 1].terminator) != Jump:
+            return None
+        return blocks[header - 1], blocks[header], blocks[header:latch + 1]
+    loops = filter(lambda loop: loop != None, map(Find, range(len(blocks))))
+    return sorted(loops, key=lambda loop: len(loop[2]))
+
+def Definitions(blocks: List[Block]) -> Counter:
+    """ Count how many times every register is written in the passed blocks. """
+    return Counter(map(lambda instruction: instruction.destination, chain.from_iterable(map(lambda block: block.instructions, blocks))))
+
+def Liveness(procedure: Procedure) -> Dict[int, List[Set[Register]]]:
+    """ Find the registers which are live before every instruction of the IR.
+    Haskell notation notation:
+        Liveness :: Procedure -> Dict
+    Parameters:
+        procedure (Procedure): The IR of a function.
+    Returns:
+        live (Dict): For the id of every block the live registers before each instruction, before the terminator and after the block.
+    """
+    liveIn = dict(map(lambda block: (id(block), set()), procedure.blocks))
+
+    def Live(block: Block) -> List[Set[Register]]:
+        """ Go through a single block from the last instruction to the first. """
+        out = set(chain.from_iterable(map(lambda target: liveIn.get(id(target), set()), block.terminator.Targets())))
+        before = reduce(lambda live, instruction: [(live[0] - {instruction.destination}) | set(instruction.Uses())] + live, reversed(block.instructions), [out | set(block.terminator.Uses())])
+        return before + [out]
+
+    def Pass(_: None) -> bool:
+        """ Update every block once, returns whether anything changed. """
+        changes = list(map(lambda block: (id(block), Live(block)[0]), procedure.blocks))
+        changed = any(map(lambda change: change[1] != liveIn[change[0]], changes))
+        liveIn.update(changes)
+        return changed
+    Repeat(Pass, None)
+    return dict(map(lambda block: (id(block), Live(block)), procedure.blocks))
+
+def Fits(procedure: Procedure, blocks: List[Block], added: Set[Register], removed: Set[Register]) -> bool:
+    """ Check whether the registers of a loop still fit in R0-R7 after a change.
+    Haskell notation notation:
+        Fits :: Procedure -> [Block] -> Set -> Set -> Boolean
+    The added registers are live in the whole loop afterwards, the removed registers aren't live anymore.
+    A loop which spills its registers is slower than the loop which was optimized, so an instruction may
+    use at most Budget registers, which leaves a register for a number which the lowering moves into a
+    register. At most R4-R7 may be live across a call.
+    Parameters:
+        procedure (Procedure): The IR of the function.
+        blocks (Lst): The blocks of the loop.
+        added (Set): The registers which the change keeps live in the whole loop.
+        removed (Set): The registers which the change removes.
+    Returns:
+        fits (bool): Whether the change is allowed.
+    """
+    live = Liveness(procedure)
+    points = chain.from_iterable(map(lambda block: map(lambda position: live[id(block)][position + 1] | set(block.instructions[position].Uses()) | {block.instructions[position].destination},
+                                                       range(len(block.instructions))), blocks))
+    calls = chain.from_iterable(map(lambda block: map(lambda position: live[id(block)][position + 1] - {block.instructions[position].destination},
+                                                      filter(lambda position: type(block.instructions[position]) == Call, range(len(block.instructions)))), blocks))
+    return all(map(lambda registers: len((registers - removed) | added) <= Budget, points)) and all(map(lambda registers: len((registers - removed) | added) <= len(allocator.Saved), calls))
+
+def Hoist(procedure: Procedure, loop: Loop) -> None:
+    """ Move the instructions whose operands don't change inside the loop to the preheader.
+    Haskell notation notation:
+        Hoist :: Procedure -> (Block, Block, [Block]) -> None
+    An instruction is invariant when its operands are numbers or registers which aren't written in the loop,
+    and it is the only instruction which writes its register. Calls are never moved, a moved instruction can
+    make the instructions which read its register invariant as well.
+    Parameters:
+        procedure (Procedure): The IR of the function.
+        loop (Tuple): The preheader, header and blocks of the loop, see FindLoops.
+    """
+    preheader, _, blocks = loop
+    definitions = Definitions(procedure.blocks)
+
+    def Invariant(instruction: Union[Constant, Copy, Binary, Call]) -> bool:
+        """ Check whether an instruction gives the same result in every iteration and can be moved without spilling. """
+        written = Definitions(blocks)
+        if type(instruction) not in {Constant, Binary} or definitions[instruction.destination] != 1 or any(map(lambda register: written[register], instruction.Uses())):
+            return False
+        others = chain.from_iterable(map(lambda other: other.Uses(), filter(lambda other: other is not instruction, chain.from_iterable(map(lambda block: block.instructions + [block.terminator], blocks)))))
+        return Fits(procedure, blocks, {instruction.destination}, set(instruction.Uses()) - set(others))
+
+    def Pass(_: None) -> bool:
+        """ Move the first invariant instruction, returns whether there was one. """
+        moved = next(filter(Invariant, chain.from_iterable(map(lambda block: block.instructions, blocks))), None)
+        if moved == None:
+            return False
+        list(map(lambda block: setattr(block, "instructions", list(filter(lambda instruction: instruction is not moved, block.instructions))), blocks))
+        preheader.instructions.append(moved)
+        return True
+    Repeat(Pass, None)
+
+def Induction(blocks: List[Block], register: Register) -> Optional[Tuple[Block, Copy, str, int]]:
+    """ Check whether a register is an induction variable of a loop.
+    Haskell notation notation:
+        Induction :: [Block] -> String -> (Block, Copy, String, Integer) | None
+    An induction variable is only written once in the loop, by a Copy of itself plus or minus a number,
+    like Ape i Is i + 1.
+    Parameters:
+        blocks (Lst): The blocks of the loop.
+        register (str): The register of the variable.
+    Returns:
+        block (Block): The block which changes the variable.
+        copy (Copy): The Copy which changes the variable.
+        operator (str): Plus or Minus.
+        step (int): The number which is added or subtracted.
+    """
+    writes = list(chain.from_iterable(map(lambda block: map(lambda instruction: (block, instruction), filter(lambda instruction: instruction.destination == register, block.instructions)), blocks)))
+    if len(writes) != 1 or type(writes[0][1]) != Copy:
+        return None
+    block, update = writes[0]
+    step = next(filter(lambda instruction: type(instruction) == Binary and instruction.destination == update.source, chain.from_iterable(map(lambda block: block.instructions, blocks))), None)
+    if step == None or step.operator not in {"Plus", "Minus"} or Definitions(blocks)[step.destination] != 1:
+        return None
+    elif step.left == register and type(step.right) == int:
+        return block, update, step.operator, step.right
+    elif step.operator == "Plus" and step.right == register and type(step.left) == int:
+        return block, update, step.operator, step.left
+    return None
+
+def ReduceStrength(procedure: Procedure, loop: Loop) -> None:
+    """ Replace the multiplications of an induction variable by a number which is added every iteration.
+    Haskell notation notation:
+        ReduceStrength :: Procedure -> (Block, Block, [Block]) -> None
+    For i * c the preheader calculates i * c once, and right after i changes by k the product changes by k * c.
+    The multiplication is left out and its result is replaced by the product. The factor has to be a number or
+    a register which isn't written in the loop, and the product has to fit in the registers, see Fits.
+    Parameters:
+        procedure (Procedure): The IR of the function.
+        loop (Tuple): The preheader, header and blocks of the loop, see FindLoops.
+    """
+    preheader, _, blocks = loop
+    written = Definitions(blocks)
+
+    def Reduce(block: Block, instruction: Union[Constant, Copy, Binary, Call]) -> None:
+        """ Reduce a single multiplication when one side is an induction variable and the other is invariant. """
+        if type(instruction) != Binary or instruction.operator != "Multiply":
+            return
+        pairs = filter(lambda pair: type(pair[0]) == str and not (type(pair[1]) == str and written[pair[1]]), [(instruction.left, instruction.right), (instruction.right, instruction.left)])
+        reductions = map(lambda pair: (pair, Induction(blocks, pair[0])), pairs)
+        (variable, factor), induction = next(filter(lambda reduction: reduction[1] != None, reductions), ((None, None), None))
+        if induction == None or Definitions(procedure.blocks)[instruction.destination] != 1:
+            return
+        updated, update, operator, step = induction
+        stride = {"stride"} if type(factor) != int and step != 1 else set()
+        if not Fits(procedure, blocks, {"product"} | stride, {instruction.destination}):
+            return
+        product = procedure.NewRegister()
+        preheader.instructions.append(Binary(product, "Multiply", variable, factor))
+        if type(factor) == int:
+            increment = Binary(product, operator, product, step * factor)
+        elif step == 1:
+            increment = Binary(product, operator, product, factor)
+        else:
+            stride = procedure.NewRegister()
+            preheader.instructions.append(Binary(stride, "Multiply", factor, step))
+            increment = Binary(product, operator, product, stride)
+        updated.instructions.insert(updated.instructions.index(update) + 1, increment)
+        block.instructions.remove(instruction)
+        list(map(lambda other: other.Replace({instruction.destination: product}), Instructions(procedure)))
+    instructions = list(chain.from_iterable(map(lambda block: map(lambda instruction: (block, instruction), block.instructions), blocks)))
+    list(map(lambda pair: Reduce(*pair), instructions))
+
+def Rotate(procedure: Procedure, loop: Loop) -> None:
+    """ Check the condition of a loop at the bottom instead of the top.
+    Haskell notation notation:
+        Rotate :: Procedure -> (Block, Block, [Block]) -> None
+    The block which jumps back to the header gets a copy of the header and branches back to the body
+    itself, so an iteration takes a single branch. The header is only executed once, to skip the loop
+    when the condition doesn't hold at the start.
+    Parameters:
+        procedure (Procedure): The IR of the function.
+        loop (Tuple): The preheader, header and blocks of the loop, see FindLoops.
+    """
+    _, header, blocks = loop
+    latch = blocks[-1]
+    if type(header.terminator) not in {Branch, CompareBranch} or latch is header or type(latch.terminator) != Jump:
+        return
+    latch.instructions.extend(map(copy, header.instructions))
+    latch.terminator = copy(header.terminator)
+
+def OptimizeLoops(procedure: Procedure) -> Procedure:
+    """ Optimize the loops of a function, the innermost loops first.
+    Haskell notation notation:
+        OptimizeLoops :: Procedure -> Procedure
+    Every loop gets three passes: the invariant instructions are moved in front of the loop, the
+    multiplications of induction variables become additions and the condition is moved to the bottom.
+    Parameters:
+        procedure (Procedure): The procedure which is changed.
+    Returns:
+        procedure (Procedure): The same procedure.
+    """
+    def Optimize(loop: Loop) -> None:
+        """ Optimize a single loop. """
+        Hoist(procedure, loop)
+        ReduceStrength(procedure, loop)
+        Rotate(procedure, loop)
+    list(map(Optimize, FindLoops(procedure)))
+    return procedure
@@ -1,5 +1,6 @@
 from typing import Union, Tuple, List
 from Compiler.context import Context
+from Compiler.ir import Binary, Procedure
 
 class Number:
     def __init__(self, value: Union[int, float], context: Context, register: str) -> None:
@@ -19,223 +20,166 @@ class Number:
         """ Represents self.value as a string. """
         return f'{self.value}'
 
-    def Plus(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+    def Operation(self, operator: str, other: 'Number', value: Union[int, float], procedure: Procedure) -> 'Number':
+        """ Add a Binary operation with other to the IR.
+        Haskell notation notation:
+            Operation :: String -> Number -> Int | Float -> Procedure -> Number
+        The value is only known when the compiler calculates it, the register gets the value when the program runs.
+        Parameters:
+            operator (str): The name of the operator, which is the name of the method.
+            other (Number): The number on the right side.
+            value (int, float): The value of the result.
+            procedure (Procedure): The IR to which the operation is added.
+        Returns:
+            number (Number): The result of the operation in a new virtual register.
+        """
+        register = procedure.NewRegister()
+        procedure.Emit(Binary(register, operator, self.register, other.register))
+        return Number(value, self.context, register)
+
+    def Plus(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function adds other.value with self.value.
         Haskell notation notation:
-            Plus :: Number -> Context -> [String & Set] -> Tuple
+            Plus :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number): The other number to add with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation.
         """
-        instructions.append(f"\tADD \t{self.register}, {other.register}\n")
-        return Number(self.value + other.value, self.context, self.register)
+        return self.Operation("Plus", other, self.value + other.value, procedure)
 
-    def Minus(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+    def Minus(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function subtracts other.value with self.value. 
         Haskell notation notation:
-            Minus :: Number -> Context -> [String & Set] -> Tuple
+            Minus :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number): The other number to subtract with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation.
         """
-        instructions.append(f"\tSUB \t{self.register}, {other.register}\n")
-        return Number(self.value - other.value, self.context, self.register)
+        return self.Operation("Minus", other, self.value - other.value, procedure)
 
-    def Multiply(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+    def Multiply(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function multiplies self.value with other.value. 
         Haskell notation notation:
-            Multiply :: Number -> Context -> [String & Set] -> Tuple
+            Multiply :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number): The other number to multiply with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation.
         """
-        instructions.append(f"\tMUL \t{self.register}, {other.register}\n")
-        return Number(self.value * other.value, self.context, self.register)
+        return self.Operation("Multiply", other, self.value * other.value, procedure)
 
-    def Divide(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+    def Divide(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function divides self.value with other.value. 
         Haskell notation notation:
-            Divide :: Number -> Context -> [String & Set] -> Tuple
+            Divide :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number): The other number to divide with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation.
         """
-        resultRegister = context.registers.pop(0)
-        instructions[5].add(resultRegister)
-        instructions.append("\tPUSH\t{R0, R}\n")
-        instructions.append(f"\tMOV \tR0, {self.register}\n") 
-        instructions.append(f"\tMOV \tR1, {other.register}\n")
-        instructions.append("\tBL  \t__aeabi_idiv\n")
-        instructions.append(f"\tMOV \t{resultRegister}, R0\n")
-        instructions.append("\tPOP \t{R0, R1}\n")
-        if(other.value == 0):
-            return Number(self.value / 1, self.lineNumber, context, resultRegister)
-        return Number(self.value / other.value, context, resultRegister)
-
-    def Equals(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("Divide", other, self.value / other.value if other.value != 0 else self.value / 1, procedure)
+
+    def Equals(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is equal compared with other.value.
         Haskell notation notation:
-            Equals :: Number -> Context -> [String & Set] -> Tuple 
+            Equals :: Number -> Context -> Procedure -> Tuple 
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        tempRegister = context.registers[0]
-        instructions[5].add(tempRegister)
-        instructions.append(f"\tSUB \t{tempRegister}, {other.register}, {self.register}\n")
-        instructions.append(f"\tNEG \t{resultRegister}, {tempRegister}\n")
-        instructions.append(f"\tADC \t{resultRegister}, {resultRegister}, {tempRegister}\n")
-        return Number(int(self.value == other.value), self.context, resultRegister)
-    
-    def NotEquals(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("Equals", other, int(self.value == other.value), procedure)
+
+    def NotEquals(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is not equal compared to other.value. 
         Haskell notation notation:
-            NotEquals :: Number -> Context -> [String & Set] -> Tuple
+            NotEquals :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        tempRegister = context.registers[0]
-        instructions[5].add(tempRegister)
-        instructions.append(f"\tSUB \t{resultRegister}, {other.register}, {self.register}\n")
-        instructions.append(f"\tSUB \t{tempRegister}, {resultRegister}, #1\n")
-        instructions.append(f"\tSBC \t{resultRegister}, {resultRegister}, {tempRegister}\n")
-        return Number(int(self.value != other.value), self.context, resultRegister)
-
-    def GreaterThan(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("NotEquals", other, int(self.value != other.value), procedure)
+
+    def GreaterThan(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is greater than other.value. 
         Haskell notation notation:
-            GreaterThan :: Number -> Context -> [String & Set] -> Tuple
+            GreaterThan :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        instructions[5].add(resultRegister)
-        label = context.labels.pop(0)
-        instructions.append(f"\tMOV \t{resultRegister}, #1\n")
-        instructions.append(f"\tCMP \t{self.register}, {other.register}\n")
-        instructions.append(f"\tBGT \t{label}\n")
-        instructions.append(f"\tMOVS\t{resultRegister}, #0\n")
-        return Number(int(self.value > other.value), self.context, resultRegister)
-
-    def GreaterThanEquals(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("GreaterThan", other, int(self.value > other.value), procedure)
+
+    def GreaterThanEquals(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is greater than or equal to other.value. 
         Haskell notation notation:
-            GreaterThanEquals :: Number -> Context -> [String & Set] -> Tuple
+            GreaterThanEquals :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        tempRegister = context.registers[0]
-        instructions[5].add(tempRegister)
-        instructions.append(f"\tASR \t{resultRegister}, {self.register}, #31\n")
-        instructions.append(f"\tLSR \t{tempRegister}, {other.register}, #31\n")
-        instructions.append(f"\tCMP \t{self.register}, {other.register}\n")
-        instructions.append(f"\tADC \t{resultRegister}, {resultRegister}, {tempRegister}\n")
-        return Number(int(self.value >= other.value), self.context, resultRegister)
-
-    def LessThan(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("GreaterThanEquals", other, int(self.value >= other.value), procedure)
+
+    def LessThan(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is less than other.value. 
         Haskell notation notation:
-            LessThan :: Number -> Context -> [String & Set] -> Tuple
+            LessThan :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        instructions[5].add(resultRegister)
-        label = context.labels.pop(0)
-        instructions.append(f"\tMOV \t{resultRegister}, #1\n")
-        instructions.append(f"\tCMP \t{self.register}, {other.register}\n")
-        instructions.append(f"\tBLT \t{label}\n")
-        instructions.append(f"\tMOVS\t{resultRegister}, #0\n")
-        instructions.append(f"{label}:\n")
-        return Number(int(self.value < other.value), self.context, resultRegister)
-
-    def LessThanEquals(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("LessThan", other, int(self.value < other.value), procedure)
+
+    def LessThanEquals(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value is less than or equal to other.value. 
         Haskell notation notation:
-            LessThanEquals :: Number -> Context -> [String & Set] -> Tuple
+            LessThanEquals :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        tempRegister = context.registers[0]
-        instructions[5].add(tempRegister)
-        instructions.append(f"\tLSR \t{resultRegister}, {self.register}, #31\n")
-        instructions.append(f"\tASR \t{tempRegister}, {other.register}, #31\n")
-        instructions.append(f"\tCMP \t{other.register}, {self.register}\n")
-        instructions.append(f"\tADC \t{resultRegister}, {resultRegister}, {tempRegister}\n")
-        return Number(int(self.value <= other.value), self.context, resultRegister)
-
-    def And(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("LessThanEquals", other, int(self.value <= other.value), procedure)
+
+    def And(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value and other.value are true. 
         Haskell notation notation:
-            And :: Number -> Context -> [String & Set] -> Tuple
+            And :: Number -> Context -> Procedure -> Tuple
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        firstRegister = context.registers[0]
-        otherRegister = context.registers[1]
-        instructions[5].add(otherRegister)
-        instructions.append(f"\tASR \t{firstRegister}, {self.register}, #31\n")
-        instructions.append(f"\tSUB \t{resultRegister}, {firstRegister}, {self.register}\n")
-        instructions.append(f"\tASR \t{firstRegister}, {other.register}, #31\n")
-        instructions.append(f"\tSUB \t{otherRegister}, {firstRegister}, {other.register}\n")
-        instructions.append(f"\tAND \t{resultRegister}, {resultRegister}, {otherRegister}\n")
-        instructions.append(f"\tLSR \t{resultRegister}, {resultRegister}, #31\n")
-        return Number(int(self.value and other.value), self.context, resultRegister)
-
-    def Or(self, other: 'Number', context: Context, instructions: List[Union[str, set]]) -> 'Number':
+        return self.Operation("And", other, int(self.value and other.value), procedure)
+
+    def Or(self, other: 'Number', context: Context, procedure: Procedure) -> 'Number':
         """ This function checks whether self.value or other.value are true.
         Haskell notation notation:
-            Or :: Number -> Context -> [String & Set] -> Tuple 
+            Or :: Number -> Context -> Procedure -> Tuple 
         Parameters:
             other (Number) : The other number to compare with.
-            instructions (Lst): The list of instructions which get updated.
+            procedure (Procedure): The IR to which the operation is added.
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        resultRegister = context.registers.pop(0)
-        firstRegister = context.registers[0]
-        otherRegister = context.registers[1]
-        instructions[5].add(otherRegister)
-        instructions.append(f"\tASR \t{firstRegister}, {self.register}, #31\n")
-        instructions.append(f"\tSUB \t{resultRegister}, {firstRegister}, {self.register}\n")
-        instructions.append(f"\tASR \t{firstRegister}, {other.register}, #31\n")
-        instructions.append(f"\tSUB \t{otherRegister}, {firstRegister}, {other.register}\n")
-        instructions.append(f"\tORR \t{resultRegister}, {resultRegister}, {otherRegister}\n")
-        instructions.append(f"\tLSR \t{resultRegister}, {resultRegister}, #31\n")
-        return Number(int(self.value or other.value), self.context, resultRegister)
+        return self.Operation("Or", other, int(self.value or other.value), procedure)
 
     def IsTrue(self) -> bool:
         """ This function checks whether self.value is true. 
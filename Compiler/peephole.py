@@ -0,0 +1,175 @@
+from Compiler.allocator import Branches, Effects, IsLabel, Liveness, Moves, Parse
+from Interpreter.loop import Repeat
+from itertools import chain, takewhile
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+FlagSetting = {"MOVS", "ADD", "ADDS", "SUB", "SUBS", "ADC", "ADCS", "SBC", "SBCS", "NEG", "NEGS", "ASR", "ASRS", "LSR", "LSRS", "LSL", "LSLS", "AND", "ANDS", "ORR", "ORRS", "EOR", "EORS", "MUL", "MULS"}
+FlagReading = (Branches - {"B"}) | {"ADC", "ADCS", "SBC", "SBCS"}
+Writing = Moves | {"LDR", "NEG", "NEGS", "ASR", "ASRS", "LSR", "LSRS", "LSL", "LSLS", "ADD", "ADDS", "SUB", "SUBS"}
+
+Match = Optional[Tuple[int, List[str]]]
+
+def Instruction(operation: str, operands: List[str]) -> str:
+    """ Write an instruction in the layout of the compiler, like "\tADD \tR0, R1, #1\n". """
+    return f"\t{operation:<4}\t{', '.join(operands)}\n"
+
+def Cycles(instruction: str) -> int:
+    """ Get the cycles which an instruction takes on a Cortex-M0.
+    Haskell notation notation:
+        Cycles :: String -> Integer
+    A branch is counted as taken, a label takes no cycles.
+    Parameters:
+        instruction (str): The instruction.
+    Returns:
+        cycles (int): The amount of cycles.
+    """
+    operation = Parse(instruction)[0]
+    if IsLabel(instruction):
+        return 0
+    elif operation in Branches:
+        return 3
+    elif operation == "BL":
+        return 4
+    elif operation in {"LDR", "STR"}:
+        return 2
+    return 1
+
+def Immediate(value: str) -> Optional[int]:
+    """ Get the number of an immediate operand like #5, None for any other operand. """
+    return int(value[1:]) if value.startswith("#") and value[1:].isdigit() else None
+
+def Dead(register: str, index: int, instructions: List[str], liveOut: List[Set[str]]) -> bool:
+    """ Check whether the value of a register isn't read after an instruction, or is overwritten by it. """
+    return register not in liveOut[index] - Effects(instructions[index])[1]
+
+def ImmediateForm(instructions: List[str], index: int, liveOut: List[Set[str]]) -> Match:
+    """ Use a number which is moved into a register as immediate of the following ADD, SUB or CMP.
+    MOVS R2, #1 and SUB R0, R0, R2 become SUB R0, R0, #1 when R2 isn't read afterwards.
+    """
+    if index + 1 >= len(instructions):
+        return None
+    (move, moved), (operation, operands) = Parse(instructions[index]), Parse(instructions[index + 1])
+    number = Immediate(moved[1]) if move == "MOVS" and len(moved) == 2 else None
+    register = moved[0] if moved else None
+    if number == None or not Dead(register, index + 1, instructions, liveOut):
+        return None
+    elif operation == "CMP" and len(operands) == 2 and operands[1] == register and operands[0] != register:
+        return 2, [Instruction("CMP", [operands[0], f"#{number}"])]
+    elif operation not in {"ADD", "SUB"} or len(operands) != 3 or operands[1:].count(register) != 1:
+        return None
+    destination, other = operands[0], operands[1] if operands[2] == register else operands[2]
+    if operation == "SUB" and operands[2] != register:
+        return None
+    elif number <= 7:
+        return 2, [Instruction(operation, [destination, other, f"#{number}"])]
+    elif destination == other:
+        return 2, [Instruction(operation, [destination, f"#{number}"])]
+    return None
+
+def CoalesceMove(instructions: List[str], index: int, liveOut: List[Set[str]]) -> Match:
+    """ Write a result straight into the register it is moved into afterwards.
+    ADD R1, R1, R0 and MOVS R0, R1 become ADD R0, R1, R0 when R1 isn't read afterwards.
+    """
+    if index + 1 >= len(instructions):
+        return None
+    (operation, operands), (move, moved) = Parse(instructions[index]), Parse(instructions[index + 1])
+    if move not in Moves or len(moved) != 2 or operation not in Writing or not operands or moved[1] != operands[0] or moved[0] == moved[1]:
+        return None
+    elif operation in {"ADD", "ADDS", "SUB", "SUBS"} and (len(operands) != 3 or "SP" in operands):
+        return None
+    elif operation in {"ASR", "ASRS", "LSR", "LSRS", "LSL", "LSLS"} and len(operands) != 3:
+        return None
+    following = instructions[index + 2] if index + 2 < len(instructions) else ""
+    if operation not in FlagSetting and (Parse(following)[0] in FlagReading or IsLabel(following)):
+        return None
+    elif not Dead(moved[1], index + 1, instructions, liveOut):
+        return None
+    elif operation in Moves and operands[1:] == moved[:1]:
+        return 2, []
+    return 2, [Instruction(operation, [moved[0], *operands[1:]])]
+
+def RedundantCompare(instructions: List[str], index: int, liveOut: List[Set[str]]) -> Match:
+    """ Leave out a comparison with 0 when the previous instruction already set the flags of the register.
+    ADC R3, R3, R4, CMP R3, #0 and BEQ .L6 become ADC R3, R3, R4 and BEQ .L6, a comparison
+    which is repeated right after its branch is left out as well.
+    """
+    if index + 2 >= len(instructions):
+        return None
+    (operation, operands), (compare, compared), (branch, _) = map(Parse, instructions[index:index + 3])
+    if operation == "CMP" and compare in Branches - {"B"} and instructions[index + 2] == instructions[index]:
+        return 3, instructions[index:index + 2]
+    elif compare != "CMP" or compared[1:] != ["#0"] or branch not in {"BEQ", "BNE", "BMI", "BPL"}:
+        return None
+    elif operation not in FlagSetting or not operands or operands[0] != compared[0]:
+        return None
+    return 3, [instructions[index], instructions[index + 2]]
+
+def ThreadBranch(instructions: List[str], index: int, liveOut: List[Set[str]]) -> Match:
+    """ Let a branch go straight to the end of a chain of branches, a branch to the following label is left out. """
+    operation, operands = Parse(instructions[index])
+    if operation not in Branches:
+        return None
+    labels = dict(map(lambda position: (Parse(instructions[position])[0][:-1], position), filter(lambda position: IsLabel(instructions[position]), range(len(instructions)))))
+    following = map(lambda instruction: Parse(instruction)[0][:-1], takewhile(IsLabel, instructions[index + 1:]))
+    if operands[0] in following:
+        return 1, []
+    target = next(filter(lambda position: not IsLabel(instructions[position]), range(labels[operands[0]], len(instructions))), None)
+    if target == None or Parse(instructions[target])[0] != "B" or Parse(instructions[target])[1][0] == operands[0]:
+        return None
+    return 1, [Instruction(operation, Parse(instructions[target])[1])]
+
+Rules: Dict[str, Callable[[List[str], int, List[Set[str]]], Match]] = {
+    "immediate": ImmediateForm,
+    "coalesce": CoalesceMove,
+    "compare": RedundantCompare,
+    "thread": ThreadBranch,
+}
+
+def Peephole(instructions: List[str], exit: Set[str]) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+    """ Improve the allocated instructions of a function with the rules of the rule table.
+    Haskell notation notation:
+        Peephole :: [String] -> Set -> ([String], Dict)
+    Every rule looks at the instructions from an index and returns how many of them it replaces
+    and by what. The first match is replaced and the liveness is found again, until no rule matches.
+    Parameters:
+        instructions (Lst): The instructions of a function, which only use R0-R7 and the stack.
+        exit (Set): The registers which are live at the end of the function, like R0 for the result.
+    Returns:
+        instructions (Lst): The improved instructions.
+        savings (Dict): The instructions and cycles which every rule saved.
+    """
+    savings = dict(map(lambda rule: (rule, (0, 0)), Rules))
+    state = [list(instructions)]
+
+    def Pass(_: None) -> bool:
+        """ Replace the first match of any rule, returns whether there was one. """
+        instructions = state[0]
+        liveOut = Liveness(instructions, exit)[1]
+        matches = chain.from_iterable(map(lambda index: map(lambda rule: (index, rule, Rules[rule](instructions, index, liveOut)), Rules), range(len(instructions))))
+        index, rule, match = next(filter(lambda match: match[2] != None, matches), (0, None, None))
+        if rule == None:
+            return False
+        length, replacement = match
+        removed = instructions[index:index + length]
+        instructionsSaved, cyclesSaved = savings[rule]
+        savings[rule] = (instructionsSaved + len(list(filter(lambda instruction: not IsLabel(instruction), removed))) - len(replacement),
+                         cyclesSaved + sum(map(Cycles, removed)) - sum(map(Cycles, replacement)))
+        state[0] = instructions[:index] + replacement + instructions[index + length:]
+        return True
+    Repeat(Pass, None)
+    return state[0], savings
+
+def Report(function: str, savings: Dict[str, Tuple[int, int]]) -> str:
+    """ Represent the savings of the rules of a function as table.
+    Haskell notation notation:
+        Report :: String -> Dict -> String
+    The cycles are counted once for every instruction, one which is left out of a loop saves them on every iteration.
+    Parameters:
+        function (str): The name of the function.
+        savings (Dict): The instructions and cycles which every rule saved, see Peephole.
+    Returns:
+        report (str): The table.
+    """
+    rows = map(lambda rule: f"{rule:<24} {savings[rule][0]:>12} {savings[rule][1]:>10}", savings)
+    total = f"{'total':<24} {sum(map(lambda saved: saved[0], savings.values())):>12} {sum(map(lambda saved: saved[1], savings.values())):>10}"
+    return "\n".join(chain([f"{function:<24} {'instructions':>12} {'cycles':>10}"], rows, [total]))
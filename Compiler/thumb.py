@@ -0,0 +1,277 @@
+from Compiler.allocator import Arguments, Call as BranchLink
+from Compiler.ir import *
+from Interpreter.optimizer import IsImmediate
+from itertools import chain
+from operator import eq, ne, gt, ge, lt, le
+from typing import Callable, Dict, List, Tuple
+
+def Move(destination: str, operand: Operand) -> List[str]:
+    """ Place a register or a number in a register.
+    Haskell notation notation:
+        Move :: String -> String | Integer -> [String]
+    A number which doesn't fit in the immediate of MOVS is loaded from the literal pool.
+    Parameters:
+        destination (str): The register which gets the value.
+        operand (str, int): The register or number.
+    Returns:
+        instructions (Lst): The Thumb instructions.
+    """
+    if type(operand) != int:
+        return [f"\tMOVS\t{destination}, {operand}\n"]
+    elif IsImmediate(operand):
+        return [f"\tMOVS\t{destination}, #{operand}\n"]
+    return [f"\tLDR \t{destination}, ={operand}\n"]
+
+def Materialize(operand: Operand, procedure: Procedure) -> Tuple[List[str], str]:
+    """ Get a register which contains the operand, a number is moved into a new virtual register first.
+    Haskell notation notation:
+        Materialize :: String | Integer -> Procedure -> ([String], String)
+    Parameters:
+        operand (str, int): The register or number.
+        procedure (Procedure): The procedure which gives the new virtual register.
+    Returns:
+        instructions (Lst): The Thumb instructions which place the number, empty for a register.
+        register (str): The register which contains the operand.
+    """
+    if type(operand) != int:
+        return [], operand
+    register = procedure.NewRegister()
+    return Move(register, operand), register
+
+def IsSmall(operand: Operand) -> bool:
+    """ Check whether an operand fits in the three bit immediate of ADD and SUB with three operands. """
+    return type(operand) == int and 0 <= operand <= 7
+
+def WithRegisters(left: Operand, right: Operand, procedure: Procedure, emit: Callable[[str, str], List[str]]) -> List[str]:
+    """ Materialize both operands and create the instructions which use their registers. """
+    leftInstructions, leftRegister = Materialize(left, procedure)
+    rightInstructions, rightRegister = Materialize(right, procedure)
+    return leftInstructions + rightInstructions + emit(leftRegister, rightRegister)
+
+def LowerPlus(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower an addition, a small number on either side is used as immediate. """
+    register, number = (right, left) if IsSmall(left) else (left, right)
+    if IsSmall(number):
+        instructions, register = Materialize(register, procedure)
+        return instructions + [f"\tADD \t{destination}, {register}, #{number}\n"]
+    return WithRegisters(left, right, procedure, lambda left, right: [f"\tADD \t{destination}, {left}, {right}\n"])
+
+def LowerMinus(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower a subtraction, a small number on the right side is used as immediate. """
+    if IsSmall(right):
+        instructions, register = Materialize(left, procedure)
+        return instructions + [f"\tSUB \t{destination}, {register}, #{right}\n"]
+    return WithRegisters(left, right, procedure, lambda left, right: [f"\tSUB \t{destination}, {left}, {right}\n"])
+
+def LowerMultiply(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower a multiplication, MUL overwrites its first operand so the left side is moved into the result first. """
+    instructions, register = Materialize(right, procedure)
+    return instructions + Move(destination, left) + [f"\tMUL \t{destination}, {register}\n"]
+
+def LowerDivide(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower a division into a call of __aeabi_idiv, which divides R0 by R1. """
+    return Move("R0", left) + Move("R1", right) + [BranchLink("__aeabi_idiv", ["R0", "R1"]), f"\tMOVS\t{destination}, R0\n"]
+
+def LowerEquals(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower an equality check, NEG only sets the carry when the difference is 0. """
+    temporary = procedure.NewRegister()
+    if IsSmall(right) or IsSmall(left):
+        register, number = (right, left) if IsSmall(left) else (left, right)
+        instructions, register = Materialize(register, procedure)
+        difference = instructions + [f"\tSUB \t{temporary}, {register}, #{number}\n"]
+    else:
+        difference = WithRegisters(left, right, procedure, lambda left, right: [f"\tSUB \t{temporary}, {right}, {left}\n"])
+    return difference + [f"\tNEG \t{destination}, {temporary}\n", f"\tADC \t{destination}, {destination}, {temporary}\n"]
+
+def LowerNotEquals(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower an inequality check, subtracting 1 only borrows when the difference is 0. """
+    temporary = procedure.NewRegister()
+    if IsSmall(right) or IsSmall(left):
+        register, number = (right, left) if IsSmall(left) else (left, right)
+        instructions, register = Materialize(register, procedure)
+        difference = instructions + [f"\tSUB \t{destination}, {register}, #{number}\n"]
+    else:
+        difference = WithRegisters(left, right, procedure, lambda left, right: [f"\tSUB \t{destination}, {right}, {left}\n"])
+    return difference + [f"\tSUB \t{temporary}, {destination}, #1\n", f"\tSBC \t{destination}, {destination}, {temporary}\n"]
+
+def Compare(branch: str) -> Callable[[str, Operand, Operand, Procedure], List[str]]:
+    """ Create the lowering of a comparison which sets the result to 1 and clears it when the branch isn't taken. """
+    def LowerCompare(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+        """ Lower a comparison with a branch, a number on the right side is compared as immediate. """
+        label = next(procedure.context.labels)
+        instructions, register = Materialize(left, procedure)
+        if type(right) == int and IsImmediate(right):
+            comparison = [f"\tCMP \t{register}, #{right}\n"]
+        else:
+            comparison = WithRegisters(register, right, procedure, lambda left, right: [f"\tCMP \t{left}, {right}\n"])
+        return instructions + [f"\tMOV \t{destination}, #1\n"] + comparison + [f"\t{branch} \t{label}\n", f"\tMOVS\t{destination}, #0\n", f"{label}:\n"]
+    return LowerCompare
+
+def LowerGreaterThanEquals(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower a greater than or equal check without branches, the sign bits correct the carry of the comparison. """
+    temporary = procedure.NewRegister()
+    return WithRegisters(left, right, procedure, lambda left, right: [
+        f"\tASR \t{destination}, {left}, #31\n",
+        f"\tLSR \t{temporary}, {right}, #31\n",
+        f"\tCMP \t{left}, {right}\n",
+        f"\tADC \t{destination}, {destination}, {temporary}\n"])
+
+def LowerLessThanEquals(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+    """ Lower a less than or equal check without branches, the sign bits correct the carry of the comparison. """
+    temporary = procedure.NewRegister()
+    return WithRegisters(left, right, procedure, lambda left, right: [
+        f"\tLSR \t{destination}, {left}, #31\n",
+        f"\tASR \t{temporary}, {right}, #31\n",
+        f"\tCMP \t{right}, {left}\n",
+        f"\tADC \t{destination}, {destination}, {temporary}\n"])
+
+def Logical(operation: str) -> Callable[[str, Operand, Operand, Procedure], List[str]]:
+    """ Create the lowering of And or Or, which calculate both sides. """
+    def LowerLogical(destination: str, left: Operand, right: Operand, procedure: Procedure) -> List[str]:
+        """ Lower And or Or, the sign bit of sign - value is 1 for positive values. """
+        first = procedure.NewRegister()
+        other = procedure.NewRegister()
+        return WithRegisters(left, right, procedure, lambda left, right: [
+            f"\tASR \t{first}, {left}, #31\n",
+            f"\tSUB \t{destination}, {first}, {left}\n",
+            f"\tASR \t{first}, {right}, #31\n",
+            f"\tSUB \t{other}, {first}, {right}\n",
+            f"\t{operation} \t{destination}, {destination}, {other}\n",
+            f"\tLSR \t{destination}, {destination}, #31\n"])
+    return LowerLogical
+
+Operations: Dict[str, Callable[[str, Operand, Operand, Procedure], List[str]]] = {
+    "Plus": LowerPlus,
+    "Minus": LowerMinus,
+    "Multiply": LowerMultiply,
+    "Divide": LowerDivide,
+    "Equals": LowerEquals,
+    "NotEquals": LowerNotEquals,
+    "GreaterThan": Compare("BGT"),
+    "GreaterThanEquals": LowerGreaterThanEquals,
+    "LessThan": Compare("BLT"),
+    "LessThanEquals": LowerLessThanEquals,
+    "And": Logical("AND"),
+    "Or": Logical("ORR"),
+}
+
+Conditions: Dict[str, str] = {
+    "Equals": "EQ",
+    "NotEquals": "NE",
+    "GreaterThan": "GT",
+    "GreaterThanEquals": "GE",
+    "LessThan": "LT",
+    "LessThanEquals": "LE",
+}
+
+Negated: Dict[str, str] = {
+    "Equals": "NotEquals",
+    "NotEquals": "Equals",
+    "GreaterThan": "LessThanEquals",
+    "GreaterThanEquals": "LessThan",
+    "LessThan": "GreaterThanEquals",
+    "LessThanEquals": "GreaterThan",
+}
+
+Mirrored: Dict[str, str] = {
+    "Equals": "Equals",
+    "NotEquals": "NotEquals",
+    "GreaterThan": "LessThan",
+    "GreaterThanEquals": "LessThanEquals",
+    "LessThan": "GreaterThan",
+    "LessThanEquals": "GreaterThanEquals",
+}
+
+Evaluations: Dict[str, Callable[[int, int], bool]] = {
+    "Equals": eq,
+    "NotEquals": ne,
+    "GreaterThan": gt,
+    "GreaterThanEquals": ge,
+    "LessThan": lt,
+    "LessThanEquals": le,
+}
+
+def LowerConstant(instruction: Constant, procedure: Procedure) -> List[str]:
+    """ Lower a Constant into a MOVS or a load from the literal pool. """
+    return Move(instruction.destination, instruction.value)
+
+def LowerCopy(instruction: Copy, procedure: Procedure) -> List[str]:
+    """ Lower a Copy into a MOVS. """
+    return Move(instruction.destination, instruction.source)
+
+def LowerBinary(instruction: Binary, procedure: Procedure) -> List[str]:
+    """ Lower a Binary operation with the lowering of its operator, see Operations. """
+    return Operations[instruction.operator](instruction.destination, instruction.left, instruction.right, procedure)
+
+def LowerCall(instruction: Call, procedure: Procedure) -> List[str]:
+    """ Lower a Call, the arguments are moved into R0-R3 and the result is moved out of R0. """
+    registers = Arguments[:len(instruction.arguments)]
+    moves = chain.from_iterable(map(Move, registers, instruction.arguments))
+    return [*moves, BranchLink(instruction.function, registers), f"\tMOVS\t{instruction.destination}, R0\n"]
+
+def LowerJump(terminator: Jump, following: Optional[Block], procedure: Procedure) -> List[str]:
+    """ Lower a Jump, nothing is needed when the target is the following block. """
+    if terminator.target == following:
+        return []
+    return [f"\tB   \t{terminator.target.label}\n"]
+
+def LowerBranch(terminator: Branch, following: Optional[Block], procedure: Procedure) -> List[str]:
+    """ Lower a Branch as a comparison of the condition with 0. """
+    return LowerCompareBranch(CompareBranch("NotEquals", terminator.condition, 0, terminator.ifTrue, terminator.ifFalse), following, procedure)
+
+def LowerCompareBranch(terminator: CompareBranch, following: Optional[Block], procedure: Procedure) -> List[str]:
+    """ Lower a CompareBranch into a single CMP and conditional branch, the following block is reached by falling through.
+    Haskell notation notation:
+        LowerCompareBranch :: CompareBranch -> Block | None -> Procedure -> [String]
+    A number on the left side is swapped to the right side, so it can be compared as immediate.
+    Parameters:
+        terminator (CompareBranch): The terminator of the block.
+        following (Block): The block which is placed after this block, None for the last block.
+        procedure (Procedure): The procedure which gives new virtual registers.
+    Returns:
+        instructions (Lst): The Thumb instructions.
+    """
+    operator, left, right = terminator.operator, terminator.left, terminator.right
+    if type(left) == int and type(right) == int:
+        return LowerJump(Jump(terminator.ifTrue if Evaluations[operator](left, right) else terminator.ifFalse), following, procedure)
+    elif type(left) == int:
+        operator, left, right = Mirrored[operator], right, left
+    if type(right) == int and IsImmediate(right):
+        comparison = [f"\tCMP \t{left}, #{right}\n"]
+    else:
+        comparison = WithRegisters(left, right, procedure, lambda left, right: [f"\tCMP \t{left}, {right}\n"])
+    condition = Conditions[operator]
+    if terminator.ifFalse == following:
+        return comparison + [f"\tB{condition} \t{terminator.ifTrue.label}\n"]
+    elif terminator.ifTrue == following:
+        return comparison + [f"\tB{Conditions[Negated[operator]]} \t{terminator.ifFalse.label}\n"]
+    return comparison + [f"\tB{condition} \t{terminator.ifTrue.label}\n", f"\tB   \t{terminator.ifFalse.label}\n"]
+
+def LowerReturn(terminator: Return, following: Optional[Block], procedure: Procedure) -> List[str]:
+    """ Lower a Return, the result is moved into R0 and a Return before the last block jumps to the end. """
+    result = Move("R0", terminator.source) if terminator.source != None else []
+    return result + ([f"\tB   \tEND\n"] if following else [])
+
+def Lower(procedure: Procedure) -> List[str]:
+    """ Lower the IR of a function into Thumb-1 instructions.
+    Haskell notation notation:
+        Lower :: Procedure -> [String]
+    This is the last pass over the IR. The instructions still use virtual registers, R0-R3
+    are only used for the arguments, calls and the result, see Compiler.allocator. The blocks
+    are placed in their order, so a Jump or Branch to the following block falls through.
+    Parameters:
+        procedure (Procedure): The IR of the function.
+    Returns:
+        instructions (Lst): The Thumb instructions, which end with the END label.
+    """
+    arguments = chain.from_iterable(map(Move, procedure.arguments, Arguments))
+
+    def LowerBlock(index: int) -> List[str]:
+        """ Lower a single block with its label, the first block follows the label of the function. """
+        block = procedure.blocks[index]
+        following = procedure.blocks[index + 1] if index + 1 < len(procedure.blocks) else None
+        label = [f"{block.label}:\n"] if index else []
+        instructions = chain.from_iterable(map(lambda instruction: globals()[f"Lower{type(instruction).__name__}"](instruction, procedure), block.instructions))
+        terminator = globals()[f"Lower{type(block.terminator).__name__}"](block.terminator, following, procedure)
+        return [*label, *instructions, *terminator]
+    return list(chain(arguments, chain.from_iterable(map(LowerBlock, range(len(procedure.blocks)))), ["END:\n"]))
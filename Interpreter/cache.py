@@ -0,0 +1,123 @@
+from Interpreter.nodes import ListNode
+from functools import partial
+from glob import glob
+from hashlib import sha256
+from typing import Callable, Optional
+import os
+import pickle
+
+FormatVersion = 3
+Extension = ".aapc"
+
+def SourceHash(source: bytes) -> str:
+    """ Calculate the hash of the source of a program.
+    Haskell notation:
+        SourceHash :: Bytes -> String
+    Parameters:
+        source (bytes): The contents of the .AAP file.
+    Returns:
+        hash (str): The hexadecimal sha256 hash of the source.
+    """
+    return sha256(source).hexdigest()
+
+def CachePath(filename: str, directory: Optional[str] = None) -> str:
+    """ Get the path of the cache file which belongs to a .AAP file.
+    Haskell notation:
+        CachePath :: String -> String -> String
+    Without a directory the cache file is placed next to the source. Inside of a
+    directory the name contains a hash of the full path, so files with the same
+    name in different directories don't overwrite each other.
+    Parameters:
+        filename (str): The name of the .AAP file.
+        directory (str): The directory where the cache files are stored.
+    Returns:
+        path (str): The path of the cache file.
+    """
+    name = os.path.splitext(filename)[0]
+    if directory == None:
+        return name + Extension
+    pathHash = sha256(os.path.abspath(filename).encode()).hexdigest()[:12]
+    return os.path.join(directory, f"{os.path.basename(name)}-{pathHash}{Extension}")
+
+def ReadCache(path: str, sourceHash: str, reader: str = "") -> Optional[ListNode]:
+    """ Read the AST from a cache file.
+    Haskell notation:
+        ReadCache :: String -> String -> String -> ListNode | None
+    Parameters:
+        path (str): The path of the cache file.
+        sourceHash (str): The hash of the current source.
+        reader (str): The names of the lexer and parser which create the AST, like "linear/compact".
+    Returns:
+        ast (ListNode): The cached AST.
+        Returns None if there is no cache file, when it belongs to another source, reader or format, or when the AST is too deep to be read.
+    """
+    try:
+        with open(path, "rb") as file:
+            version, cachedHash, cachedReader, ast = pickle.load(file)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError, AttributeError, ImportError, RecursionError):
+        return None
+    if version != FormatVersion or cachedHash != sourceHash or cachedReader != reader:
+        return None
+    return ast
+
+def WriteCache(path: str, sourceHash: str, ast: ListNode, reader: str = "") -> None:
+    """ Write the AST to a cache file.
+    Haskell notation:
+        WriteCache :: String -> String -> ListNode -> String -> None
+    The file is written to a temporary file first, so a running program never reads half a cache file.
+    An AST which is too deep to be pickled isn't stored, the program is parsed again the next time.
+    Parameters:
+        path (str): The path of the cache file.
+        sourceHash (str): The hash of the source.
+        ast (ListNode): The AST which will be stored.
+        reader (str): The names of the lexer and parser which created the AST, see ReadCache.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            pickle.dump((FormatVersion, sourceHash, reader, ast), file, pickle.HIGHEST_PROTOCOL)
+    except (RecursionError, pickle.PicklingError):
+        os.remove(temporary)
+        return
+    os.replace(temporary, path)
+
+def LoadProgram(filename: str, parse: Callable[[str], ListNode], directory: Optional[str] = None, reader: str = "") -> ListNode:
+    """ Load the AST of a .AAP file from the cache, or parse it and store it in the cache.
+    Haskell notation:
+        LoadProgram :: String -> Callable -> String -> String -> ListNode
+    The cache is keyed by the hash of the source, the reader and the FormatVersion, so it is
+    parsed again as soon as the source changes or another lexer or parser is chosen. Not
+    every lexer stores the positions of the tokens, which the heatmap needs.
+    Parameters:
+        filename (str): The name of the .AAP file.
+        parse (Callable): The function which creates the AST of a file.
+        directory (str): The directory where the cache files are stored, None to store them next to the sources.
+        reader (str): The names of the lexer and parser inside of parse, see ReadCache.
+    Returns:
+        ast (ListNode): The AST of the file.
+    """
+    with open(filename, "rb") as file:
+        sourceHash = SourceHash(file.read())
+    path = CachePath(filename, directory)
+    ast = ReadCache(path, sourceHash, reader)
+    if ast == None:
+        ast = parse(filename)
+        WriteCache(path, sourceHash, ast, reader)
+    return ast
+
+def PrewarmCache(directory: str, parse: Callable[[str], ListNode], cacheDirectory: Optional[str] = None, reader: str = "") -> int:
+    """ Fill the cache for all .AAP files inside of a directory.
+    Haskell notation:
+        PrewarmCache :: String -> Callable -> String -> String -> Integer
+    Parameters:
+        directory (str): The directory which is searched recursively.
+        parse (Callable): The function which creates the AST of a file.
+        cacheDirectory (str): The directory where the cache files are stored, None to store them next to the sources.
+        reader (str): The names of the lexer and parser inside of parse, see ReadCache.
+    Returns:
+        amount (int): The amount of files which are in the cache.
+    """
+    filenames = sorted(glob(os.path.join(directory, "**", "*.AAP"), recursive=True))
+    return len(list(map(partial(LoadProgram, parse=parse, directory=cacheDirectory, reader=reader), filenames)))
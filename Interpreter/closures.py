@@ -0,0 +1,202 @@
+from Interpreter.context import Context
+from Interpreter.function import Function
+from Interpreter.interpreter import Gather
+from Interpreter.loop import Repeat
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.tokens import *
+from functools import partial, reduce
+from itertools import compress, repeat
+from operator import add, is_not
+from typing import Callable, List, Optional
+
+Closure = Callable[[Context], Optional[Union[List[Number], Number]]]
+
+class ClosureFunction(Function):
+    """ A function whose body is converted into a closure.
+    The closure is created once when the definition is converted, every call only binds the arguments. """
+    def __init__(self, name: str, arguments: List[Identifier], body: ListNode, context: Context, closure: Closure, cacheSize: int = 0) -> None:
+        """ Initialize the function and the closure of its body.
+        Haskell notation:
+            Init :: String -> [Identifier] -> ListNode -> Context -> Closure -> Integer -> None
+        Parameters:
+            name (str): The name of the function.
+            arguments (Lst): The arguments for the function.
+            body (ListNode): The body of the function.
+            context (Context): The context in which the function was defined.
+            closure (Closure): The closure of the body.
+            cacheSize (int): The size of the ResultCache of a pure function, 0 when the results aren't stored.
+        """
+        super().__init__(name, arguments, body, context, cacheSize)
+        self.closure = closure
+
+    def Execute(self, arguments: List[Number]) -> Number:
+        """ Execute the closure of the function's body.
+        Haskell notation:
+            Execute :: [Number] -> Number
+        Parameters:
+            arguments (Lst): The arguments passed into the function.
+        Returns:
+            number (Number): The result of executing the function's body.
+        """
+        if self.cache:
+            return self.cache.Call(arguments, lambda: self.closure(self.Bind(arguments)))
+        return self.closure(self.Bind(arguments))
+
+def Close(node: 'AllNodes') -> Closure:
+    """ Convert the passed Node into a closure.
+    Every node has a Close{node} function which is responsible for converting that node.
+    The type of the node is only looked up once, the closure directly calls the closures of its children.
+    Haskell notation:
+        Close :: Node -> Closure
+    Parameters:
+        node (Node): The node which will be converted.
+    Returns:
+        closure (Closure): The function which calculates the value of the node within a context.
+    """
+    return globals()[f'Close{type(node).__name__}'](node)
+
+def CloseNumberNode(node: NumberNode) -> Closure:
+    """ Convert a NumberNode, the number is only created once. """
+    number = Number(node.token.value)
+    return lambda context: number
+
+def CloseReturnNode(node: ReturnNode) -> Closure:
+    """ Convert a ReturnNode, an empty return results in None. """
+    if node.node:
+        return Close(node.node)
+    return lambda context: None
+
+def CloseBinaryOperationNode(node: BinaryOperationNode) -> Closure:
+    """ Convert a BinaryOperationNode, the operator is looked up once. """
+    left = Close(node.left)
+    right = Close(node.right)
+    operation = getattr(Number, type(node.operator).__name__)
+    return lambda context: operation(left(context), right(context))
+
+def CloseLogicalOperationNode(node: LogicalOperationNode) -> Closure:
+    """ Convert a LogicalOperationNode, the right closure is only called when the left value doesn't decide the result. """
+    left = Close(node.left)
+    right = Close(node.right)
+    decides = type(node.operator) == Or
+
+    def Decide(context: Context) -> Number:
+        """ Calculate the result of the operation. """
+        value = left(context)
+        if value.IsTrue() == decides:
+            return Number(int(value.value))
+        return Number(int(right(context).value))
+    return Decide
+
+def CloseVariableAssignNode(node: VariableAssignNode) -> Closure:
+    """ Convert a VariableAssignNode. """
+    name = node.token.value
+    value = Close(node.node)
+
+    def Assign(context: Context) -> Number:
+        """ Assign the value to the variable and return it. """
+        number = value(context)
+        context.symbolDictionary.SetValue(name, number)
+        return number
+    return Assign
+
+def CloseVariableAccessNode(node: VariableAccessNode) -> Closure:
+    """ Convert a VariableAccessNode. """
+    name = node.token.value
+
+    def Access(context: Context) -> Number:
+        """ Get the value of the variable. """
+        value = context.symbolDictionary.GetValue(name)
+        if not value:
+            raise Exception(f"No value found for '{name}'..")
+        return value
+    return Access
+
+def CloseListNode(node: ListNode) -> Closure:
+    """ Convert a ListNode.
+    When the list contains ReturnNodes only their values are kept, like VisitListNode. An exception in
+    an element is printed and only leaves out the value of that element, also inside of function bodies. """
+    returnNodes = map(lambda element: ReturnNode == type(element), node.elements)
+    returns = reduce(add, returnNodes, 0)
+    kept = list(map(lambda element: not returns or type(element) == ReturnNode, node.elements))
+    elements = list(map(Close, node.elements))
+
+    def Run(element: Closure, context: Context) -> Optional[Union[List[Number], Number]]:
+        """ Evaluate a single element, None when an exception occurs. """
+        try:
+            return element(context)
+        except Exception as ex:
+            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+            message = template.format(type(ex).__name__, ex.args)
+            print(message)
+
+    def Evaluate(context: Context) -> Union[List[Number], Number]:
+        """ Evaluate every element and keep the values which are returned. """
+        values = compress(map(Run, elements, repeat(context)), kept)
+        values = list(filter(partial(is_not, None), values))
+        if len(values) != 1:
+            return values
+        return values[0]
+    return Evaluate
+
+def CloseIfNode(node: IfNode) -> Closure:
+    """ Convert an IfNode, an IfNode without an else case results in None when the condition is false. """
+    condition, expression = map(Close, node.case)
+    elseCase = Close(node.elseCase) if node.elseCase else lambda context: None
+    return lambda context: expression(context) if condition(context).IsTrue() else elseCase(context)
+
+def CloseWhileNode(node: WhileNode) -> Closure:
+    """ Convert a WhileNode, the loop results in None. """
+    condition = Close(node.condition)
+    body = Close(node.body)
+
+    def Step(context: Context) -> bool:
+        """ Execute the body once when the condition is true. """
+        if condition(context).IsTrue():
+            body(context)
+            return True
+        return False
+    return lambda context: Repeat(Step, context) and None
+
+def CloseFunctionDefenitionNode(node: FunctionDefenitionNode) -> Closure:
+    """ Convert a FunctionDefenitionNode, the body is converted once for all calls. """
+    name = node.token.value if node.token else None
+    body = Close(node.body)
+
+    def Define(context: Context) -> ClosureFunction:
+        """ Create the function within the current context. """
+        function = ClosureFunction(name, node.arguments, node.body, context, body, node.cacheSize)
+        if name:
+            context.symbolDictionary.SetValue(name, function)
+        return function
+    return Define
+
+def CloseFunctionCallNode(node: FunctionCallNode) -> Closure:
+    """ Convert a FunctionCallNode. """
+    function = Close(node.node)
+    arguments = list(map(Close, node.arguments))
+    return lambda context: function(context).Execute(list(map(lambda argument: argument(context), arguments)))
+
+def Evaluate(ast: ListNode, context: Context) -> Union[List[Number], Number]:
+    """ Convert the AST into closures and execute them.
+    Haskell notation:
+        Evaluate :: ListNode -> Context -> Number | [Number]
+    When an exception occurs in a statement of the program the message is printed and the
+    statement has no value, like VisitNode does, the other statements are still executed.
+    Parameters:
+        ast (ListNode): The AST of the program.
+        context (Context): The global context.
+    Returns:
+        number (Number): The result of the program.
+    """
+    def Run(statement: Closure) -> Optional[Union[List[Number], Number]]:
+        """ Execute a single statement, None when an exception occurs. """
+        try:
+            return statement(context)
+        except Exception as ex:
+            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+            message = template.format(type(ex).__name__, ex.args)
+            print(message)
+    return Gather(ast.elements, list(map(Run, map(Close, ast.elements))))
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
@@ -0,0 +1,208 @@
+from Interpreter.lexer import IsFloat, KeywordTable, ReadFile, TokenWindow, WordPattern
+from Interpreter.tokens import *
+from array import array
+from functools import reduce
+from itertools import chain, count, takewhile
+from typing import Iterator, List, Optional, Tuple, Union
+
+LiteralKinds = (Int.kind, Float.kind, Identifier.kind)
+
+class CompactTokens:
+    """ This class stores tokens as integer kinds in parallel arrays.
+    Values of Int, Float and Identifier tokens are stored once in the literals table. """
+    def __init__(self) -> None:
+        """ Initialize the empty arrays and the literals table.
+        Haskell notation:
+            Init :: None
+        """
+        self.kinds = array('B')
+        self.values = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.literals = []
+        self.table = {}
+
+    def __len__(self) -> int:
+        """ The amount of tokens.
+        Haskell notation:
+            Len :: Integer
+        """
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        """ Create the token object at the passed index.
+        Haskell notation:
+            GetItem :: Integer -> Token
+        Parameters:
+            index (int): The index of the token.
+        Returns:
+            token (Token): The token at the index.
+        """
+        kind = self.kinds[index]
+        if kind in LiteralKinds:
+            token = TokenKinds[kind](self.literals[self.values[index]])
+        else:
+            token = TokenKinds[kind]()
+        token.line = self.lines[index]
+        token.column = self.columns[index]
+        return token
+
+    def Append(self, kind: int, value: Optional[Union[int, float, str]], line: int, column: int) -> 'CompactTokens':
+        """ Append a token to the arrays.
+        Haskell notation:
+            Append :: Integer -> Integer | Float | String | None -> Integer -> Integer -> CompactTokens
+        Parameters:
+            kind (int): The kind of the token.
+            value (int, float, str): The value of a literal, None for all other tokens.
+            line (int): The line of the token.
+            column (int): The column of the token.
+        Returns:
+            tokens (CompactTokens): The updated tokens.
+        """
+        self.kinds.append(kind)
+        self.values.append(self.Intern(kind, value) if value != None else -1)
+        self.lines.append(line)
+        self.columns.append(column)
+        return self
+
+    def Intern(self, kind: int, value: Union[int, float, str]) -> int:
+        """ Get the index of the value in the literals table.
+        Haskell notation:
+            Intern :: Integer -> Integer | Float | String -> Integer
+        The value is added to the table the first time it is seen.
+        Parameters:
+            kind (int): The kind of the token.
+            value (int, float, str): The value of the token.
+        Returns:
+            index (int): The index in the literals table.
+        """
+        key = (kind, value)
+        if key not in self.table:
+            self.table[key] = len(self.literals)
+            self.literals.append(value)
+        return self.table[key]
+
+class WindowField:
+    """ This class gives indexed access to a single field of the tokens inside of a TokenWindow. """
+    def __init__(self, window: TokenWindow, name: str) -> None:
+        """ Initialize the window and the name of the field.
+        Haskell notation:
+            Init :: TokenWindow -> String -> None
+        Parameters:
+            window (TokenWindow): The window which contains the tokens.
+            name (str): The name of the field, like kind or line.
+        """
+        self.window = window
+        self.name = name
+
+    def __len__(self) -> int:
+        """ The amount of tokens, see TokenWindow.
+        Haskell notation:
+            Len :: Integer
+        """
+        return len(self.window)
+
+    def __getitem__(self, index: int) -> int:
+        """ Get the field of the token at the passed index.
+        Haskell notation:
+            GetItem :: Integer -> Integer
+        """
+        return getattr(self.window[index], self.name) or 0
+
+class WindowTokens:
+    """ This class lets the compact parser read the tokens of a TokenWindow.
+    The kinds, lines and columns are read from the tokens inside of the window, so only
+    the window is kept in memory instead of arrays with all tokens of the file. """
+    def __init__(self, window: TokenWindow) -> None:
+        """ Initialize the fields of the window.
+        Haskell notation:
+            Init :: TokenWindow -> None
+        Parameters:
+            window (TokenWindow): The tokens which will be parsed, see LexStream.
+        """
+        self.window = window
+        self.kinds = WindowField(window, "kind")
+        self.lines = WindowField(window, "line")
+        self.columns = WindowField(window, "column")
+
+    def __len__(self) -> int:
+        """ The amount of tokens, see TokenWindow.
+        Haskell notation:
+            Len :: Integer
+        """
+        return len(self.window)
+
+    def __getitem__(self, index: int) -> Token:
+        """ Get the token at the passed index.
+        Haskell notation:
+            GetItem :: Integer -> Token
+        """
+        return self.window[index]
+
+def ClassifyWord(word: str) -> Tuple[int, Optional[Union[int, float, str]]]:
+    """ Get the kind and value of a single word.
+    Haskell notation:
+        ClassifyWord :: String -> Tuple
+    Parameters:
+        word (str): The word which will be classified.
+    Returns:
+        kind (int): The kind of the token.
+        value (int, float, str): The value of a literal, None for all other tokens.
+    """
+    keyword = KeywordTable.get(word, None)
+    if keyword:
+        return keyword.kind, None
+    if word.isdigit():
+        return Int.kind, int(word)
+    elif IsFloat(word):
+        return Float.kind, float(word)
+    return Identifier.kind, word
+
+def LexCompact(text: List[str] = None, filename: str = None) -> CompactTokens:
+    """ Lex the file or lines into compact tokens.
+    Haskell notation:
+        LexCompact :: [String] -> String -> CompactTokens
+    No token objects are created, every word is stored as a kind, a position and a literal index.
+    Parameters:
+        text (Lst): The lines of text which can be lexed into tokens.
+        filename (str): The filename which contains the text which can be lexed into tokens.
+    Returns:
+        tokens (CompactTokens): The compact tokens, ending with an EOF token.
+    """
+    if text == None:
+        text = ReadFile(filename)
+    words = chain.from_iterable(map(LineWords, count(1), text))
+    tokens = reduce(lambda tokens, word: tokens.Append(*ClassifyWord(word[0]), word[1], word[2]), words, CompactTokens())
+    return tokens.Append(EOF.kind, None, len(text) + 1, 1)
+
+def LineWords(line: int, text: str) -> Iterator[Tuple[str, int, int]]:
+    """ Get all words on a line with their position.
+    Haskell notation:
+        LineWords :: Integer -> String -> [Tuple]
+    Parameters:
+        line (int): The line number of the text.
+        text (str): The line which will be split.
+    Returns:
+        words (Iterator): The word, line and column of every word.
+    """
+    return map(lambda match: (match.group(), line, match.start() + 1), WordPattern.finditer(text))
+
+def Compact(tokens: List[Token]) -> CompactTokens:
+    """ Convert a list of token objects into compact tokens.
+    Haskell notation:
+        Compact :: [Token] -> CompactTokens
+    The tokens are read up to the first EOF token.
+    Parameters:
+        tokens (Lst): The tokens which will be converted.
+    Returns:
+        tokens (CompactTokens): The compact tokens.
+    """
+    def AppendToken(compact: CompactTokens, token: Token) -> CompactTokens:
+        """ Append a single token object.
+        Haskell notation:
+            AppendToken :: CompactTokens -> Token -> CompactTokens
+        """
+        value = token.value if token.kind in LiteralKinds else None
+        return compact.Append(token.kind, value, token.line or 0, token.column or 0)
+    compact = reduce(AppendToken, takewhile(lambda token: token.kind != EOF.kind, tokens), CompactTokens())
+    return compact.Append(EOF.kind, None, compact.lines[-1] + 1 if len(compact) else 1, 1)
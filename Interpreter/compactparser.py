@@ -0,0 +1,377 @@
+from Interpreter.compact import CompactTokens, Compact, WindowTokens
+from Interpreter.lexer import TokenWindow
+from Interpreter.loop import Iterate
+from Interpreter.nodes import *
+from Interpreter.tokens import *
+from typing import List, Tuple, Union
+
+Precedence = {
+    And.kind: 1, Or.kind: 1,
+    Equals.kind: 2, NotEquals.kind: 2, GreaterThan.kind: 2, GreaterThanEquals.kind: 2, LessThan.kind: 2, LessThanEquals.kind: 2,
+    Plus.kind: 3, Minus.kind: 3,
+    Multiply.kind: 4, Divide.kind: 4
+}
+ArgumentKinds = frozenset((Int.kind, Float.kind, Identifier.kind))
+
+def IncrementIndex(tokens: CompactTokens, index: int) -> int:
+    """ Increment the index if incrementing it won't make it go out of bounds.
+    Haskell notation:
+        IncrementIndex :: CompactTokens -> Integer -> Integer
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        index (int): The incremented index.
+    """
+    return index + 1 if index < len(tokens.kinds) - 1 else index
+
+def Expect(tokens: CompactTokens, index: int, kind: int, message: str) -> int:
+    """ Check the kind of the current token and skip over it.
+    Haskell notation:
+        Expect :: CompactTokens -> Integer -> Integer -> String -> Integer
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+        kind (int): The kind which is expected.
+        message (str): The message of the exception when the kind is different.
+    Returns:
+        index (int): The incremented index.
+    """
+    if tokens.kinds[index] != kind:
+        raise Exception(f"{message} (line {tokens.lines[index]}, column {tokens.columns[index]})")
+    return IncrementIndex(tokens, index)
+
+def SkipNewLines(tokens: CompactTokens, index: int) -> Tuple[int, int]:
+    """ Skip over all new lines.
+    Haskell notation:
+        SkipNewLines :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        index (int): The index after the new lines.
+        skipped (int): The amount of new lines which have been skipped.
+    """
+    last = len(tokens.kinds) - 1
+    end = next(filter(lambda i: tokens.kinds[i] != NewLine.kind, range(index, last)), max(index, last))
+    return end, end - index
+
+def GetArguments(tokens: CompactTokens, index: int, arguments: List['Node']) -> Tuple[int, List['Node']]:
+    """ Get the arguments which are seperated by commas.
+    Haskell notation:
+        GetArguments :: CompactTokens -> Integer -> [Node] -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+        arguments (Lst): A list which will contain all arguments.
+    Returns:
+        index (int): The index which will be used throughout the parse process.
+        arguments (Lst): The list with all arguments.
+    """
+    def GetArgument(state: Tuple[int, List['Node']]) -> Tuple[int, List['Node']]:
+        """ Get the argument after the current comma.
+        Haskell notation:
+            GetArgument :: Tuple -> Tuple
+        """
+        i, arguments = state
+        i = IncrementIndex(tokens, i)
+        if tokens.kinds[i] in ArgumentKinds:
+            argument, i = Expression(tokens, i)
+            arguments.append(argument)
+        elif tokens.kinds[i] != RPar.kind:
+            raise Exception(f"Expected Identifier or '{RPar.value}'")
+        return i, arguments
+    return Iterate(GetArgument, (index, arguments), lambda state: tokens.kinds[state[0]] != Comma.kind)
+
+def Operations(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse a chain of factors and operators.
+    Haskell notation:
+        Operations :: CompactTokens -> Integer -> Tuple
+    The operators are combined with the Precedence table instead of a function
+    per grammar level. Operators with the same precedence are left associative,
+    so the resulting BinaryOperationNodes are the same as those of Parse.
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (Node): The resulting node.
+        index (int): The incremented index.
+    """
+    def Shift(state: Tuple[Tuple['Node', ...], Tuple[Token, ...], int]) -> Tuple[Tuple['Node', ...], Tuple[Token, ...], int]:
+        """ Combine the stronger operators on the stack and push the next operator and factor.
+        Haskell notation:
+            Shift :: Tuple -> Tuple
+        """
+        operands, operators, i = state
+        operator = tokens[i]
+        operands, operators = Reduce(operands, operators, Precedence[operator.kind])
+        right, i = Factor(tokens, IncrementIndex(tokens, i))
+        return operands + (right,), operators + (operator,), i
+
+    left, index = Factor(tokens, index)
+    operands, operators, index = Iterate(Shift, ((left,), (), index), lambda state: tokens.kinds[state[2]] not in Precedence)
+    operands, operators = Reduce(operands, operators, 0)
+    return operands[0], index
+
+def Reduce(operands: Tuple['Node', ...], operators: Tuple[Token, ...], precedence: int) -> Tuple[Tuple['Node', ...], Tuple[Token, ...]]:
+    """ Combine the operators on top of the stack which bind at least as strong as the passed precedence.
+    Haskell notation:
+        Reduce :: Tuple -> Tuple -> Integer -> Tuple
+    The stack never holds more operators than there are precedence levels.
+    Parameters:
+        operands (Tuple): The stack of operands.
+        operators (Tuple): The stack of operators.
+        precedence (int): The precedence of the next operator.
+    Returns:
+        operands (Tuple): The remaining operands.
+        operators (Tuple): The remaining operators.
+    """
+    def Combine(stacks: Tuple[Tuple['Node', ...], Tuple[Token, ...]]) -> Tuple[Tuple['Node', ...], Tuple[Token, ...]]:
+        """ Combine the top two operands with the top operator.
+        Haskell notation:
+            Combine :: Tuple -> Tuple
+        """
+        operands, operators = stacks
+        node = BinaryOperationNode(operands[-2], operators[-1], operands[-1])
+        return operands[:-2] + (node,), operators[:-1]
+    return Iterate(Combine, (operands, operators), lambda stacks: not stacks[1] or Precedence[stacks[1][-1].kind] < precedence)
+
+def Expression(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse an Expression.
+    Haskell notation:
+        Expression :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (Node): The resulting node.
+        index (int): The incremented index.
+    """
+    if tokens.kinds[index] == Variable.kind:
+        index = IncrementIndex(tokens, index)
+        if tokens.kinds[index] != Identifier.kind:
+            raise Exception(f"Expected Identifier token..")
+        name = tokens[index]
+        index = Expect(tokens, IncrementIndex(tokens, index), Assign.kind, f"Expected '{Assign.value}' token..")
+        expression, index = Expression(tokens, index)
+        return VariableAssignNode(name, expression), index
+    return Operations(tokens, index)
+
+def ElseStatement(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse an Else Statement.
+    Haskell notation:
+        ElseStatement :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        elseCase (Node): The resulting else case, None when there is no else case.
+        index (int): The incremented index.
+    """
+    if tokens.kinds[index] != Else.kind:
+        return None, index
+    index = IncrementIndex(tokens, index)
+    if tokens.kinds[index] == NewLine.kind:
+        statements, index = Statements(tokens, IncrementIndex(tokens, index))
+        return statements, Expect(tokens, index, EndIf.kind, f"Expected {EndIf.value} Token..")
+    return Statement(tokens, index)
+
+def IfStatement(tokens: CompactTokens, index: int) -> Tuple[IfNode, int]:
+    """ Parse an If Statement.
+    Haskell notation:
+        IfStatement :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (IfNode): The resulting IfNode.
+        index (int): The incremented index.
+    """
+    condition, index = Expression(tokens, index)
+    index = Expect(tokens, index, Then.kind, f"Expected {Then.value} token..")
+    if tokens.kinds[index] == NewLine.kind:
+        statements, index = Statements(tokens, IncrementIndex(tokens, index))
+        if tokens.kinds[index] == EndIf.kind:
+            return IfNode((condition, statements), None), IncrementIndex(tokens, index)
+        elseCase, index = ElseStatement(tokens, index)
+        return IfNode((condition, statements), elseCase), index
+    expression, index = Statement(tokens, index)
+    elseCase, index = ElseStatement(tokens, index)
+    return IfNode((condition, expression), elseCase), index
+
+def WhileLoop(tokens: CompactTokens, index: int) -> Tuple[WhileNode, int]:
+    """ Parse a While loop.
+    Haskell notation:
+        WhileLoop :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (WhileNode): The resulting WhileNode.
+        index (int): The incremented index.
+    """
+    condition, index = Expression(tokens, index)
+    index = Expect(tokens, index, Then.kind, f"Expected {Then.value} token..")
+    if tokens.kinds[index] == NewLine.kind:
+        body, index = Statements(tokens, IncrementIndex(tokens, index))
+        return WhileNode(condition, body), Expect(tokens, index, EndWhile.kind, f"Expected {EndWhile.value} Token..")
+    body, index = Statement(tokens, index)
+    return WhileNode(condition, body), index
+
+def FunctionDefenition(tokens: CompactTokens, index: int) -> Tuple[FunctionDefenitionNode, int]:
+    """ Parse a Function defenition.
+    Haskell notation:
+        FunctionDefenition :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (FunctionDefenitionNode): The resulting FunctionDefenitionNode.
+        index (int): The incremented index.
+    """
+    token = None
+    if tokens.kinds[index] == Identifier.kind:
+        token = tokens[index]
+        index = Expect(tokens, IncrementIndex(tokens, index), LPar.kind, f"Expected '{LPar.value}'..")
+    else:
+        index = Expect(tokens, index, LPar.kind, f"Expected Identifier or '{LPar.value}'..")
+
+    arguments = []
+    if tokens.kinds[index] == Identifier.kind:
+        arguments.append(tokens[index])
+        index, arguments = GetArguments(tokens, IncrementIndex(tokens, index), arguments)
+    index = Expect(tokens, index, RPar.kind, "Expected RPar token..")
+    index = Expect(tokens, index, NewLine.kind, f"Expected a new line after the assignment of '{FunctionDef.value}' '{token}'..")
+    body, index = Statements(tokens, index)
+    index = Expect(tokens, index, EndFunction.kind, f"Expected {EndFunction.value} Token..")
+    return FunctionDefenitionNode(token, arguments, body), index
+
+def CallFunction(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse the function and arguments after a Run token.
+    Haskell notation:
+        CallFunction :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (Node): The resulting node.
+        index (int): The incremented index.
+    """
+    factor, index = Factor(tokens, index)
+    if tokens.kinds[index] != LPar.kind:
+        return factor, index
+    index = IncrementIndex(tokens, index)
+    if tokens.kinds[index] == RPar.kind:
+        return FunctionCallNode(factor, []), IncrementIndex(tokens, index)
+    expression, index = Expression(tokens, index)
+    index, arguments = GetArguments(tokens, index, [expression])
+    return FunctionCallNode(factor, arguments), Expect(tokens, index, RPar.kind, "Expected RPar token..")
+
+def Factor(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse a Factor.
+    Haskell notation:
+        Factor :: CompactTokens -> Integer -> Tuple
+    The kind of the current token decides which node gets created.
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (Node): The resulting node.
+        index (int): The incremented index.
+    """
+    kind = tokens.kinds[index]
+    start = index
+    index = IncrementIndex(tokens, index)
+
+    if kind == Int.kind or kind == Float.kind:
+        return NumberNode(tokens[start]), index
+    elif kind == Identifier.kind:
+        return VariableAccessNode(tokens[start]), index
+    elif kind == LPar.kind:
+        expression, index = Expression(tokens, index)
+        return expression, Expect(tokens, index, RPar.kind, f"Expected '{RPar.value}'..")
+    elif kind == If.kind:
+        return IfStatement(tokens, index)
+    elif kind == While.kind:
+        return WhileLoop(tokens, index)
+    elif kind == FunctionDef.kind:
+        return FunctionDefenition(tokens, index)
+    elif kind == Run.kind:
+        return CallFunction(tokens, index)
+    elif kind == Return.kind:
+        expression, index = Expression(tokens, index)
+        return ReturnNode(expression), index
+    raise Exception(f"Unexpected token '{TokenKinds[kind].__name__}' (line {tokens.lines[start]}, column {tokens.columns[start]})")
+
+def Statement(tokens: CompactTokens, index: int) -> Tuple['Node', int]:
+    """ Parse a Statement.
+    Haskell notation:
+        Statement :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (Node): The resulting statement.
+        index (int): The incremented index.
+    """
+    if tokens.kinds[index] == Return.kind:
+        expression, index = Expression(tokens, IncrementIndex(tokens, index))
+        return ReturnNode(expression), index
+    return Expression(tokens, index)
+
+def Statements(tokens: CompactTokens, index: int) -> Tuple[ListNode, int]:
+    """ Parse Statements which are seperated by new lines.
+    Haskell notation:
+        Statements :: CompactTokens -> Integer -> Tuple
+    Parameters:
+        tokens (CompactTokens): The tokens which will be parsed.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        node (ListNode): The resulting ListNode.
+        index (int): The incremented index.
+    """
+    def GetStatement(state: Tuple[List['Node'], int, int]) -> Tuple[List['Node'], int, int]:
+        """ Get the statement after the new lines and skip the new lines behind it.
+        Haskell notation:
+            GetStatement :: Tuple -> Tuple
+        """
+        statements, i, _ = state
+        statement, i = Statement(tokens, i)
+        statements.append(statement)
+        return (statements, *SkipNewLines(tokens, i))
+
+    def Done(state: Tuple[List['Node'], int, int]) -> bool:
+        """ The statements end when a statement is not followed by a new line and another statement.
+        Haskell notation:
+            Done :: Tuple -> Boolean
+        """
+        _, i, skipped = state
+        return skipped == 0 or tokens.kinds[i] not in StatementKinds
+
+    index = SkipNewLines(tokens, index)[0]
+    statements, index, _ = Iterate(GetStatement, ([], index, 1), lambda state: len(state[0]) > 0 and Done(state))
+    return ListNode(statements), index
+
+def ParseCompact(tokens: Union[CompactTokens, TokenWindow, List[Token]], index: int = 0) -> ListNode:
+    """ Parse compact tokens and create an AST.
+    Haskell notation:
+        ParseCompact :: CompactTokens -> Integer -> ListNode
+    The parser only compares integer kinds, token objects are only created
+    for the tokens which are stored inside of the nodes. Statements, arguments
+    and operators are parsed iteratively, so only nested constructs use the stack.
+    A TokenWindow is read directly, the parser never looks back more than a single token.
+    Parameters:
+        tokens (CompactTokens, TokenWindow, Lst): The tokens which will be parsed, a list of tokens is compacted first.
+        index (int): The index which will be used throughout the parse process.
+    Returns:
+        AST (ListNode): The AST which resulted out of the passed tokens.
+    """
+    if type(tokens) == TokenWindow:
+        tokens = WindowTokens(tokens)
+    elif type(tokens) != CompactTokens:
+        tokens = Compact(tokens)
+    statements, index = Statements(tokens, index)
+    if tokens.kinds[index] == EOF.kind:
+        return statements
+
+StatementKinds = frozenset((Int.kind, Float.kind, Identifier.kind, LPar.kind, If.kind, While.kind, FunctionDef.kind, Run.kind, Return.kind, Variable.kind))
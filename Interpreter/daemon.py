@@ -0,0 +1,128 @@
+from Interpreter.interpreter import VisitNode
+from Interpreter.lexer import LexLinear
+from Interpreter.nodes import *
+from Interpreter.parser import Parse
+from Interpreter.runner import Prepare, RunProgram
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import json
+import os
+import signal
+
+def ReadSource(source: str, lexer: Callable = LexLinear, parser: Callable = Parse) -> ListNode:
+    """ Create the AST of the text of a program.
+    Haskell notation:
+        ReadSource :: String -> Callable -> Callable -> ListNode
+    Parameters:
+        source (str): The text of the program.
+        lexer (Callable): The lexer which creates the tokens, it has to accept the lines as text.
+        parser (Callable): The parser which creates the AST.
+    Returns:
+        ast (ListNode): The AST of the program.
+    """
+    tokens = lexer(text=source.splitlines(keepends=True))
+    return parser(tokens, index=0)
+
+def Handle(request: Dict[str, Any]) -> Dict[str, Any]:
+    """ Interpret a single request inside of a worker.
+    Haskell notation:
+        Handle :: Dict -> Dict
+    A request contains the "source" of a program or the name of its "file", and optionally a "function" and
+    its "arguments". A file is read again for every request, but the worker only parses a text it hasn't seen
+    before, see Program. So a changed file is parsed again, and an unchanged file is never parsed twice.
+    Without a function the program is interpreted in a new global context. With a function only the call is
+    interpreted, see RunProgram. So requests can't see each others variables, but pure functions keep their
+    stored results between requests.
+    Parameters:
+        request (Dict): The request.
+    Returns:
+        response (Dict): The result and everything which was printed, or the error of a request which can't be read.
+    """
+    try:
+        if "source" in request:
+            source = request["source"]
+        else:
+            with open(request["file"]) as file:
+                source = file.read()
+    except (KeyError, OSError) as ex:
+        return {"error": f"A request needs a source or a readable file: {ex}"}
+    return RunProgram(source, request.get("function"), request.get("arguments", []))
+
+async def Respond(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, executor: Executor) -> None:
+    """ Answer every request of a connection.
+    Haskell notation:
+        Respond :: StreamReader -> StreamWriter -> Executor -> None
+    Every line which the client sends is a request as JSON, every line which is sent back is its response.
+    A connection can be kept open for many requests, the responses are sent in the order of the requests.
+    Parameters:
+        reader (StreamReader): The requests of the client.
+        writer (StreamWriter): The responses to the client.
+        executor (Executor): The workers which interpret the requests.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def Answer(line: bytes) -> None:
+        """ Interpret a single request and send its response. """
+        try:
+            request = json.loads(line)
+        except ValueError as ex:
+            response = {"error": f"A request has to be a JSON object: {ex}"}
+        else:
+            response = await loop.run_in_executor(executor, Handle, request) if type(request) == dict else {"error": "A request has to be a JSON object."}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    try:
+        async for line in reader:
+            if line.strip():
+                await Answer(line)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def Listen(path: str, executor: Executor) -> None:
+    """ Accept connections on a Unix domain socket until the server is stopped.
+    Haskell notation:
+        Listen :: String -> Executor -> None
+    The server stops with Ctrl+C or when it is terminated.
+    Parameters:
+        path (str): The path of the socket.
+        executor (Executor): The workers which interpret the requests.
+    """
+    server = await asyncio.start_unix_server(lambda reader, writer: Respond(reader, writer, executor), path)
+    async with server:
+        serving = asyncio.ensure_future(server.serve_forever())
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+
+def Serve(path: str, read: Callable[[str], ListNode] = ReadSource, execute: Callable = VisitNode, optimize: bool = True, cacheSize: int = 0, workers: Optional[int] = None) -> None:
+    """ Run the interpreter as a server which keeps its workers and ASTs between requests.
+    Haskell notation:
+        Serve :: String -> Callable -> Callable -> Boolean -> Integer -> Integer -> None
+    The workers are started once, before the server listens, so a request doesn't pay for starting Python,
+    importing the interpreter or parsing a program which was sent before. Starting them while the event loop
+    runs could copy its locks into the workers in a locked state.
+    Parameters:
+        path (str): The path of the socket, an old socket at that path is removed.
+        read (Callable): The function which creates the AST of the text of a program, see ReadSource.
+        execute (Callable): The engine which interprets the AST.
+        optimize (bool): Whether the ASTs are optimized.
+        cacheSize (int): The amount of results which every pure function stores, 0 to store nothing.
+        workers (int): The amount of worker processes, the amount of cores by default.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    with ProcessPoolExecutor(workers, initializer=Prepare, initargs=(read, execute, optimize, cacheSize)) as executor:
+        executor.submit(os.getpid).result()
+        try:
+            asyncio.run(Listen(path, executor))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
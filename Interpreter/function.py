@@ -3,47 +3,161 @@ from Interpreter.context import Context, SymbolDictionary
 from Interpreter.nodes import ListNode
 from Interpreter.number import Number
 from Interpreter.tokens import *
-from typing import List
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+CacheSize = 1024
+
+class ResultCache:
+    """ The results of a pure function, stored by the values of the arguments.
+    When the cache is full the result which was used longest ago is removed. """
+    def __init__(self, size: int = CacheSize) -> None:
+        """ Initialize the cache and its counters.
+        Haskell notation:
+            Init :: Integer -> None
+        Parameters:
+            size (int): The maximum amount of results in the cache.
+        """
+        self.size = size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __str__(self) -> str:
+        """ Represent the counters of the ResultCache as string. """
+        return f'{len(self.results)}/{self.size} results, {self.hits} hits, {self.misses} misses, {self.evictions} evictions'
+
+    def Lookup(self, key: Optional[Tuple]) -> Optional[Number]:
+        """ Get the result which belongs to the arguments.
+        Haskell notation:
+            Lookup :: Tuple -> Number | None
+        Parameters:
+            key (Tuple): The key of the arguments, see Key.
+        Returns:
+            number (Number): The stored result.
+            Returns None if the result isn't stored or when the arguments have no key.
+        """
+        if key == None:
+            return None
+        result = self.results.get(key, None)
+        if result == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return result
+
+    def Store(self, key: Optional[Tuple], result: Optional[Number]) -> None:
+        """ Store the result of a call, only a single number is stored.
+        Haskell notation:
+            Store :: Tuple -> Number -> None
+        Parameters:
+            key (Tuple): The key of the arguments, see Key.
+            result (Number): The result of the call.
+        """
+        if key == None or not isinstance(result, Number):
+            return
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+            self.evictions += 1
+
+    def Call(self, arguments: List[Number], calculate: Callable[[], Number]) -> Number:
+        """ Get the stored result of a call, or calculate and store it.
+        Haskell notation:
+            Call :: [Number] -> Callable -> Number
+        Parameters:
+            arguments (Lst): The arguments passed into the function.
+            calculate (Callable): Executes the function's body.
+        Returns:
+            number (Number): The result of the call.
+        """
+        key = Key(arguments)
+        result = self.Lookup(key)
+        if result == None:
+            result = calculate()
+            self.Store(key, result)
+        return result
+
+def Key(arguments: List[Number]) -> Optional[Tuple]:
+    """ Create the key of the arguments of a call.
+    Haskell notation:
+        Key :: [Number] -> Tuple | None
+    The type is part of the key, 1 and 1.0 give different results when they are divided.
+    Parameters:
+        arguments (Lst): The arguments passed into the function.
+    Returns:
+        key (Tuple): The types and values of the arguments.
+        Returns None if an argument isn't a number, like a function.
+    """
+    if not all(map(lambda argument: isinstance(argument, Number), arguments)):
+        return None
+    return tuple(map(lambda argument: (type(argument.value), argument.value), arguments))
 
 class Function:
-    def __init__(self, name: str, arguments: List[Identifier], body: ListNode, context: Context) -> None:
+    def __init__(self, name: str, arguments: List[Identifier], body: ListNode, context: Context, cacheSize: int = 0) -> None:
         """ Initialize the function class. 
         Haskell notation:
-            Init :: String -> [Identifier] -> ListNode -> Context -> None
+            Init :: String -> [Identifier] -> ListNode -> Context -> Integer -> None
         Parameters:
             name (str): The name of the function. 
             arguments (Lst): The arguments for the function.
             body (Node): The body of the function in the form of a Node.
             context (context): The context for the function.
+            cacheSize (int): The size of the ResultCache of a pure function, 0 when the results aren't stored.
         """
         self.name = name
         self.arguments = arguments
         self.body = body
         self.context = context
+        self.cache = ResultCache(cacheSize) if cacheSize else None
 
-    def Execute(self, arguments: List[Number]) -> Number:
-        """ Execute the function's body. 
+    def CheckArguments(self, arguments: List[Number]) -> None:
+        """ Check whether the amount of arguments matches the function.
         Haskell notation:
-            Execute :: [Number] -> Number
+            CheckArguments :: [Number] -> None
         Parameters:
             arguments (Lst): The arguments passed into the function.
-        Returns:
-            number (Number): The result of executing the function's body.
         """
-        context = Context(self.context)
-        context.symbolDictionary = SymbolDictionary(self.context.symbolDictionary)
         if len(arguments) > len(self.arguments):
             raise Exception(f"Too many arguments given for {FunctionDef.value} {self.name}.. Expected {len(self.arguments)}, got {len(arguments)}")
         elif len(arguments) < len(self.arguments):
             raise Exception(f"Too little arguments given for {FunctionDef.value} {self.name}.. Expected {len(self.arguments)}, got {len(arguments)}")
 
+    def Bind(self, arguments: List[Number]) -> Context:
+        """ Create the context in which the function's body is executed.
+        Haskell notation:
+            Bind :: [Number] -> Context
+        Parameters:
+            arguments (Lst): The arguments passed into the function.
+        Returns:
+            context (Context): The context containing all arguments.
+        """
+        context = Context(self.context)
+        context.symbolDictionary = SymbolDictionary(self.context.symbolDictionary)
+        self.CheckArguments(arguments)
+
         def SetArguments(index, localContext):
             if index < len(arguments):
                 name = self.arguments[index]
                 value = arguments[index]
-                value.context = localContext
                 localContext.symbolDictionary.SetValue(name.value, value)
                 return SetArguments(index + 1, localContext) 
             return localContext
-        context = SetArguments(0, context)
-        return interpreter.VisitNode(self.body, context)
\ No newline at end of file
+        return SetArguments(0, context)
+
+    def Execute(self, arguments: List[Number]) -> Number:
+        """ Execute the function's body. 
+        The result of a pure function is only calculated once for the same arguments.
+        Haskell notation:
+            Execute :: [Number] -> Number
+        Parameters:
+            arguments (Lst): The arguments passed into the function.
+        Returns:
+            number (Number): The result of executing the function's body.
+        """
+        if self.cache:
+            return self.cache.Call(arguments, lambda: interpreter.VisitNode(self.body, self.Bind(arguments)))
+        return interpreter.VisitNode(self.body, self.Bind(arguments))
\ No newline at end of file
@@ -0,0 +1,140 @@
+from Interpreter.context import Context
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.purity import Nodes
+from collections import Counter
+from contextlib import contextmanager
+from html import escape
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List
+import Interpreter.interpreter as interpreter
+
+class Heatmap:
+    def __init__(self) -> None:
+        """ Initialize the counters of the lines of a program.
+        Haskell notation:
+            Init :: None
+        """
+        self.lines = {}
+        self.hits = Counter()
+        self.time = Counter()
+        self.frames = []
+
+    def Visit(self, node: 'AllNodes', visit: Callable[[], Number]) -> Number:
+        """ Visit a node and count the visit and its exclusive time for its line.
+        Haskell notation:
+            Visit :: Node -> Callable -> Number
+        Parameters:
+            node (Node): The node which is visited.
+            visit (Callable): Interprets the node.
+        Returns:
+            number (Number): The result of the node.
+        """
+        line = self.lines.get(id(node))
+        if line == None:
+            return visit()
+        self.hits[line] += 1
+        self.frames.append([perf_counter(), 0.0])
+        try:
+            return visit()
+        finally:
+            start, children = self.frames.pop()
+            elapsed = perf_counter() - start
+            self.time[line] += elapsed - children
+            if self.frames:
+                self.frames[-1][1] += elapsed
+
+    def Annotate(self, source: List[str]) -> List[str]:
+        """ Place the hits and the time in milliseconds in front of every line of the source.
+        Haskell notation:
+            Annotate :: [String] -> [String]
+        Parameters:
+            source (Lst): The lines of the program.
+        Returns:
+            lines (Lst): The annotated lines, lines without hits have empty columns.
+        """
+        def Line(number: int, text: str) -> str:
+            """ Annotate a single line. """
+            if not self.hits[number]:
+                return f"{'':>10} {'':>10} | {text.rstrip()}"
+            return f"{self.hits[number]:>10} {self.time[number] * 1000:>10.3f} | {text.rstrip()}"
+        return [f"{'hits':>10} {'ms':>10} |"] + list(map(Line, range(1, len(source) + 1), source))
+
+    def Html(self, source: List[str], title: str = "") -> str:
+        """ Create an HTML report of the source in which the lines are colored by their time.
+        Haskell notation:
+            Html :: [String] -> String -> String
+        Parameters:
+            source (Lst): The lines of the program.
+            title (str): The title of the report, like the name of the file.
+        Returns:
+            html (str): The report, the line with the most time is fully red.
+        """
+        hottest = max(self.time.values(), default=0) or 1
+
+        def Row(number: int, text: str) -> str:
+            """ Create the row of a single line. """
+            heat = self.time[number] / hottest
+            hits = self.hits[number] or ""
+            time = f"{self.time[number] * 1000:.3f}" if self.hits[number] else ""
+            return f'<tr style="background: rgba(255, 0, 0, {heat:.2f})"><td>{number}</td><td>{hits}</td><td>{time}</td><td><pre>{escape(text.rstrip())}</pre></td></tr>'
+        rows = "\n".join(map(Row, range(1, len(source) + 1), source))
+        return f'''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(title)}</title>
+<style>table {{ border-collapse: collapse; font-family: monospace; }} td {{ padding: 0 8px; text-align: right; }} pre {{ margin: 0; text-align: left; }}</style>
+</head><body><h1>{escape(title)}</h1>
+<table><tr><th>line</th><th>hits</th><th>ms</th><th>source</th></tr>
+{rows}
+</table></body></html>
+'''
+
+@contextmanager
+def Heating(heatmap: Heatmap, ast: ListNode) -> Iterator[Heatmap]:
+    """ Let the tree engine count every node it visits in the heatmap.
+    Haskell notation:
+        Heating :: Heatmap -> ListNode -> Heatmap
+    VisitNode is replaced until the block ends, like Profiling, so a program without
+    a heatmap runs exactly the same code as before.
+    Parameters:
+        heatmap (Heatmap): The heatmap which is filled.
+        ast (ListNode): The AST of the program, the line of every node is found before it is interpreted.
+    Returns:
+        heatmap (Heatmap): The same heatmap.
+    """
+    visit = interpreter.VisitNode
+    heatmap.lines.update(Lines(ast))
+    interpreter.VisitNode = lambda node, context: heatmap.Visit(node, lambda: visit(node, context))
+    try:
+        yield heatmap
+    finally:
+        interpreter.VisitNode = visit
+
+def VisitHeated(ast: ListNode, context: Context, heatmap: Heatmap) -> Union[List[Number], Number]:
+    """ Interpret a program with the tree engine and count the visits and time of every line.
+    Haskell notation:
+        VisitHeated :: ListNode -> Context -> Heatmap -> Number | [Number]
+    Parameters:
+        ast (ListNode): The AST of the program.
+        context (Context): The global context.
+        heatmap (Heatmap): The heatmap which is filled, see Heating.
+    Returns:
+        number (Number): The result of the program.
+    """
+    with Heating(heatmap, ast):
+        return interpreter.VisitNode(ast, context)
+
+def Lines(ast: ListNode) -> Dict[int, int]:
+    """ Find the line of every node of a program.
+    Haskell notation:
+        Lines :: ListNode -> Dict
+    Every node is placed on the line where it starts, see Position. A ListNode only groups
+    statements, which are counted themselves, so it doesn't belong to a line.
+    Parameters:
+        ast (ListNode): The AST of the program.
+    Returns:
+        lines (Dict): The line of every node by its id, nodes without a position are left out.
+    """
+    positions = map(lambda node: (id(node), Position(node)), filter(lambda node: type(node) != ListNode, Nodes(ast)))
+    return dict(map(lambda item: (item[0], item[1][0]), filter(lambda item: item[1], positions)))
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
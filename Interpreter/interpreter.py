@@ -1,4 +1,5 @@
 from Interpreter.function import Function
+from Interpreter.loop import Repeat
 from Interpreter.nodes import *
 from Interpreter.number import Number
 from Interpreter.tokens import *
@@ -37,7 +38,7 @@ def VisitNumberNode(node: NumberNode, context: Context) -> Number:
     Returns:
         number (Number): The result of interpreting the NumberNode.
     """
-    return Number(node.token.value, context)
+    return Number(node.token.value)
 
 def VisitReturnNode(node: ReturnNode, context: Context) -> Optional[Number]:
     """ Interpret a ReturnNode. 
@@ -73,6 +74,23 @@ def VisitBinaryOperationNode(node: BinaryOperationNode, context: Context) -> Num
         message = template.format(type(ex).__name__, ex.args)
         print(message)
 
+def VisitLogicalOperationNode(node: LogicalOperationNode, context: Context) -> Number:
+    """ Interpret a LogicalOperationNode.
+    Haskell notation:
+        VisitLogicalOperationNode :: LogicalOperationNode -> Context -> Number
+    The right node is only interpreted when the left node doesn't decide the result.
+    Parameters:
+        node (LogicalOperationNode): The LogicalOperationNode which will be interpreted.
+        context (Context): The current existing context.
+    Returns:
+        number (Number): The result of interpreting the LogicalOperationNode.
+    """
+    left = VisitNode(node.left, context)
+    if left.IsTrue() == (type(node.operator) == Or):
+        return Number(int(left.value))
+    right = VisitNode(node.right, context)
+    return Number(int(right.value))
+
 def VisitVariableAssignNode(node: VariableAssignNode, context: Context) -> Number:
     """ Interpret a VariableAssignNode.
     Haskell notation:
@@ -115,30 +133,28 @@ def VisitListNode(node: ListNode, context: Context) -> Union[List[Number], Numbe
         number (Number): The result of interpreting the VariableAssignNode.
         numbers (Lst): A list filled with the results of interpreted nodes.
     """
-    returnNodes = map(lambda element: ReturnNode == type(element), node.elements)
-    returns = reduce(add, returnNodes, 0)
-
-    def VisitElement(element: 'AllNodes') -> Number:
-        """ Visit element of list.
-        Haskell notation:
-            VisitElement :: Node -> Number
-        Parameters: 
-            element (Node): An element from the ListNode which will be interpreted.
-        Returns:
-            number (Number): The result of interpreting the node.
-        """
-        if not returns:
-            return VisitNode(element, context)
-        if type(element) == ReturnNode:
-            return VisitNode(element, context)
-        VisitNode(element, context)
+    return Gather(node.elements, list(map(partial(VisitNode, context=context), node.elements)))
 
-    elements = []
-    elements = list(chain(*map(lambda node: [*elements, VisitElement(node)], node.elements)))
-    elements = list(filter(partial(is_not, None), elements))
-    if len(elements) != 1:
-        return elements
-    return elements[0]
+def Gather(elements: List['AllNodes'], values: List[Optional[Number]]) -> Union[List[Number], Number]:
+    """ Combine the values of the elements of a ListNode into its result.
+    Haskell notation:
+        Gather :: [Node] -> [Number] -> Number | [Number]
+    When the ListNode contains ReturnNodes only their values are kept. None values are removed
+    and a single value is not put inside of a list.
+    Parameters:
+        elements (Lst): The elements of the ListNode.
+        values (Lst): The value of every element, in the same order.
+    Returns:
+        number (Number): The only value which is kept.
+        numbers (Lst): A list filled with the values which are kept.
+    """
+    returnNodes = map(lambda element: ReturnNode == type(element), elements)
+    returns = reduce(add, returnNodes, 0)
+    kept = map(lambda element, value: value if not returns or type(element) == ReturnNode else None, elements, values)
+    kept = list(filter(partial(is_not, None), kept))
+    if len(kept) != 1:
+        return kept
+    return kept[0]
 
 def VisitIfNode(node: IfNode, context: Context) -> Optional[Number]:
     """ Interpret an IfNode. 
@@ -159,19 +175,30 @@ def VisitIfNode(node: IfNode, context: Context) -> Optional[Number]:
         return VisitNode(expression, context)
     return
 
-def VisitWhileNode(node: WhileNode, context: Context, elements: List = []) -> None:
+def VisitWhileNode(node: WhileNode, context: Context) -> None:
     """ Interpret a WhileNode. 
     Haskell notation:
         VisitWhileNode :: WhileNode -> Context -> None
+    The loop is repeated with a constant stack depth and the results of the body are not kept.
     Parameters:
         node (WhileNode): The WhileNode which will be interpreted.
         context (Context): The current existing context.
     """
-    condition = VisitNode(node.condition, context)
-    if condition.IsTrue():
-        elements.append(VisitNode(node.body, context))
-        return VisitWhileNode(node, context, elements)
-    return
+    def Spin(context: Context) -> bool:
+        """ Interpret the body once when the condition is true.
+        Haskell notation:
+            Spin :: Context -> Boolean
+        Parameters:
+            context (Context): The current existing context.
+        Returns:
+            spinning (bool): Whether the body was interpreted.
+        """
+        condition = VisitNode(node.condition, context)
+        if condition.IsTrue():
+            VisitNode(node.body, context)
+            return True
+        return False
+    Repeat(Spin, context)
 
 def VisitFunctionDefenitionNode(node: FunctionDefenitionNode, context: Context) -> Function:
     """ Interpret a FunctionDefenitionNode. 
@@ -184,7 +211,7 @@ def VisitFunctionDefenitionNode(node: FunctionDefenitionNode, context: Context)
         number (Number): The result of interpreting the FunctionDefenitionNode.
         None will be returned if there is no node to return.
     """
-    function = Function(node.token.value, node.arguments, node.body, context) 
+    function = Function(node.token.value, node.arguments, node.body, context, node.cacheSize)
     if node.token:
         context.symbolDictionary.SetValue(node.token.value, function)
     return function
@@ -204,4 +231,4 @@ def VisitFunctionCallNode(node: FunctionCallNode, context: Context) -> Number:
     arguments = list(chain(*map(lambda node: [*arguments, VisitNode(node, context)], node.arguments)))
     return function.Execute(arguments)
 
-AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, VariableAccessNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
\ No newline at end of file
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAccessNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
\ No newline at end of file
@@ -1,5 +1,9 @@
 from Interpreter.tokens import *
-from typing import Callable, List, TypeVar
+from collections import deque
+from itertools import chain, count, islice
+from typing import Callable, Iterator, List, TypeVar
+import re
+import sys
 
 A = TypeVar('A')
 B = TypeVar('B')
@@ -84,7 +88,7 @@ def IsFloat(string: str) -> bool:
     except ValueError:
         return False
 
-def AssignTokens(lst: List[str], tokens: List[Token] = []) -> List[Token]:
+def AssignTokens(lst: List[str], tokens: List[Token] = None) -> List[Token]:
     """ Assign tokens from the list of strings to the tokens list.
     Haskell notation:
         
@@ -94,6 +98,8 @@ def AssignTokens(lst: List[str], tokens: List[Token] = []) -> List[Token]:
     Returns:
         tokens (Lst) : List filled with all tokens.
     """
+    if tokens == None:
+        tokens = []
     if not lst:
         return tokens + [EOF()]
     head, *tail = lst
@@ -108,4 +114,158 @@ def AssignTokens(lst: List[str], tokens: List[Token] = []) -> List[Token]:
             if head == "":
                 return AssignTokens(tail, tokens)
             tokens.append(Identifier(head))
-        return AssignTokens(tail, tokens)
\ No newline at end of file
+        return AssignTokens(tail, tokens)
+
+WordPattern = re.compile(r"[^ \n]+|\n")
+KeywordTable = dict(TokenValues)
+
+def LexLinear(text: List[str] = None, filename: str = None) -> List[Token]:
+    """ Lex the file or lines in a single pass over the text.
+    Haskell notation:
+        LexLinear :: [String] -> String -> [Token]
+    This produces the same tokens as Lex, but every word is matched once with a
+    regular expression and looked up in the KeywordTable. Every token gets the
+    line and column where it starts.
+    Parameters:
+        text (Lst): The lines of text which can be lexed into tokens.
+        filename (str): The filename which contains the text which can be lexed into tokens.
+    Returns:
+        tokens (lst): A list with all the tokens.
+    """
+    if text == None:
+        text = ReadFile(filename)
+    tokens = list(chain.from_iterable(map(LexLine, count(1), text)))
+    return tokens + [Locate(EOF(), len(text) + 1, 1)]
+
+def LexLine(line: int, text: str) -> Iterator[Token]:
+    """ Lex a single line of text.
+    Haskell notation:
+        LexLine :: Integer -> String -> [Token]
+    Parameters:
+        line (int): The line number of the text.
+        text (str): The line which will be lexed.
+    Returns:
+        tokens (Iterator): The tokens on this line.
+    """
+    return map(lambda match: Locate(CreateToken(match.group()), line, match.start() + 1), WordPattern.finditer(text))
+
+def CreateToken(word: str) -> Token:
+    """ Create the token for a single word.
+    Haskell notation:
+        CreateToken :: String -> Token
+    Keywords are looked up in the KeywordTable. Everything else is
+    an Int, Float or Identifier, in the same order as AssignTokens.
+    Parameters:
+        word (str): The word which will be converted.
+    Returns:
+        token (Token): The resulting token.
+    """
+    keyword = KeywordTable.get(word, None)
+    if keyword:
+        return keyword()
+    if word.isdigit():
+        return Int(word)
+    elif IsFloat(word):
+        return Float(word)
+    return Identifier(word)
+
+def Locate(token: Token, line: int, column: int) -> Token:
+    """ Store the position of the token inside of the source.
+    Haskell notation:
+        Locate :: Token -> Integer -> Integer -> Token
+    Parameters:
+        token (Token): The token which gets a position.
+        line (int): The line of the token, starting at 1.
+        column (int): The column of the token, starting at 1.
+    Returns:
+        token (Token): The same token with its position.
+    """
+    token.line = line
+    token.column = column
+    return token
+
+def LexStream(filename: str, size: int = 16) -> 'TokenWindow':
+    """ Lex the file lazily while the parser reads the tokens.
+    Haskell notation:
+        LexStream :: String -> Integer -> TokenWindow
+    Parameters:
+        filename (str): The filename which contains the text which can be lexed into tokens.
+        size (int): The amount of tokens which are kept in memory.
+    Returns:
+        tokens (TokenWindow): The tokens which can be passed to the parser.
+    """
+    return TokenWindow(GenerateTokens(filename), size)
+
+def GenerateTokens(filename: str) -> Iterator[Token]:
+    """ Generate the tokens of a file line by line.
+    Haskell notation:
+        GenerateTokens :: String -> [Token]
+    Only the current line of the file is read into memory.
+    Parameters:
+        filename (str): The filename which contains the text which can be lexed into tokens.
+    Returns:
+        tokens (Iterator): The tokens of the file followed by an EOF token.
+    """
+    numbers = count(1)
+    with open(filename, "r") as file:
+        yield from chain.from_iterable(map(lambda text, line: LexLine(line, text), file, numbers))
+    yield Locate(EOF(), next(numbers), 1)
+
+class TokenWindow:
+    """ This class gives indexed access to a stream of tokens. 
+    Only the last tokens are kept, the parser never looks back further than a few tokens. """
+    def __init__(self, tokens: Iterator[Token], size: int = 16) -> None:
+        """ Initialize the stream and the window.
+        Haskell notation:
+            Init :: [Token] -> Integer -> None
+        Parameters:
+            tokens (Iterator): The stream of tokens which ends with an EOF token.
+            size (int): The amount of tokens which are kept in memory.
+        """
+        self.tokens = tokens
+        self.window = deque(maxlen=size)
+        self.start = 0
+        self.end = None
+
+    def __getitem__(self, index: int) -> Token:
+        """ Get the token at the passed index.
+        Haskell notation:
+            GetItem :: Integer -> Token
+        Indexes past the end of the stream return the last token.
+        Parameters:
+            index (int): The index of the token.
+        Returns:
+            token (Token): The token at the index.
+        """
+        self.Fill(index)
+        if self.end != None:
+            index = min(index, self.end - 1)
+        if index < self.start:
+            raise Exception(f"Token {index} is no longer available, the window starts at {self.start}..")
+        return self.window[index - self.start]
+
+    def __len__(self) -> int:
+        """ The amount of tokens, this is only known once the stream has ended.
+        Haskell notation:
+            Len :: Integer
+        """
+        if self.end == None:
+            return sys.maxsize
+        return self.end
+
+    def Fill(self, index: int) -> None:
+        """ Read tokens from the stream until the passed index is inside of the window.
+        Haskell notation:
+            Fill :: Integer -> None
+        Parameters:
+            index (int): The index which needs to be available.
+        """
+        read = self.start + len(self.window)
+        if self.end != None or index < read:
+            return
+        wanted = index + 1 - read
+        tokens = list(islice(self.tokens, wanted))
+        self.window.extend(tokens)
+        self.start = read + len(tokens) - len(self.window)
+        if len(tokens) < wanted:
+            self.end = read + len(tokens)
\ No newline at end of file
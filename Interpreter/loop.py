@@ -0,0 +1,34 @@
+from collections import deque
+from itertools import accumulate, repeat, takewhile
+from typing import Callable, TypeVar
+
+A = TypeVar('A')
+
+def Iterate(f: Callable[[A], A], state: A, done: Callable[[A], bool]) -> A:
+    """ Apply f to the state until the state is done.
+    Haskell notation:
+        Iterate :: Callable -> A -> Callable -> A
+    This behaves like a tail recursive function, but uses a constant amount of stack.
+    It is used wherever the amount of steps depends on the size of the program.
+    Parameters:
+        f (Callable): The function which calculates the next state.
+        state (A): The first state.
+        done (Callable): The function which checks whether the state is final.
+    Returns:
+        state (A): The first state for which done returns True.
+    """
+    return next(filter(done, accumulate(repeat(None), lambda current, _: f(current), initial=state)))
+
+def Repeat(f: Callable[[A], bool], state: A) -> A:
+    """ Call f with the state until it returns False.
+    Haskell notation:
+        Repeat :: Callable -> A -> A
+    This is a cheaper version of Iterate for a state which is changed in place.
+    Parameters:
+        f (Callable): The function which changes the state and returns whether to continue.
+        state (A): The state which is passed to f.
+    Returns:
+        state (A): The changed state.
+    """
+    deque(takewhile(bool, map(f, repeat(state))), maxlen=0)
+    return state
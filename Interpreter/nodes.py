@@ -1,5 +1,5 @@
 from Interpreter.tokens import *
-from typing import Union, List, Tuple
+from typing import Any, Optional, Union, List, Tuple
 
 class NumberNode:
     def __init__(self, token: Union[Int, Float]) -> None:
@@ -47,6 +47,25 @@ class BinaryOperationNode:
         """ Represent BinaryOperationNode as string. """
         return f'({self.token}, {self.operator}, {self.right})'
 
+class LogicalOperationNode:
+    def __init__(self, left: 'Node', operator: Union[And, Or], right: 'Node') -> None:
+        """ Initialize the LogicalOperationNode.
+        This is an And or Or operation which only interprets the right node when the left node doesn't decide the result.
+        Haskell notation:
+            Init :: Node -> Token -> Node -> None
+        Parameters:
+            left (Node): The left node for the operation.
+            operator (And, Or): The operator token for the operation.
+            right (Node): The right node for the operation.
+        """
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def __str__(self) -> str:
+        """ Represent LogicalOperationNode as string. """
+        return f'({self.left}, {self.operator}, {self.right})'
+
 class VariableAssignNode:
     def __init__(self, token: Identifier, node: Union[VariableAccessNode, NumberNode]) -> None:
         """ Initialize the VariableAssignNode. 
@@ -110,18 +129,20 @@ class WhileNode:
         return f'({self.condition}, {self.body})'
 
 class FunctionDefenitionNode:
-    def __init__(self, token: Token, arguments: ListNode, body: ListNode) -> None:
+    def __init__(self, token: Token, arguments: ListNode, body: ListNode, cacheSize: int = 0) -> None:
         """ Initialize the FunctionDefenitionNode. 
         Haskell notation:
-            Init :: Token -> ListNode -> ListNode -> None
+            Init :: Token -> ListNode -> ListNode -> Integer -> None
         Parameters:
             token (Token): The token and thus the name of the function.
             arguments (ListNode): The ListNode with all the 'abstract' arguments for the function.
             body (ListNode): The ListNode with all the code for the body.
+            cacheSize (int): The amount of results which are stored for a pure function, 0 when the results aren't stored.
         """
         self.token = token
         self.arguments = arguments
         self.body = body
+        self.cacheSize = cacheSize
 
     def __str__(self) -> str:
         """ Represent FunctionDefenitionNode as string. """
@@ -157,5 +178,24 @@ class ReturnNode:
         """ Represent ReturnNode as string. """
         return f'{self.node}'
 
+def Position(node: Any) -> Optional[Tuple[int, int]]:
+    """ Get the position in the source where a node starts.
+    Haskell notation:
+        Position :: Node -> (Integer, Integer) | None
+    The position is the one of the first token inside of the node which knows its position.
+    Only the lexers which locate their tokens give positions, see Locate.
+    Parameters:
+        node (Node): The node, or a token or a list of them.
+    Returns:
+        position (Tuple): The line and column, starting at 1. None when no token knows its position.
+    """
+    if isinstance(node, Token):
+        return (node.line, node.column) if node.line else None
+    elif type(node) in (list, tuple):
+        return next(filter(None, map(Position, node)), None)
+    elif node == None or type(node) == int:
+        return None
+    return Position(list(vars(node).values()))
+
 OperatorTokens = Union[Plus, Minus, Divide, Multiply, Equals, NotEquals, GreaterThan, GreaterThanEquals, LessThan, LessThanEquals, And, Or]
-Node = Union[NumberNode, VariableAccessNode, BinaryOperationNode, VariableAssignNode, ListNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ReturnNode]
\ No newline at end of file
+Node = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, ListNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ReturnNode]
\ No newline at end of file
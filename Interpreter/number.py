@@ -1,17 +1,28 @@
 from typing import Union
-from Interpreter.context import Context
 
 class Number:
-    def __init__(self, value: Union[int, float], context: Context = None) -> None:
-        """ Initialize the passed value and context.
+    """ An immutable number, the result of every calculation in the interpreter.
+    Small integers are created once and shared, so comparisons and counters don't allocate new objects. """
+    __slots__ = ("value",)
+
+    def __new__(cls, value: Union[int, float]) -> 'Number':
+        """ Create the number or get the shared number with the passed value.
         Haskell notation:
-            Init :: Integer | Float -> Context -> None
+            New :: Integer | Float -> Number
         Parameters:
             value (int, float): The value for the number.
-            context (Context): The existing context.
+        Returns:
+            number (Number): The number with the value.
         """
-        self.value = value
-        self.context = context
+        number = SmallNumbers.get(value, None) if type(value) == int else None
+        if number == None:
+            number = object.__new__(cls)
+            number.value = value
+        return number
+
+    def __getnewargs__(self) -> tuple:
+        """ The arguments for __new__ when a number is unpickled. """
+        return (self.value,)
 
     def __str__(self) -> str:
         """ Represents self.value as a string. """
@@ -30,7 +41,7 @@ class Number:
         Returns:
             number (Number): The result of the operation.
         """
-        return Number(self.value + other.value, self.context)
+        return Number(self.value + other.value)
 
     def Minus(self, other: 'Number') -> 'Number':
         """ This function subtracts other.value with self.value. 
@@ -41,7 +52,7 @@ class Number:
         Returns:
             number (Number): The result of the operation.
         """
-        return Number(self.value - other.value, self.context)
+        return Number(self.value - other.value)
 
     def Multiply(self, other: 'Number') -> 'Number':
         """ This function multiplies self.value with other.value.
@@ -52,7 +63,7 @@ class Number:
         Returns:
             number (Number): The result of the operation.
         """
-        return Number(self.value * other.value, self.context)
+        return Number(self.value * other.value)
 
     def Divide(self, other: 'Number') -> 'Number':
         """ This function divides self.value with other.value. 
@@ -63,7 +74,7 @@ class Number:
         Returns:
             number (Number): The result of the operation.
         """
-        return Number(self.value / other.value, self.context)
+        return Number(self.value / other.value)
 
     def Equals(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is equal compared with other.value. 
@@ -74,7 +85,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value == other.value), self.context)
+        return Booleans[self.value == other.value]
     
     def NotEquals(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is not equal compared to other.value. 
@@ -85,7 +96,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value != other.value), self.context)
+        return Booleans[self.value != other.value]
 
     def GreaterThan(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is greater than other.value. 
@@ -96,7 +107,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value > other.value), self.context)
+        return Booleans[self.value > other.value]
 
     def GreaterThanEquals(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is greater than or equal to other.value. 
@@ -107,7 +118,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value >= other.value), self.context)
+        return Booleans[self.value >= other.value]
 
     def LessThan(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is less than other.value.
@@ -118,7 +129,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value < other.value), self.context)
+        return Booleans[self.value < other.value]
 
     def LessThanEquals(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value is less than or equal to other.value. 
@@ -129,7 +140,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value <= other.value), self.context)
+        return Booleans[self.value <= other.value]
 
     def And(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value and other.value are true. 
@@ -140,7 +151,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value and other.value), self.context)
+        return Number(int(self.value and other.value))
 
     def Or(self, other: 'Number') -> 'Number':
         """ This function checks whether self.value or other.value are true. 
@@ -151,7 +162,7 @@ class Number:
         Returns:
             number (Number): The result of the operation. This can be either 1 (true) or 0 (false)
         """
-        return Number(int(self.value or other.value), self.context)
+        return Number(int(self.value or other.value))
 
     def IsTrue(self) -> bool:
         """ This function checks whether self.value is true. 
@@ -160,4 +171,8 @@ class Number:
         Returns:
             number (Number): The result of the check. This can be either 1 (true) or 0 (false)
         """
-        return self.value != 0
\ No newline at end of file
+        return self.value != 0
+
+SmallNumbers = {}
+SmallNumbers.update(map(lambda value: (value, Number(value)), range(-128, 1024)))
+Booleans = (SmallNumbers[0], SmallNumbers[1])
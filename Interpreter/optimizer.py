@@ -0,0 +1,163 @@
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.tokens import *
+from functools import partial
+from typing import Callable, Optional, Union
+
+Foldable = Callable[[Union[int, float]], bool]
+
+def AnyNumber(value: Union[int, float]) -> bool:
+    """ Every result of a calculation can be folded for the interpreter. """
+    return True
+
+def IsImmediate(value: Union[int, float]) -> bool:
+    """ Only results which fit in the immediate of a MOVS instruction can be folded for the compiler. """
+    return type(value) == int and 0 <= value <= 255
+
+def Optimize(node: 'AllNodes', foldable: Foldable = AnyNumber) -> 'AllNodes':
+    """ Optimize the passed Node.
+    Every node has an Optimize{node} function which is responsible for optimizing that node.
+    The AST isn't changed, the optimized parts are new nodes.
+    Haskell notation:
+        Optimize :: Node -> Callable -> Node
+    These optimizations are done:
+        - Operations on two numbers are calculated, when the result is foldable.
+        - x + 0, 0 + x, x - 0, x * 1 and 1 * x are replaced by x.
+        - An IfNode with a number as condition is replaced by the case which is chosen.
+        - A WhileNode with a false number as condition is removed from its ListNode.
+    Parameters:
+        node (Node): The node which will be optimized.
+        foldable (Callable): Checks whether the result of a calculation can be placed in a NumberNode.
+    Returns:
+        node (Node): The optimized node.
+    """
+    return globals()[f'Optimize{type(node).__name__}'](node, foldable)
+
+def OptimizeProgram(ast: ListNode, foldable: Foldable = AnyNumber) -> ListNode:
+    """ Optimize the AST of a program, see Optimize.
+    Haskell notation:
+        OptimizeProgram :: ListNode -> Callable -> ListNode
+    Optimize visits the nodes recursively, an AST which is too deep for that, like a long chain of
+    operations, isn't optimized.
+    Parameters:
+        ast (ListNode): The AST of the program.
+        foldable (Callable): Checks whether the result of a calculation can be placed in a NumberNode.
+    Returns:
+        ast (ListNode): The optimized AST, or the passed AST when it is too deep.
+    """
+    try:
+        return Optimize(ast, foldable)
+    except RecursionError:
+        return ast
+
+def OptimizeNumberNode(node: NumberNode, foldable: Foldable) -> NumberNode:
+    """ A NumberNode can't be optimized. """
+    return node
+
+def OptimizeVariableAccessNode(node: VariableAccessNode, foldable: Foldable) -> VariableAccessNode:
+    """ A VariableAccessNode can't be optimized. """
+    return node
+
+def OptimizeReturnNode(node: ReturnNode, foldable: Foldable) -> ReturnNode:
+    """ Optimize the value of a ReturnNode. """
+    if node.node:
+        return ReturnNode(Optimize(node.node, foldable))
+    return node
+
+def OptimizeVariableAssignNode(node: VariableAssignNode, foldable: Foldable) -> VariableAssignNode:
+    """ Optimize the value of a VariableAssignNode. """
+    return VariableAssignNode(node.token, Optimize(node.node, foldable))
+
+def OptimizeBinaryOperationNode(node: BinaryOperationNode, foldable: Foldable) -> 'AllNodes':
+    """ Calculate an operation on two numbers, or remove an operation which doesn't change the other side. """
+    left = Optimize(node.left, foldable)
+    right = Optimize(node.right, foldable)
+    operator = type(node.operator).__name__
+    if type(left) == NumberNode and type(right) == NumberNode:
+        folded = Fold(left, node.operator, right, foldable)
+        if folded != None:
+            return folded
+    if type(right) == NumberNode and IsValue(right, 0) and operator in ("Plus", "Minus"):
+        return left
+    if type(left) == NumberNode and IsValue(left, 0) and operator == "Plus":
+        return right
+    if type(right) == NumberNode and IsValue(right, 1) and operator == "Multiply":
+        return left
+    if type(left) == NumberNode and IsValue(left, 1) and operator == "Multiply":
+        return right
+    return BinaryOperationNode(left, node.operator, right)
+
+def OptimizeLogicalOperationNode(node: LogicalOperationNode, foldable: Foldable) -> 'AllNodes':
+    """ Calculate an operation on two numbers, the left side can't be skipped without the right side being a number. """
+    left = Optimize(node.left, foldable)
+    right = Optimize(node.right, foldable)
+    if type(left) == NumberNode and type(right) == NumberNode:
+        folded = Fold(left, node.operator, right, foldable)
+        if folded != None:
+            return folded
+    return LogicalOperationNode(left, node.operator, right)
+
+def OptimizeListNode(node: ListNode, foldable: Foldable) -> ListNode:
+    """ Optimize all elements and remove WhileNodes which never run.
+    Their value is None, so it isn't part of the result of the ListNode anyway. """
+    elements = map(partial(Optimize, foldable=foldable), node.elements)
+    return ListNode(list(filter(lambda element: not IsDeadLoop(element), elements)))
+
+def OptimizeIfNode(node: IfNode, foldable: Foldable) -> 'AllNodes':
+    """ Replace an IfNode with a number as condition by the case which is chosen.
+    Without an else case a false IfNode results in None, which can't be written as a node, so it stays. """
+    condition, expression = node.case
+    condition = Optimize(condition, foldable)
+    expression = Optimize(expression, foldable)
+    elseCase = Optimize(node.elseCase, foldable) if node.elseCase else None
+    if type(condition) == NumberNode and Number(condition.token.value).IsTrue():
+        return expression
+    if type(condition) == NumberNode and elseCase:
+        return elseCase
+    return IfNode((condition, expression), elseCase)
+
+def OptimizeWhileNode(node: WhileNode, foldable: Foldable) -> WhileNode:
+    """ Optimize the condition and body of a WhileNode. """
+    return WhileNode(Optimize(node.condition, foldable), Optimize(node.body, foldable))
+
+def OptimizeFunctionDefenitionNode(node: FunctionDefenitionNode, foldable: Foldable) -> FunctionDefenitionNode:
+    """ Optimize the body of a function. """
+    return FunctionDefenitionNode(node.token, node.arguments, Optimize(node.body, foldable), node.cacheSize)
+
+def OptimizeFunctionCallNode(node: FunctionCallNode, foldable: Foldable) -> FunctionCallNode:
+    """ Optimize the arguments of a function call. """
+    return FunctionCallNode(node.node, list(map(partial(Optimize, foldable=foldable), node.arguments)))
+
+def Fold(left: NumberNode, operator: Token, right: NumberNode, foldable: Foldable) -> Optional[NumberNode]:
+    """ Calculate an operation on two numbers.
+    Haskell notation:
+        Fold :: NumberNode -> Token -> NumberNode -> Callable -> NumberNode | None
+    Parameters:
+        left (NumberNode): The left side of the operation.
+        operator (Token): The operator.
+        right (NumberNode): The right side of the operation.
+        foldable (Callable): Checks whether the result can be placed in a NumberNode.
+    Returns:
+        node (NumberNode): The result of the operation, positioned at the left side.
+        Returns None when the operation fails, like a division by zero, or when the result isn't foldable.
+    """
+    try:
+        value = getattr(Number(left.token.value), type(operator).__name__)(Number(right.token.value)).value
+    except Exception:
+        return None
+    if not foldable(value):
+        return None
+    token = Int(value) if type(value) == int else Float(value)
+    token.line = left.token.line
+    token.column = left.token.column
+    return NumberNode(token)
+
+def IsValue(node: NumberNode, value: int) -> bool:
+    """ Check whether a NumberNode contains exactly the integer value, 0.0 and 1.0 would change the type of the result. """
+    return type(node.token.value) == int and node.token.value == value
+
+def IsDeadLoop(node: 'AllNodes') -> bool:
+    """ Check whether the node is a WhileNode whose condition is a false number. """
+    return type(node) == WhileNode and type(node.condition) == NumberNode and not Number(node.condition.token.value).IsTrue()
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
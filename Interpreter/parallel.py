@@ -0,0 +1,199 @@
+from Interpreter.context import Context
+from Interpreter.interpreter import Gather, VisitNode
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.purity import Nodes
+from Interpreter.resolver import AssignedNames
+from Interpreter.tokens import Token
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial, reduce
+from io import StringIO
+from itertools import chain
+from typing import Any, Dict, List, Optional, Set, Tuple
+import pickle
+import sys
+
+Access = Tuple[Optional[Set[str]], Set[str]]
+
+def VisitParallel(ast: ListNode, context: Context, workers: Optional[int] = None) -> Union[List[Number], Number]:
+    """ Interpret the top level statements of a program, independent statements at the same time.
+    Haskell notation:
+        VisitParallel :: ListNode -> Context -> Integer -> Number | [Number]
+    The statements are divided into waves, see Waves. Inside of a wave the statements which don't
+    assign global variables are interpreted by worker processes, with a copy of the global context.
+    The other statements are interpreted in this process, so the global variables and functions stay
+    the ones of this context. A statement which is too deep to be pickled is interpreted in this process
+    as well. The printed output of every statement is written in the order of the
+    program, so the output and the result are the same as VisitNode.
+    Parameters:
+        ast (ListNode): The AST of the program.
+        context (Context): The global context.
+        workers (int): The amount of worker processes, the amount of cores by default.
+    Returns:
+        number (Number): The result of the program.
+    """
+    elements = ast.elements
+    accesses = list(map(partial(StatementAccess, functions=Definitions(elements), globalNames=set(AssignedNames(ast))), elements))
+    waves = Waves(accesses)
+    remote = list(map(lambda wave: list(filter(lambda index: len(wave) > 1 and accesses[index][0] != None and not accesses[index][1], wave)), waves))
+    results = [(None, "")] * len(elements)
+    if not any(map(lambda indices: len(indices) > 1, remote)):
+        list(map(lambda index: results.__setitem__(index, VisitCaptured(elements[index], context)), range(len(elements))))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            def RunWave(wave: List[int], indices: List[int]) -> None:
+                """ Send the statements to the workers, interpret the others and wait for all of them. """
+                payloads = dict(filter(lambda payload: payload[1] != None, map(lambda index: (index, Pickle((elements[index], context))), indices)))
+                futures = list(map(lambda index: (index, executor.submit(VisitRemote, payloads[index])), payloads))
+                local = filter(lambda index: index not in payloads, wave)
+                list(map(lambda index: results.__setitem__(index, VisitCaptured(elements[index], context)), local))
+                list(map(lambda future: results.__setitem__(future[0], Receive(future[1], elements[future[0]], context)), futures))
+            list(map(RunWave, waves, remote))
+    sys.stdout.write("".join(map(lambda result: result[1], results)))
+    return Gather(elements, list(map(lambda result: result[0], results)))
+
+def VisitCaptured(node: 'AllNodes', context: Context) -> Tuple[Any, str]:
+    """ Interpret a statement and keep everything which it prints.
+    Haskell notation:
+        VisitCaptured :: Node -> Context -> Tuple
+    Parameters:
+        node (Node): The statement.
+        context (Context): The global context.
+    Returns:
+        value (Number): The result of the statement.
+        output (str): Everything which was printed, like exceptions.
+    """
+    output = StringIO()
+    with redirect_stdout(output):
+        value = VisitNode(node, context)
+    return value, output.getvalue()
+
+def Pickle(value: Any) -> Optional[bytes]:
+    """ Pickle a statement and its context for a worker, None when it is too deep to be pickled. """
+    try:
+        return pickle.dumps(value)
+    except (RecursionError, pickle.PicklingError):
+        return None
+
+def Receive(future: Future, node: 'AllNodes', context: Context) -> Tuple[Any, str]:
+    """ Wait for the result of a worker.
+    Haskell notation:
+        Receive :: Future -> Node -> Context -> Tuple
+    A statement which is sent to a worker doesn't assign global variables, so when the worker can't
+    unpickle the statement or pickle its result, it is interpreted again in this process.
+    Parameters:
+        future (Future): The result of the worker, see VisitRemote.
+        node (Node): The statement.
+        context (Context): The global context.
+    Returns:
+        value (Number): The result of the statement.
+        output (str): Everything which was printed, like exceptions.
+    """
+    try:
+        return future.result()
+    except (RecursionError, pickle.PicklingError):
+        return VisitCaptured(node, context)
+
+def VisitRemote(payload: bytes) -> Tuple[Any, str]:
+    """ Interpret a statement inside of a worker process.
+    The statement and the global context are pickled together, so the functions inside of
+    the context keep pointing to the same copy of the context. """
+    node, context = pickle.loads(payload)
+    return VisitCaptured(node, context)
+
+def Waves(accesses: List[Access]) -> List[List[int]]:
+    """ Divide the statements into waves of statements which don't depend on each other.
+    Haskell notation:
+        Waves :: [Access] -> [[Integer]]
+    A statement is placed in the wave after the last earlier statement it conflicts with, see Conflicts.
+    Every wave only depends on the waves before it, so running the waves in order gives the same
+    result as running the statements in order.
+    Parameters:
+        accesses (Lst): The global names which every statement reads and assigns, see StatementAccess.
+    Returns:
+        waves (Lst): The indices of the statements of every wave, in the order of the program.
+    """
+    def Place(levels: List[int], index: int) -> List[int]:
+        """ Calculate the wave of the statement at the index. """
+        earlier = filter(lambda other: Conflicts(accesses[other], accesses[index]), range(index))
+        return levels + [max(map(lambda other: levels[other] + 1, earlier), default=0)]
+    levels = reduce(Place, range(len(accesses)), [])
+    return list(map(lambda level: list(filter(lambda index: levels[index] == level, range(len(levels)))), range(max(levels, default=-1) + 1)))
+
+def Conflicts(first: Access, second: Access) -> bool:
+    """ Check whether two statements have to keep their order.
+    That is the case when one of them assigns a name which the other one reads or assigns,
+    or when the names which one of them reads are unknown. """
+    firstReads, firstWrites = first
+    secondReads, secondWrites = second
+    if firstReads == None or secondReads == None:
+        return True
+    return bool(firstWrites & (secondReads | secondWrites) or secondWrites & firstReads)
+
+def Definitions(elements: List['AllNodes']) -> Dict[str, List[FunctionDefenitionNode]]:
+    """ Get the definitions of the top level functions by their name, a name can be defined more than once. """
+    definitions = filter(lambda element: type(element) == FunctionDefenitionNode and element.token, elements)
+    return reduce(lambda names, node: {**names, node.token.value: names.get(node.token.value, []) + [node]}, definitions, {})
+
+def StatementAccess(node: 'AllNodes', functions: Dict[str, List[FunctionDefenitionNode]], globalNames: Set[str]) -> Access:
+    """ Find the global names which a top level statement reads and assigns.
+    Haskell notation:
+        StatementAccess :: Node -> Dict -> {String} -> Access
+    A definition only assigns its name, its body is read when the function is called. A call reads the
+    name of the function and all global names which the function reads, including the functions it calls.
+    Parameters:
+        node (Node): The statement.
+        functions (Dict): The definitions of the top level functions.
+        globalNames (Set): The names of all global variables and functions.
+    Returns:
+        reads (Set): The names which are read, None when they are unknown, like a call to a function inside of a variable.
+        writes (Set): The names which are assigned.
+    """
+    nodes = StatementNodes(node)
+    reads = set(map(lambda element: element.token.value, filter(lambda element: type(element) == VariableAccessNode, nodes)))
+    calls = list(filter(lambda element: type(element) == FunctionCallNode, nodes))
+    called = list(map(lambda call: FunctionAccess(call.node, set(), functions, globalNames, set()), calls))
+    if any(map(lambda names: names == None, called)):
+        return None, set(AssignedNames(node))
+    return reads.union(*called), set(AssignedNames(node))
+
+def FunctionAccess(callee: Any, local: Set[str], functions: Dict[str, List[FunctionDefenitionNode]], globalNames: Set[str], visited: Set[str]) -> Optional[Set[str]]:
+    """ Find the global names which a call to a top level function reads.
+    Haskell notation:
+        FunctionAccess :: Node -> {String} -> Dict -> {String} -> {String} -> {String} | None
+    Parameters:
+        callee (Node): The node which results in the function.
+        local (Set): The names of the variables of the function which contains the call.
+        functions (Dict): The definitions of the top level functions.
+        globalNames (Set): The names of all global variables and functions.
+        visited (Set): The functions which are already being searched.
+    Returns:
+        reads (Set): The global names which are read, None when the function isn't a top level function.
+    """
+    if type(callee) != VariableAccessNode or callee.token.value not in functions or callee.token.value in local:
+        return None
+    name = callee.token.value
+    if name in visited:
+        return {name}
+    definitions = functions[name]
+    nodes = list(chain.from_iterable(map(lambda definition: Nodes(definition.body), definitions)))
+    variables = set(chain.from_iterable(map(lambda definition: list(map(lambda argument: getattr(argument, "value", None), definition.arguments)) + AssignedNames(definition.body), definitions)))
+    reads = set(map(lambda element: element.token.value, filter(lambda element: type(element) == VariableAccessNode, nodes))) & globalNames
+    calls = map(lambda element: element.node, filter(lambda element: type(element) == FunctionCallNode, nodes))
+    called = list(map(lambda call: FunctionAccess(call, variables, functions, globalNames, visited | {name}), calls))
+    if any(map(lambda names: names == None, called)):
+        return None
+    return reads.union({name}, *called)
+
+def StatementNodes(node: Any) -> List['AllNodes']:
+    """ Get a statement and all nodes inside of it, without the bodies of the functions it defines. """
+    if type(node) == FunctionDefenitionNode:
+        return [node]
+    elif type(node) in (list, tuple):
+        return list(chain.from_iterable(map(StatementNodes, node)))
+    elif node == None or isinstance(node, (Token, int)):
+        return []
+    return [node] + StatementNodes(list(vars(node).values()))
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
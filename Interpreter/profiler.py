@@ -0,0 +1,169 @@
+from Interpreter.context import Context
+from Interpreter.function import Function
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.tokens import FunctionDef, Token, While
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Tuple
+import Interpreter.interpreter as interpreter
+
+Program = "main"
+
+class Profile:
+    def __init__(self) -> None:
+        """ Initialize the counters of a profile.
+        Haskell notation:
+            Init :: None
+        """
+        self.calls = Counter()
+        self.inclusive = Counter()
+        self.exclusive = Counter()
+        self.nodes = Counter()
+        self.iterations = Counter()
+        self.loops = {}
+        self.stacks = Counter()
+        self.frames = []
+
+    def Enter(self, name: str) -> None:
+        """ Start measuring a call of a function.
+        Haskell notation:
+            Enter :: String -> None
+        Parameters:
+            name (str): The name of the function.
+        """
+        self.calls[name] += 1
+        self.frames.append([name, perf_counter(), 0.0])
+
+    def Leave(self) -> None:
+        """ Stop measuring the last call which was entered.
+        The time of the callees is subtracted from the exclusive time. The inclusive time of a
+        recursive function is only counted for its outermost call, so it is never counted twice.
+        """
+        stack = ";".join(map(lambda frame: frame[0], self.frames))
+        name, start, callees = self.frames.pop()
+        elapsed = perf_counter() - start
+        self.exclusive[name] += elapsed - callees
+        self.stacks[stack] += elapsed - callees
+        if not any(map(lambda frame: frame[0] == name, self.frames)):
+            self.inclusive[name] += elapsed
+        if self.frames:
+            self.frames[-1][2] += elapsed
+
+    def Visit(self, node: 'AllNodes') -> None:
+        """ Count a visited node, and an iteration when the node is the body of a SpinWhile. """
+        self.nodes[type(node).__name__] += 1
+        if id(node) in self.loops:
+            self.iterations[self.loops[id(node)]] += 1
+
+    def Collapsed(self) -> List[str]:
+        """ Create the collapsed stacks of the profile, which flamegraph tools can read.
+        Haskell notation:
+            Collapsed :: [String]
+        Returns:
+            lines (Lst): A line for every stack of calls, with the exclusive time of the last call in microseconds.
+        """
+        weights = map(lambda stack: (stack, round(self.stacks[stack] * 1000000)), sorted(self.stacks))
+        return list(map(lambda weight: f"{weight[0]} {weight[1]}", filter(lambda weight: weight[1] > 0, weights)))
+
+    def __str__(self) -> str:
+        """ Represent the profile as tables of the functions, nodes and loops.
+        Returns:
+            profile (str): The tables, the most expensive rows first.
+        """
+        functions = sorted(self.calls, key=lambda name: -self.inclusive[name])
+        functions = map(lambda name: f"{name:<24} {self.calls[name]:>10} {self.inclusive[name] * 1000:>14.3f} {self.exclusive[name] * 1000:>14.3f}", functions)
+        nodes = map(lambda item: f"{item[0]:<24} {item[1]:>10}", self.nodes.most_common())
+        loops = map(lambda item: f"{item[0]:<24} {item[1]:>10}", self.iterations.most_common())
+        return "\n".join(chain(
+            [f"{FunctionDef.value:<24} {'calls':>10} {'inclusive ms':>14} {'exclusive ms':>14}"], functions,
+            ["", f"{'node':<24} {'visits':>10}"], nodes,
+            ["", f"{While.value:<24} {'iterations':>10}"], loops))
+
+@contextmanager
+def Profiling(profile: Profile, ast: ListNode) -> Iterator[Profile]:
+    """ Let the tree engine record everything it does in the profile.
+    Haskell notation:
+        Profiling :: Profile -> ListNode -> Profile
+    VisitNode and Function.Execute are replaced until the block ends. The interpreter looks up VisitNode
+    every time it visits a node, so no other code has to know about the profile and a program which isn't
+    profiled runs exactly the same code as before.
+    Parameters:
+        profile (Profile): The profile which is filled.
+        ast (ListNode): The AST of the program, its SpinWhile loops are named before it is interpreted.
+    Returns:
+        profile (Profile): The same profile.
+    """
+    visit = interpreter.VisitNode
+    execute = Function.Execute
+
+    def VisitCounted(node: 'AllNodes', context: Context) -> Number:
+        """ Count the node and visit it. """
+        profile.Visit(node)
+        return visit(node, context)
+
+    def ExecuteMeasured(self: Function, arguments: List[Number]) -> Number:
+        """ Measure the call of the function. """
+        profile.Enter(self.name)
+        try:
+            return execute(self, arguments)
+        finally:
+            profile.Leave()
+
+    profile.loops.update(Loops(ast, Program))
+    interpreter.VisitNode = VisitCounted
+    Function.Execute = ExecuteMeasured
+    profile.Enter(Program)
+    try:
+        yield profile
+    finally:
+        profile.Leave()
+        interpreter.VisitNode = visit
+        Function.Execute = execute
+
+def VisitProfiled(ast: ListNode, context: Context, profile: Profile) -> Union[List[Number], Number]:
+    """ Interpret a program with the tree engine and record it in the profile.
+    Haskell notation:
+        VisitProfiled :: ListNode -> Context -> Profile -> Number | [Number]
+    Parameters:
+        ast (ListNode): The AST of the program.
+        context (Context): The global context.
+        profile (Profile): The profile which is filled, see Profiling.
+    Returns:
+        number (Number): The result of the program.
+    """
+    with Profiling(profile, ast):
+        return interpreter.VisitNode(ast, context)
+
+def Loops(node: Any, function: str) -> Dict[int, str]:
+    """ Name the SpinWhile loops inside of a node by the id of their body.
+    Haskell notation:
+        Loops :: Node -> String -> Dict
+    A loop is named by the function which contains it, the program for top level loops, and the
+    line of its condition. Without a line the loops are numbered in the order of the program.
+    Parameters:
+        node (Node): The node which is searched.
+        function (str): The name of the function which contains the node.
+    Returns:
+        loops (Dict): The name of every loop by the id of its body.
+    """
+    loops = LoopNodes(node, function)
+    positions = list(map(lambda loop: Position(loop[0].condition), loops))
+    names = map(lambda index, loop, position: f"{loop[1]} line {position[0]}" if position else f"{loop[1]} #{index + 1}", range(len(loops)), loops, positions)
+    return dict(map(lambda loop, name: (id(loop[0].body), name), loops, names))
+
+def LoopNodes(node: Any, function: str) -> List[Tuple[WhileNode, str]]:
+    """ Get the SpinWhile loops inside of a node with the name of the function which contains them. """
+    if type(node) in (list, tuple):
+        return list(chain.from_iterable(map(lambda element: LoopNodes(element, function), node)))
+    elif node == None or isinstance(node, (Token, int)):
+        return []
+    elif type(node) == FunctionDefenitionNode:
+        return LoopNodes(node.body, node.token.value if node.token else function)
+    elif type(node) == WhileNode:
+        return [(node, function)] + LoopNodes([node.condition, node.body], function)
+    return LoopNodes(list(vars(node).values()), function)
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
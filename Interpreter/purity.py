@@ -0,0 +1,108 @@
+from Interpreter.function import CacheSize
+from Interpreter.nodes import *
+from Interpreter.resolver import AssignedNames
+from Interpreter.tokens import Token
+from itertools import chain
+from typing import Any, Dict, List, Set
+
+def Memoize(ast: ListNode, size: int = CacheSize) -> ListNode:
+    """ Let the pure functions of a program store their results.
+    Haskell notation:
+        Memoize :: ListNode -> Integer -> ListNode
+    The AST isn't changed, the definitions of pure functions are new nodes.
+    Parameters:
+        ast (ListNode): The AST of the program.
+        size (int): The amount of results which every pure function stores.
+    Returns:
+        ast (ListNode): The AST in which the pure functions have a cache size.
+    """
+    pure = PureFunctions(ast)
+
+    def Mark(element: 'AllNodes') -> 'AllNodes':
+        """ Give the definition of a pure function a cache size. """
+        if type(element) == FunctionDefenitionNode and element.token and element.token.value in pure:
+            return FunctionDefenitionNode(element.token, element.arguments, element.body, size)
+        return element
+    return ListNode(list(map(Mark, ast.elements)))
+
+def PureFunctions(ast: ListNode) -> Set[str]:
+    """ Find the functions of a program whose result only depends on their arguments.
+    Haskell notation:
+        PureFunctions :: ListNode -> {String}
+    Only functions which are defined once, outside of other functions, and never assigned
+    again are checked. Such a function is pure when its body:
+        - Only reads its arguments and its own variables, which don't exist outside of the function.
+          Otherwise an unassigned variable would be found outside of the function.
+        - Only calls pure functions by their name.
+        - Doesn't define other functions.
+    A function whose arguments aren't names can't be called, so it isn't pure either.
+    Functions which call each other are assumed to be pure, until one of them turns out to be impure.
+    Parameters:
+        ast (ListNode): The AST of the program.
+    Returns:
+        names (Set): The names of the pure functions.
+    """
+    globalNames = AssignedNames(ast)
+    definitions = filter(lambda element: type(element) == FunctionDefenitionNode and element.token, ast.elements)
+    definitions = dict(map(lambda node: (node.token.value, node), definitions))
+    candidates = set(filter(lambda name: globalNames.count(name) == 1, definitions))
+    return Settle(candidates, definitions, set(globalNames))
+
+def Settle(pure: Set[str], definitions: Dict[str, FunctionDefenitionNode], globalNames: Set[str]) -> Set[str]:
+    """ Remove impure functions until all remaining functions only call each other.
+    Haskell notation:
+        Settle :: {String} -> Dict -> {String} -> {String}
+    Parameters:
+        pure (Set): The names of the functions which are assumed to be pure.
+        definitions (Dict): The definitions of the functions.
+        globalNames (Set): The names of all global variables and functions.
+    Returns:
+        names (Set): The names of the pure functions.
+    """
+    remaining = set(filter(lambda name: IsPure(definitions[name], pure, globalNames), pure))
+    if remaining == pure:
+        return pure
+    return Settle(remaining, definitions, globalNames)
+
+def IsPure(node: FunctionDefenitionNode, pure: Set[str], globalNames: Set[str]) -> bool:
+    """ Check whether the body of a function only depends on its arguments.
+    Haskell notation:
+        IsPure :: FunctionDefenitionNode -> {String} -> {String} -> Boolean
+    Parameters:
+        node (FunctionDefenitionNode): The definition of the function.
+        pure (Set): The names of the functions which are assumed to be pure.
+        globalNames (Set): The names of all global variables and functions.
+    Returns:
+        pure (bool): Whether the function is pure.
+    """
+    if not all(map(lambda argument: isinstance(argument, Token), node.arguments)):
+        return False
+    nodes = Nodes(node.body)
+    if any(map(lambda element: type(element) == FunctionDefenitionNode, nodes)):
+        return False
+    calls = list(map(lambda element: element.node, filter(lambda element: type(element) == FunctionCallNode, nodes)))
+    if not all(map(lambda call: type(call) == VariableAccessNode, calls)):
+        return False
+    arguments = set(map(lambda argument: argument.value, node.arguments))
+    variables = set(AssignedNames(node.body)) | arguments
+    readable = arguments | (variables - globalNames) | (pure - variables)
+    reads = map(lambda element: element.token.value, filter(lambda element: type(element) == VariableAccessNode, nodes))
+    called = map(lambda call: call.token.value, calls)
+    return all(map(lambda name: name in readable, reads)) and all(map(lambda name: name in pure - variables, called))
+
+def Nodes(node: Any) -> List['AllNodes']:
+    """ Get a node and all nodes inside of it.
+    Haskell notation:
+        Nodes :: Node -> [Node]
+    Parameters:
+        node (Node): The node which will be searched.
+    Returns:
+        nodes (Lst): The node followed by all nodes inside of it.
+    """
+    if type(node) in (list, tuple):
+        return list(chain.from_iterable(map(Nodes, node)))
+    elif node == None or isinstance(node, (Token, int)):
+        return []
+    return [node] + Nodes(list(vars(node).values()))
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
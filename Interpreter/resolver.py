@@ -0,0 +1,74 @@
+from Interpreter.nodes import *
+from Interpreter.tokens import Token
+from itertools import chain, count
+from typing import Any, Dict, List, Optional, Tuple
+
+Location = Tuple[int, int]
+
+class Scope:
+    """ The variables of a function, every variable has its own slot in the frame of a call. """
+    def __init__(self, names: List[str], parent: Optional['Scope'] = None) -> None:
+        """ Initialize the slots of the names.
+        Haskell notation:
+            Init :: [String] -> Scope -> None
+        Parameters:
+            names (Lst): The names of the arguments followed by all other variables of the function.
+            parent (Scope): The scope of the function in which this function is defined, None for the global scope.
+        """
+        self.slots = dict(zip(names, count()))
+        self.size = len(names)
+        self.parent = parent
+
+def FunctionScope(node: FunctionDefenitionNode, parent: Optional[Scope]) -> Scope:
+    """ Create the scope of a function.
+    Haskell notation:
+        FunctionScope :: FunctionDefenitionNode -> Scope -> Scope
+    The arguments get the first slots, so the values of a call can be placed in the frame directly.
+    Parameters:
+        node (FunctionDefenitionNode): The definition of the function.
+        parent (Scope): The scope in which the function is defined.
+    Returns:
+        scope (Scope): The scope of the function's body.
+    """
+    arguments = list(map(lambda argument: argument.value, node.arguments))
+    variables = filter(lambda name: name not in arguments, AssignedNames(node.body))
+    return Scope(arguments + list(dict.fromkeys(variables)), parent)
+
+def AssignedNames(node: Any) -> List[str]:
+    """ Get the names of all variables and functions which are assigned inside of a node.
+    Haskell notation:
+        AssignedNames :: Node -> [String]
+    The bodies of other functions are skipped, those have their own scope.
+    Parameters:
+        node (Node): The node which will be searched.
+    Returns:
+        names (Lst): The names in order of appearance.
+    """
+    if type(node) == FunctionDefenitionNode:
+        return [node.token.value] if node.token else []
+    elif type(node) == VariableAssignNode:
+        return [node.token.value] + AssignedNames(node.node)
+    elif type(node) in (list, tuple):
+        return list(chain.from_iterable(map(AssignedNames, node)))
+    elif node == None or isinstance(node, Token):
+        return []
+    return AssignedNames(list(vars(node).values()))
+
+def Locate(scope: Optional[Scope], name: str, depth: int = 0) -> Tuple[Location, ...]:
+    """ Get all locations of a name, from the innermost scope to the outermost scope.
+    Haskell notation:
+        Locate :: Scope -> String -> Integer -> [Location]
+    A location is the amount of frames to go up and the slot in that frame.
+    Parameters:
+        scope (Scope): The scope in which the name is used.
+        name (str): The name of the variable.
+        depth (int): The amount of frames between the frame of the use and the frame of the scope.
+    Returns:
+        locations (Tuple): The locations which can contain the variable.
+        An empty tuple means the variable can only be a global variable.
+    """
+    if scope == None:
+        return ()
+    if name in scope.slots:
+        return ((depth, scope.slots[name]),) + Locate(scope.parent, name, depth + 1)
+    return Locate(scope.parent, name, depth + 1)
@@ -0,0 +1,202 @@
+from Interpreter.context import Context, SymbolDictionary
+from Interpreter.function import Function
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.optimizer import OptimizeProgram
+from Interpreter.purity import Memoize
+from Interpreter.tokens import *
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from glob import glob
+from io import StringIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import os
+
+Job = Tuple[str, Optional[str], List[Union[int, float]]]
+Worker = {}
+ProgramLimit = 256
+
+def Jobs(source: str) -> List[Job]:
+    """ Create the jobs of a batch.
+    Haskell notation:
+        Jobs :: String -> [Job]
+    A job is a program, the name of a function and the arguments for that function.
+    The source can be:
+        - A directory, every .AAP file inside of it is interpreted.
+        - A glob pattern, every matching file is interpreted.
+        - A manifest ending with .jsonl, every line contains a "file" and optionally a "function" and "arguments".
+    Parameters:
+        source (str): The directory, pattern or manifest.
+    Returns:
+        jobs (Lst): The jobs in the order of the source. Without a function the result is the result of the program.
+    """
+    if source.endswith(".jsonl"):
+        with open(source) as file:
+            lines = filter(lambda line: line.strip(), file.readlines())
+            entries = list(map(json.loads, lines))
+        directory = os.path.dirname(source)
+        return list(map(lambda entry: (os.path.join(directory, entry["file"]), entry.get("function"), entry.get("arguments", [])), entries))
+    if os.path.isdir(source):
+        source = os.path.join(source, "**", "*.AAP")
+    return list(map(lambda filename: (filename, None, []), sorted(glob(source, recursive=True))))
+
+def Prepare(read: Callable[[str], ListNode], execute: Callable, optimize: bool, cacheSize: int) -> None:
+    """ Store the settings of a worker, every worker process calls this once when it starts.
+    Haskell notation:
+        Prepare :: Callable -> Callable -> Boolean -> Integer -> None
+    Every worker also keeps the ASTs and the global contexts of the programs, see Program and Globals.
+    Parameters:
+        read (Callable): The function which creates the AST of a file.
+        execute (Callable): The engine which interprets the AST.
+        optimize (bool): Whether the AST is optimized.
+        cacheSize (int): The amount of results which every pure function stores, 0 to store nothing.
+    """
+    Worker.update(read=read, execute=execute, optimize=optimize, cacheSize=cacheSize, programs={}, globals={})
+
+def Program(filename: str) -> ListNode:
+    """ Get the AST of a file, every worker only reads and optimizes a file once.
+    Haskell notation:
+        Program :: String -> ListNode
+    When more than ProgramLimit programs are kept, the program which was read first is forgotten.
+    Parameters:
+        filename (str): The name of the .AAP file, or whatever else the reader of the worker accepts.
+    Returns:
+        ast (ListNode): The AST which is ready to be interpreted.
+    """
+    if filename not in Worker["programs"]:
+        if len(Worker["programs"]) >= ProgramLimit:
+            del Worker["programs"][next(iter(Worker["programs"]))]
+        ast = Worker["read"](filename)
+        if Worker["optimize"]:
+            ast = OptimizeProgram(ast)
+        if Worker["cacheSize"]:
+            ast = Memoize(ast, Worker["cacheSize"])
+        Worker["programs"][filename] = ast
+    return Worker["programs"][filename]
+
+def CallNode(function: str, arguments: List[Union[int, float]]) -> ReturnNode:
+    """ Create the node which calls a function and returns its result.
+    Haskell notation:
+        CallNode :: String -> [Integer | Float] -> ReturnNode
+    Parameters:
+        function (str): The name of the function.
+        arguments (Lst): The arguments for the function.
+    Returns:
+        node (ReturnNode): The call, because it is a ReturnNode it is the only result of the program.
+    """
+    numbers = list(map(lambda argument: NumberNode(Int(argument) if type(argument) == int else Float(argument)), arguments))
+    return ReturnNode(FunctionCallNode(VariableAccessNode(Identifier(function)), numbers))
+
+def RunJob(job: Job) -> Dict[str, Any]:
+    """ Interpret a single job inside of a worker.
+    Haskell notation:
+        RunJob :: Job -> Dict
+    Parameters:
+        job (Job): The program, function and arguments.
+    Returns:
+        result (Dict): The job, its result and everything which was printed, like exceptions.
+    """
+    filename, function, arguments = job
+    return {"file": filename, "function": function, "arguments": arguments, **RunProgram(filename, function, arguments)}
+
+def RunProgram(filename: str, function: Optional[str], arguments: List[Union[int, float]]) -> Dict[str, Any]:
+    """ Interpret a program inside of a worker.
+    Haskell notation:
+        RunProgram :: String -> String -> [Integer | Float] -> Dict
+    Without a function the program is interpreted in a new global context. With a function only the call is
+    interpreted, in a new global context in front of the globals of the program, see Globals. So the statements
+    of a program are only interpreted once per worker, and jobs can't see each others variables.
+    Parameters:
+        filename (str): The program, see Program.
+        function (str): The name of the function which is called, None to use the result of the program.
+        arguments (Lst): The arguments for the function.
+    Returns:
+        result (Dict): The result and everything which was printed, like exceptions.
+    """
+    def Calculate() -> Any:
+        """ Interpret the program or the call. """
+        if not function:
+            return Worker["execute"](Program(filename), GlobalContext())
+        call = ListNode([CallNode(function, arguments)])
+        return Worker["execute"](call, GlobalContext(Globals(filename).symbolDictionary))
+    return Capture(Calculate)
+
+def Globals(filename: str) -> Context:
+    """ Get the global context of a program, every worker only interprets the statements of a program once.
+    Haskell notation:
+        Globals :: String -> Context
+    The printed output of the statements is thrown away. When more than ProgramLimit contexts are kept,
+    the context which was created first is forgotten.
+    Parameters:
+        filename (str): The program, see Program.
+    Returns:
+        context (Context): The context with the global variables and functions of the program.
+    """
+    if filename not in Worker["globals"]:
+        if len(Worker["globals"]) >= ProgramLimit:
+            del Worker["globals"][next(iter(Worker["globals"]))]
+        context = GlobalContext()
+        with redirect_stdout(StringIO()):
+            Worker["execute"](Program(filename), context)
+        Worker["globals"][filename] = context
+    return Worker["globals"][filename]
+
+def GlobalContext(parent: Optional[SymbolDictionary] = None) -> Context:
+    """ Create a new global context, its variables are added to a new dictionary in front of the parent. """
+    context = Context()
+    context.symbolDictionary = SymbolDictionary(parent)
+    return context
+
+def Capture(calculate: Callable[[], Any]) -> Dict[str, Any]:
+    """ Calculate the result of a program and keep everything which it prints.
+    Haskell notation:
+        Capture :: Callable -> Dict
+    Parameters:
+        calculate (Callable): Interprets the program.
+    Returns:
+        result (Dict): The result, None after an exception, and everything which was printed, like exceptions.
+    """
+    output = StringIO()
+    with redirect_stdout(output):
+        try:
+            result = Value(calculate())
+        except Exception as ex:
+            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+            print(template.format(type(ex).__name__, ex.args))
+            result = None
+    return {"result": result, "output": output.getvalue()}
+
+def Value(result: Any) -> Any:
+    """ Convert the result of a program into a value which can be written as JSON.
+    Haskell notation:
+        Value :: Number | [Number] -> Integer | Float | List | String | None
+    """
+    if isinstance(result, Number):
+        return result.value
+    elif isinstance(result, Function):
+        return f"{FunctionDef.value} {result.name}"
+    elif type(result) == list:
+        return list(map(Value, result))
+    return result
+
+def StreamResults(jobs: List[Job], read: Callable[[str], ListNode], execute: Callable, optimize: bool = True, cacheSize: int = 0, workers: Optional[int] = None) -> Iterator[str]:
+    """ Run the jobs on a pool of worker processes.
+    Haskell notation:
+        StreamResults :: [Job] -> Callable -> Callable -> Boolean -> Integer -> Integer -> [String]
+    The jobs are sent to the workers in chunks. Every worker keeps the ASTs it has read,
+    so a program which is used by many jobs is only parsed once per worker.
+    Parameters:
+        jobs (Lst): The jobs, see Jobs.
+        read (Callable): The function which creates the AST of a file.
+        execute (Callable): The engine which interprets the AST.
+        optimize (bool): Whether the ASTs are optimized.
+        cacheSize (int): The amount of results which every pure function stores, 0 to store nothing.
+        workers (int): The amount of worker processes, the amount of cores by default.
+    Returns:
+        lines (Iterator): A JSON line for every job, in the order of the jobs, as soon as it is finished.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=Prepare, initargs=(read, execute, optimize, cacheSize)) as executor:
+        yield from map(json.dumps, executor.map(RunJob, jobs, chunksize=chunksize))
@@ -0,0 +1,26 @@
+from Interpreter.nodes import *
+from Interpreter.tokens import *
+from copy import copy
+from typing import Any
+
+def ShortCircuit(node: Any) -> Any:
+    """ Replace every And and Or operation by a LogicalOperationNode.
+    Haskell notation:
+        ShortCircuit :: Node -> Node
+    A LogicalOperationNode skips the right node when the left node decides the result.
+    The results are the same as And and Or on two numbers, only the work is different.
+    The AST isn't changed, the changed parts are copies.
+    Parameters:
+        node (Node): The node which will be rewritten.
+    Returns:
+        node (Node): The node with short circuiting And and Or operations.
+    """
+    if type(node) in (list, tuple):
+        return type(node)(map(ShortCircuit, node))
+    elif node == None or isinstance(node, (Token, int)):
+        return node
+    rewritten = copy(node)
+    rewritten.__dict__.update(zip(vars(node).keys(), map(ShortCircuit, vars(node).values())))
+    if type(node) == BinaryOperationNode and type(node.operator) in (And, Or):
+        return LogicalOperationNode(rewritten.left, rewritten.operator, rewritten.right)
+    return rewritten
@@ -1,5 +1,9 @@
 class Token:
     """ Base token class. """
+    kind = None
+    line = None
+    column = None
+
     def __str__(self) -> str:
         """ Represent Token as str.
         Returns:
@@ -8,133 +12,167 @@ class Token:
 
 class Int(Token):
     """ Class for an integer token. """
+    kind = 0
     def __init__(self, value: str) -> None:
         self.value = int(value)
 
 class Float(Token):
     """ Class for a float token. """
+    kind = 1
     def __init__(self, value: str) -> None:
         self.value = float(value)
 
 class Identifier(Token):
     """ Class for an identifier token. """
+    kind = 2
     def __init__(self, value: str) -> None:
         self.value = value
 
 class Plus(Token):
     """ Class which contains the plus token value. """
+    kind = 3
     value = "+"
 
 class Minus(Token):
     """ Class which contains the minus token value. """
+    kind = 4
     value = "-"
 
 class Multiply(Token):
     """ Class which contains the multiply token value. """
+    kind = 5
     value = "*"
 
 class Divide(Token):
     """ Class which contains the divide token value. """
+    kind = 6
     value = "/"
 
 class LPar(Token):
     """ Class which contains the left parantheses token value. """
+    kind = 7
     value = "OpenBanane"
 
 class RPar(Token):
     """ Class which contains the left parantheses token value. """
+    kind = 8
     value = "CloseBanane"
 
 class EOF(Token):
     """ Class for the left EndOfFile token. """
+    kind = 9
     value = ""
 
 class Variable(Token):
     """ Class which contains the variable token value. """
+    kind = 10
     value = "Ape"
 
 class Comma(Token):
     """ Class which contains the comma token value. """
+    kind = 11
     value = ","
 
 class FunctionDef(Token):
     """ Class which contains the function defenition token value. """
+    kind = 12
     value = "Wife"
     
 class Assign(Token):
     """ Class which contains the assign token value. """
+    kind = 13
     value = "Is"
 
 class Equals(Token):
     """ Class which contains the equal token value. """
+    kind = 14
     value = "=="
 
 class NotEquals(Token):
     """ Class which contains the not equal token value. """
+    kind = 15
     value = "!="
 
 class GreaterThan(Token):
     """ Class which contains the greater than token value. """
+    kind = 16
     value = ">"
 
 class GreaterThanEquals(Token):
     """ Class which contains the greater or equals token value. """
+    kind = 17
     value = ">="
 
 class LessThan(Token):
     """ Class which contains the less than token value. """
+    kind = 18
     value = "<"
 
 class LessThanEquals(Token):
     """ Class which contains the less or equals token value. """
+    kind = 19
     value = "<="
 
 class And(Token):
     """ Class which contains the and token value. """
+    kind = 20
     value = "And"
 
 class Or(Token):
     """ Class which contains the or token value. """
+    kind = 21
     value = "Or"
 
 class If(Token):
     """ Class which contains the if token value. """
+    kind = 22
     value = "If"
 
 class Else(Token):
     """ Class which contains the else token value. """
+    kind = 23
     value = "Else"
 
 class Then(Token):
     """ Class which contains the then token value. """
+    kind = 24
     value = "Then"
 
 class While(Token):
     """ Class which contains the while token value. """
+    kind = 25
     value = "SpinWhile"
 
 class Run(Token):
     """ Class which contains the run token value. """
+    kind = 26
     value = "Run"
 
 class Return(Token):
     """ Class which contains the return token value. """
+    kind = 27
     value = "Throw"
 
 class NewLine(Token):
     """ Class which contains the new line token value. """
+    kind = 28
     value = "\n"
 
 class EndFunction(Token):
     """ Class which contains the end of a function token value. """
+    kind = 29
     value = "StopWife"
 
 class EndIf(Token):
     """ Class which contains the end of an if statement token value. """
+    kind = 30
     value = "StopIf"
 
 class EndWhile(Token):
     """ Class which contains the end of a while loop token value. """
+    kind = 31
     value = "StopSpinning"
 
-TokenValues = {Plus.value: Plus, Minus.value: Minus, Multiply.value: Multiply, Divide.value: Divide, LPar.value: LPar, RPar.value: RPar, Assign.value: Assign, Variable.value: Variable, Equals.value: Equals, NotEquals.value: NotEquals, GreaterThan.value: GreaterThan, GreaterThanEquals.value: GreaterThanEquals, LessThan.value: LessThan, LessThanEquals.value: LessThanEquals, And.value: And, Or.value: Or, If.value: If, Else.value: Else, Then.value: Then, While.value: While, Comma.value: Comma, FunctionDef.value: FunctionDef, Run.value : Run, Return.value: Return, NewLine.value: NewLine, EndFunction.value : EndFunction, EndIf.value : EndIf, EndWhile.value : EndWhile}
\ No newline at end of file
+TokenValues = {Plus.value: Plus, Minus.value: Minus, Multiply.value: Multiply, Divide.value: Divide, LPar.value: LPar, RPar.value: RPar, Assign.value: Assign, Variable.value: Variable, Equals.value: Equals, NotEquals.value: NotEquals, GreaterThan.value: GreaterThan, GreaterThanEquals.value: GreaterThanEquals, LessThan.value: LessThan, LessThanEquals.value: LessThanEquals, And.value: And, Or.value: Or, If.value: If, Else.value: Else, Then.value: Then, While.value: While, Comma.value: Comma, FunctionDef.value: FunctionDef, Run.value : Run, Return.value: Return, NewLine.value: NewLine, EndFunction.value : EndFunction, EndIf.value : EndIf, EndWhile.value : EndWhile}
+
+TokenKinds = [Int, Float, Identifier, Plus, Minus, Multiply, Divide, LPar, RPar, EOF, Variable, Comma, FunctionDef, Assign, Equals, NotEquals, GreaterThan, GreaterThanEquals, LessThan, LessThanEquals, And, Or, If, Else, Then, While, Run, Return, NewLine, EndFunction, EndIf, EndWhile]
\ No newline at end of file
@@ -0,0 +1,265 @@
+from Interpreter.context import Context
+from Interpreter.interpreter import VisitNode
+from Interpreter.loop import Iterate
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.purity import IsPure
+from Interpreter.resolver import AssignedNames
+from Interpreter.tokens import *
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Array = Any
+Environment = Dict[str, Tuple[Array, Array]]
+Unrepresentable = "Unrepresentable"
+IntLimit = 2 ** 62
+ExactLimit = 2 ** 53
+
+Operations = {"Plus": lambda left, right: left + right, "Minus": lambda left, right: left - right,
+              "Multiply": lambda left, right: left * right, "Divide": lambda left, right: left / right,
+              "Equals": lambda left, right: left == right, "NotEquals": lambda left, right: left != right,
+              "GreaterThan": lambda left, right: left > right, "GreaterThanEquals": lambda left, right: left >= right,
+              "LessThan": lambda left, right: left < right, "LessThanEquals": lambda left, right: left <= right}
+
+class Unvectorizable(Exception):
+    """ Raised when a function can't be calculated over arrays with exactly the same results as the interpreter. """
+
+def RunBatch(ast: ListNode, name: str, inputs: Any) -> List[Union[Number, List[Number], None]]:
+    """ Call a function of a program for every row of the inputs.
+    Haskell notation:
+        RunBatch :: ListNode -> String -> Array -> [Number]
+    When NumPy is installed the body of the function is calculated over whole arrays at once:
+        - BinaryOperationNodes become NumPy operations.
+        - IfNodes calculate both cases for their own rows and select the results with the condition.
+        - WhileNodes repeat the body for the rows whose condition is still true, until no row is left.
+    The function has to be pure, see IsPure, and may not call functions. When the function can't be
+    calculated over arrays, or when NumPy isn't installed, every row is interpreted separately.
+    Both ways give the same results as VisitNode.
+    Parameters:
+        ast (ListNode): The AST of the program which defines the function.
+        name (str): The name of the function.
+        inputs (Array): A NumPy array or a list, every row contains the arguments of one call.
+        A single value is the only argument of its call.
+    Returns:
+        results (Lst): The result of every call.
+    """
+    rows = list(map(lambda row: list(row) if type(row) in (list, tuple) else [row], inputs.tolist() if hasattr(inputs, "tolist") else inputs))
+    try:
+        return VectorizedBatch(ast, name, rows)
+    except Unvectorizable:
+        return ScalarBatch(ast, name, rows)
+
+def ScalarBatch(ast: ListNode, name: str, rows: List[List[Union[int, float]]]) -> List[Union[Number, List[Number], None]]:
+    """ Interpret the program once and call the function for every row.
+    Haskell notation:
+        ScalarBatch :: ListNode -> String -> [[Integer | Float]] -> [Number]
+    Parameters:
+        ast (ListNode): The AST of the program which defines the function.
+        name (str): The name of the function.
+        rows (Lst): The arguments of every call.
+    Returns:
+        results (Lst): The result of every call.
+    """
+    context = Context()
+    VisitNode(ast, context)
+    function = context.symbolDictionary.GetValue(name)
+    if not function:
+        raise Exception(f"No value found for '{name}'..")
+    return list(map(lambda row: function.Execute(list(map(Number, row))), rows))
+
+def VectorizedBatch(ast: ListNode, name: str, rows: List[List[Union[int, float]]]) -> List[Number]:
+    """ Calculate the body of the function over the arrays of its arguments.
+    Haskell notation:
+        VectorizedBatch :: ListNode -> String -> [[Integer | Float]] -> [Number]
+    Parameters:
+        ast (ListNode): The AST of the program which defines the function.
+        name (str): The name of the function.
+        rows (Lst): The arguments of every call.
+    Returns:
+        results (Lst): The result of every call.
+        Raises Unvectorizable when the results could differ from the interpreter.
+    """
+    if numpy == None or not rows:
+        raise Unvectorizable("NumPy isn't installed or there are no rows..")
+    definitions = list(filter(lambda element: type(element) == FunctionDefenitionNode and element.token and element.token.value == name, ast.elements))
+    if len(definitions) != 1 or AssignedNames(ast).count(name) != 1 or not IsPure(definitions[0], set(), set(AssignedNames(ast))):
+        raise Unvectorizable(f"{name} isn't a pure function which is defined once..")
+    node = definitions[0]
+    if any(map(lambda row: len(row) != len(node.arguments), rows)):
+        raise Unvectorizable("The amount of arguments doesn't match..")
+    columns = list(map(lambda index: Column(list(map(lambda row: row[index], rows))), range(len(node.arguments))))
+    lanes = numpy.ones(len(rows), dtype=bool)
+    environment = dict(zip(map(lambda argument: argument.value, node.arguments), map(lambda column: (column, lanes), columns)))
+    with numpy.errstate(all="ignore"):
+        result = Operand(Vectorize(node.body, environment, lanes))
+    return list(map(Number, result.tolist()))
+
+def Column(values: List[Union[int, float]]) -> Array:
+    """ Create the array of an argument, only integers which can't overflow and floats are accepted. """
+    if all(map(lambda value: type(value) == int, values)) and all(map(lambda value: abs(value) < IntLimit, values)):
+        return numpy.array(values, dtype=numpy.int64)
+    if all(map(lambda value: type(value) == float, values)):
+        return numpy.array(values, dtype=numpy.float64)
+    raise Unvectorizable("An argument contains mixed, huge or other values..")
+
+def Operand(value: Optional[Array]) -> Array:
+    """ Check whether a value contains one number for every row. """
+    if value is None or value is Unrepresentable:
+        raise Unvectorizable("A value isn't a number in every row..")
+    return value
+
+def Vectorize(node: 'AllNodes', environment: Environment, lanes: Array) -> Optional[Array]:
+    """ Calculate the passed Node over arrays.
+    Every node has a Vectorize{node} function which is responsible for calculating that node.
+    Haskell notation:
+        Vectorize :: Node -> Dict -> Array -> Array | None
+    Parameters:
+        node (Node): The node which will be calculated.
+        environment (Dict): The values of the variables and the rows in which they are assigned.
+        lanes (Array): The rows for which the node is calculated, other rows keep their variables.
+    Returns:
+        values (Array): The value of the node in every row, only the values of the lanes are used.
+        Returns None when the value is None in every row, or Unrepresentable when a row has no single number.
+    """
+    method = globals().get(f'Vectorize{type(node).__name__}')
+    if not method:
+        raise Unvectorizable(f"A {type(node).__name__} can't be calculated over arrays..")
+    return method(node, environment, lanes)
+
+def VectorizeNumberNode(node: NumberNode, environment: Environment, lanes: Array) -> Array:
+    """ Calculate a NumberNode. """
+    if type(node.token.value) == int and abs(node.token.value) >= IntLimit:
+        raise Unvectorizable("A number is too big..")
+    return numpy.full(len(lanes), node.token.value, dtype=numpy.int64 if type(node.token.value) == int else numpy.float64)
+
+def VectorizeVariableAccessNode(node: VariableAccessNode, environment: Environment, lanes: Array) -> Array:
+    """ Calculate a VariableAccessNode, a variable which isn't assigned would be searched outside of the function. """
+    values, assigned = environment.get(node.token.value, (None, numpy.zeros(len(lanes), dtype=bool)))
+    if not assigned[lanes].all():
+        raise Unvectorizable(f"'{node.token.value}' isn't assigned in every row..")
+    return values
+
+def VectorizeReturnNode(node: ReturnNode, environment: Environment, lanes: Array) -> Optional[Array]:
+    """ Calculate a ReturnNode. """
+    if node.node:
+        return Vectorize(node.node, environment, lanes)
+    return None
+
+def VectorizeBinaryOperationNode(node: BinaryOperationNode, environment: Environment, lanes: Array) -> Array:
+    """ Calculate a BinaryOperationNode. """
+    left = Operand(Vectorize(node.left, environment, lanes))
+    right = Operand(Vectorize(node.right, environment, lanes))
+    return Calculate(type(node.operator).__name__, left, right, lanes)
+
+def VectorizeLogicalOperationNode(node: LogicalOperationNode, environment: Environment, lanes: Array) -> Array:
+    """ Calculate a LogicalOperationNode, the right side is only calculated for the rows which the left side doesn't decide. """
+    left = Operand(Vectorize(node.left, environment, lanes))
+    decided = (left != 0) == (type(node.operator) == Or)
+    if not (lanes & ~decided).any():
+        return Truncate(left, lanes)
+    right = Operand(Vectorize(node.right, environment, lanes & ~decided))
+    return numpy.where(decided, Truncate(left, lanes & decided), Truncate(right, lanes & ~decided))
+
+def Calculate(operator: str, left: Array, right: Array, lanes: Array) -> Array:
+    """ Calculate an operation over two arrays.
+    Haskell notation:
+        Calculate :: String -> Array -> Array -> Array -> Array
+    Integers are 64 bit in NumPy, so an operation which could overflow is left to the interpreter.
+    Floats are only exact for integers up to 2 ** 53, which matters when integers are divided or mixed with floats.
+    Parameters:
+        operator (str): The name of the operator.
+        left (Array): The left values.
+        right (Array): The right values.
+        lanes (Array): The rows for which the operation is calculated.
+    Returns:
+        values (Array): The result of the operation, comparisons result in 1 (true) or 0 (false).
+    """
+    if operator in ("And", "Or"):
+        decided = (left != 0) == (operator == "Or")
+        return numpy.where(decided, Truncate(left, lanes & decided), Truncate(right, lanes & ~decided))
+    integers = left.dtype.kind == "i" and right.dtype.kind == "i"
+    if operator == "Divide" and (right[lanes] == 0).any():
+        raise Unvectorizable("Division by zero..")
+    if (operator == "Divide" or not integers) and any(map(lambda values: values.dtype.kind == "i" and (numpy.abs(values[lanes]) > ExactLimit).any(), (left, right))):
+        raise Unvectorizable("An integer can't be converted to a float exactly..")
+    if integers and operator in ("Plus", "Minus", "Multiply") and (numpy.abs(Operations[operator](left[lanes].astype(numpy.float64), right[lanes].astype(numpy.float64))) >= IntLimit).any():
+        raise Unvectorizable("The result could overflow..")
+    result = Operations[operator](left, right)
+    if result.dtype.kind == "b":
+        return result.astype(numpy.int64)
+    return result
+
+def Truncate(values: Array, lanes: Array) -> Array:
+    """ Convert the values to integers like int does, the result of And and Or. """
+    if values.dtype.kind == "i":
+        return values
+    if not (numpy.abs(values[lanes]) < IntLimit).all():
+        raise Unvectorizable("A float is too big for an integer..")
+    return numpy.trunc(numpy.where(numpy.abs(values) < IntLimit, values, 0)).astype(numpy.int64)
+
+def VectorizeVariableAssignNode(node: VariableAssignNode, environment: Environment, lanes: Array) -> Array:
+    """ Calculate a VariableAssignNode, only the variables of the lanes are changed. """
+    name = node.token.value
+    value = Operand(Vectorize(node.node, environment, lanes))
+    if name in environment:
+        values, assigned = environment[name]
+        environment[name] = (Select(lanes, value, values, assigned), assigned | lanes)
+    else:
+        environment[name] = (value, lanes)
+    return value
+
+def VectorizeListNode(node: ListNode, environment: Environment, lanes: Array) -> Optional[Array]:
+    """ Calculate a ListNode, when it contains ReturnNodes only their values are kept, like VisitListNode.
+    Without exactly one value left a row results in a list, which isn't a number. """
+    returns = any(map(lambda element: type(element) == ReturnNode, node.elements))
+    values = list(map(lambda element: (type(element) == ReturnNode or not returns, Vectorize(element, environment, lanes)), node.elements))
+    kept = list(filter(lambda value: value is not None, map(lambda value: value[1] if value[0] else None, values)))
+    if len(kept) != 1:
+        return Unrepresentable
+    return kept[0]
+
+def VectorizeIfNode(node: IfNode, environment: Environment, lanes: Array) -> Optional[Array]:
+    """ Calculate an IfNode, both cases are calculated for their own rows and the results are selected. """
+    condition, expression = node.case
+    chosen = Operand(Vectorize(condition, environment, lanes)) != 0
+    thenLanes = lanes & chosen
+    elseLanes = lanes & ~chosen
+    thenValue = Vectorize(expression, environment, thenLanes) if thenLanes.any() else None
+    elseValue = Vectorize(node.elseCase, environment, elseLanes) if node.elseCase and elseLanes.any() else None
+    if not elseLanes.any():
+        return thenValue
+    if not thenLanes.any():
+        return elseValue
+    if thenValue is None and elseValue is None:
+        return None
+    if thenValue is None or elseValue is None or thenValue is Unrepresentable or elseValue is Unrepresentable:
+        return Unrepresentable
+    if thenValue.dtype.kind != elseValue.dtype.kind:
+        return Unrepresentable
+    return Select(chosen, thenValue, elseValue, lanes)
+
+def VectorizeWhileNode(node: WhileNode, environment: Environment, lanes: Array) -> None:
+    """ Calculate a WhileNode, the body is repeated for the rows whose condition is still true until no row is left. """
+    def Spin(active: Array) -> Array:
+        """ Calculate the body once for the rows whose condition is true. """
+        active = active & (Operand(Vectorize(node.condition, environment, active)) != 0)
+        if active.any():
+            Vectorize(node.body, environment, active)
+        return active
+    Iterate(Spin, lanes, lambda active: not active.any())
+    return None
+
+def Select(lanes: Array, value: Array, other: Array, used: Array) -> Array:
+    """ Take the value for the lanes and the other value for the other rows.
+    Integers and floats can't be mixed, unless the other value isn't used in any row. """
+    if value.dtype.kind != other.dtype.kind:
+        if not (used & ~lanes).any():
+            return value
+        raise Unvectorizable("Integers and floats are mixed..")
+    return numpy.where(lanes, value, other)
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
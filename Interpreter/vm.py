@@ -0,0 +1,541 @@
+from Interpreter.context import Context, SymbolDictionary
+from Interpreter.function import Function, Key, ResultCache
+from Interpreter.interpreter import Gather
+from Interpreter.loop import Repeat
+from Interpreter.nodes import *
+from Interpreter.number import Number
+from Interpreter.resolver import FunctionScope, Locate, Location, Scope
+from Interpreter.tokens import *
+from functools import partial, reduce
+from itertools import chain
+from operator import add, is_not
+from typing import Any, Callable, List, Optional, Tuple
+
+Instruction = Tuple[Callable[['Machine', Any], bool], Any]
+Pending = List[Tuple[ResultCache, Tuple]]
+MaxFrames = 1000000
+
+class Frame:
+    """ The variables of a single function call.
+    Every variable of the function has a fixed slot, global variables are stored in the SymbolDictionary. """
+    def __init__(self, slots: List[Optional[Number]], parent: Optional['Frame'], symbolDictionary: SymbolDictionary) -> None:
+        """ Initialize the slots and the parent.
+        Haskell notation:
+            Init :: [Number] -> Frame -> SymbolDictionary -> None
+        Parameters:
+            slots (Lst): The values of the variables, None for variables which aren't assigned yet.
+            parent (Frame): The frame in which the function was defined, None for the global frame.
+            symbolDictionary (SymbolDictionary): The global variables.
+        """
+        self.slots = slots
+        self.parent = parent
+        self.symbolDictionary = symbolDictionary
+
+class CompiledFunction(Function):
+    """ A function which is defined inside of the virtual machine.
+    Besides the function's body it contains the instructions of the body and the size of its frame. """
+    def __init__(self, name: str, arguments: List[Identifier], body: ListNode, frame: Frame, code: List[Instruction], size: int, cacheSize: int = 0) -> None:
+        """ Initialize the function and its instructions.
+        Haskell notation:
+            Init :: String -> [Identifier] -> ListNode -> Frame -> [Instruction] -> Integer -> Integer -> None
+        Parameters:
+            name (str): The name of the function.
+            arguments (Lst): The arguments for the function.
+            body (ListNode): The body of the function.
+            frame (Frame): The frame in which the function was defined.
+            code (Lst): The instructions of the body.
+            size (int): The amount of slots in the frame of a call.
+            cacheSize (int): The size of the ResultCache of a pure function, 0 when the results aren't stored.
+        """
+        super().__init__(name, arguments, body, None, cacheSize)
+        self.frame = frame
+        self.code = code
+        self.size = size
+
+    def Bind(self, arguments: List[Number]) -> Frame:
+        """ Create the frame of a call, the arguments are placed in the first slots.
+        Haskell notation:
+            Bind :: [Number] -> Frame
+        Parameters:
+            arguments (Lst): The arguments passed into the function.
+        Returns:
+            frame (Frame): The frame in which the function's body is executed.
+        """
+        self.CheckArguments(arguments)
+        return Frame(arguments + [None] * (self.size - len(arguments)), self.frame, self.frame.symbolDictionary)
+
+class Machine:
+    """ The state of the virtual machine. """
+    def __init__(self, code: List[Instruction], frame: Frame, maxFrames: int = MaxFrames) -> None:
+        """ Initialize the machine at the start of the code.
+        Haskell notation:
+            Init :: [Instruction] -> Frame -> Integer -> None
+        Parameters:
+            code (Lst): The instructions which will be executed.
+            frame (Frame): The frame in which the code is executed.
+            maxFrames (int): The maximum amount of function calls which can be active at the same time.
+        """
+        self.code = code
+        self.pc = 0
+        self.frame = frame
+        self.stack = []
+        self.frames = []
+        self.handlers = []
+        self.maxFrames = maxFrames
+
+def Step(machine: Machine) -> bool:
+    """ Execute the next instruction.
+    Haskell notation:
+        Step :: Machine -> Boolean
+    Parameters:
+        machine (Machine): The machine which executes the instruction.
+    Returns:
+        running (bool): Whether the machine has more instructions to execute.
+    """
+    operation, argument = machine.code[machine.pc]
+    machine.pc += 1
+    try:
+        return operation(machine, argument)
+    except Exception as ex:
+        return Recover(machine, ex)
+
+def Recover(machine: Machine, exception: Exception) -> bool:
+    """ Continue after the statement in which an exception occurred.
+    Haskell notation:
+        Recover :: Machine -> Exception -> Boolean
+    The message is printed like VisitNode does, the statement of the innermost Guard gets no value and
+    the calls which were started inside of it are removed. Without a Guard the exception is raised again.
+    Parameters:
+        machine (Machine): The machine in which the exception occurred.
+        exception (Exception): The exception.
+    Returns:
+        running (bool): Whether the machine has more instructions to execute.
+    """
+    if not machine.handlers:
+        raise exception
+    template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+    print(template.format(type(exception).__name__, exception.args))
+    machine.code, machine.pc, machine.frame, frames, height = machine.handlers.pop()
+    del machine.frames[frames:]
+    del machine.stack[height:]
+    machine.stack.append(None)
+    return True
+
+def Constant(machine: Machine, value: Optional[Number]) -> bool:
+    """ Push a constant value. """
+    machine.stack.append(value)
+    return True
+
+def Load(machine: Machine, variable: Tuple[Tuple[Location, ...], str]) -> bool:
+    """ Push the value of a variable.
+    The locations of the variable are tried from the innermost function outwards, the global variables are tried last. """
+    locations, name = variable
+    value = Find(machine.frame, locations, name)
+    if not value:
+        raise Exception(f"No value found for '{name}'..")
+    machine.stack.append(value)
+    return True
+
+def Find(frame: Frame, locations: Tuple[Location, ...], name: str) -> Optional[Number]:
+    """ Find the value of a variable.
+    Haskell notation:
+        Find :: Frame -> [Location] -> String -> Number | None
+    Parameters:
+        frame (Frame): The frame in which the variable is used.
+        locations (Tuple): The locations which can contain the variable, see Locate.
+        name (str): The name of the variable.
+    Returns:
+        number (Number): The value of the variable.
+        Returns None if the variable isn't assigned.
+    """
+    if not locations:
+        return frame.symbolDictionary.GetValue(name)
+    depth, slot = locations[0]
+    value = reduce(lambda frame, _: frame.parent, range(depth), frame).slots[slot]
+    if value == None:
+        return Find(frame, locations[1:], name)
+    return value
+
+def Store(machine: Machine, slot: int) -> bool:
+    """ Assign the value on top of the stack to a variable of the current function, the value stays on the stack. """
+    machine.frame.slots[slot] = machine.stack[-1]
+    return True
+
+def StoreGlobal(machine: Machine, name: str) -> bool:
+    """ Assign the value on top of the stack to a global variable, the value stays on the stack. """
+    machine.frame.symbolDictionary.SetValue(name, machine.stack[-1])
+    return True
+
+def Binary(machine: Machine, operator: str) -> bool:
+    """ Replace the top two values by the result of the operator. """
+    right = machine.stack.pop()
+    left = machine.stack.pop()
+    machine.stack.append(getattr(left, operator)(right))
+    return True
+
+def Decide(machine: Machine, argument: Tuple[bool, int]) -> bool:
+    """ Check whether the left value of an And or Or operation decides the result.
+    In that case it is replaced by the result and the right side is skipped, otherwise it is removed. """
+    decides, offset = argument
+    value = machine.stack[-1]
+    if value.IsTrue() == decides:
+        machine.stack[-1] = Number(int(value.value))
+        machine.pc += offset
+    else:
+        machine.stack.pop()
+    return True
+
+def Truncate(machine: Machine, _: None) -> bool:
+    """ Replace the value on top of the stack by its integer value, the result of an And or Or operation. """
+    machine.stack[-1] = Number(int(machine.stack[-1].value))
+    return True
+
+def Guard(machine: Machine, offset: int) -> bool:
+    """ Start a statement, when an exception occurs inside of it the program continues after the offset. """
+    machine.handlers.append((machine.code, machine.pc + offset, machine.frame, len(machine.frames), len(machine.stack)))
+    return True
+
+def EndGuard(machine: Machine, _: None) -> bool:
+    """ End the statement of the last Guard. """
+    machine.handlers.pop()
+    return True
+
+def Pop(machine: Machine, _: None) -> bool:
+    """ Remove the value on top of the stack. """
+    machine.stack.pop()
+    return True
+
+def Jump(machine: Machine, offset: int) -> bool:
+    """ Move the program counter by the offset. """
+    machine.pc += offset
+    return True
+
+def JumpIfFalse(machine: Machine, offset: int) -> bool:
+    """ Remove the value on top of the stack and move the program counter by the offset when it is false. """
+    if not machine.stack.pop().IsTrue():
+        machine.pc += offset
+    return True
+
+def Collect(machine: Machine, amount: int) -> bool:
+    """ Replace the top values by the result of a ListNode.
+    None values are removed, a single value is not put inside of a list. """
+    elements = machine.stack[len(machine.stack) - amount:]
+    del machine.stack[len(machine.stack) - amount:]
+    elements = list(filter(partial(is_not, None), elements))
+    machine.stack.append(elements[0] if len(elements) == 1 else elements)
+    return True
+
+def Define(machine: Machine, definition: Tuple[Optional[str], List[Identifier], ListNode, List[Instruction], int, Optional[int], int]) -> bool:
+    """ Push a new function which is bound to the current frame.
+    A named function is stored in its slot, or as a global variable when it is defined outside of a function. """
+    name, arguments, body, code, size, slot, cacheSize = definition
+    function = CompiledFunction(name, arguments, body, machine.frame, code, size, cacheSize)
+    if slot != None:
+        machine.frame.slots[slot] = function
+    elif name:
+        machine.frame.symbolDictionary.SetValue(name, function)
+    machine.stack.append(function)
+    return True
+
+def Call(machine: Machine, amount: int) -> bool:
+    """ Call the function below the arguments on top of the stack.
+    The current code, program counter and frame are stored. """
+    arguments = machine.stack[len(machine.stack) - amount:]
+    del machine.stack[len(machine.stack) - amount:]
+    function = machine.stack.pop()
+    result, pending = Remember(function, arguments)
+    if result != None:
+        machine.stack.append(result)
+        return True
+    frame = function.Bind(arguments)
+    if len(machine.frames) >= machine.maxFrames:
+        raise Exception(f"Too many nested function calls.. The maximum is {machine.maxFrames}")
+    machine.frames.append((machine.code, machine.pc, machine.frame, pending))
+    machine.code, machine.pc, machine.frame = function.code, 0, frame
+    return True
+
+def TailCall(machine: Machine, amount: int) -> bool:
+    """ Call the function below the arguments on top of the stack in place of the current function.
+    No frame is stored, the called function returns directly to the caller of the current function.
+    Its result is also the result of the current call, so it is stored in the caches of both. The cache
+    and key are added to the list of the stored frame, which takes the same time for every tail call. """
+    arguments = machine.stack[len(machine.stack) - amount:]
+    del machine.stack[len(machine.stack) - amount:]
+    function = machine.stack.pop()
+    result, pending = Remember(function, arguments)
+    if result != None:
+        machine.stack.append(result)
+        return Return(machine, None)
+    machine.frames[-1][3].extend(pending)
+    machine.code, machine.pc, machine.frame = function.code, 0, function.Bind(arguments)
+    return True
+
+def Return(machine: Machine, _: None) -> bool:
+    """ Continue with the caller, the result stays on the stack and is stored in the caches of the finished calls.
+    Returning from the program itself stops the machine. """
+    if not machine.frames:
+        return False
+    machine.code, machine.pc, machine.frame, pending = machine.frames.pop()
+    list(map(lambda call: call[0].Store(call[1], machine.stack[-1]), pending))
+    return True
+
+def Remember(function: CompiledFunction, arguments: List[Number]) -> Tuple[Optional[Number], Pending]:
+    """ Look up the result of a call to a pure function.
+    Haskell notation:
+        Remember :: CompiledFunction -> [Number] -> Tuple
+    Parameters:
+        function (CompiledFunction): The function which is called.
+        arguments (Lst): The arguments passed into the function.
+    Returns:
+        result (Number): The stored result, None when the body has to be executed.
+        pending (Lst): The cache and key which will store the result when the call returns, empty for other functions.
+    """
+    if not function.cache:
+        return None, []
+    key = Key(arguments)
+    result = function.cache.Lookup(key)
+    return result, [(function.cache, key)] if key != None and result == None else []
+
+def LowerNode(node: 'AllNodes', scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower the passed Node into instructions.
+    Every node has a Lower{node} function which is responsible for lowering that node.
+    Haskell notation:
+        LowerNode :: Node -> Scope -> [Instruction]
+    Parameters:
+        node (Node): The node which will be lowered.
+        scope (Scope): The scope of the function which contains the node, None outside of functions.
+    Returns:
+        instructions (Lst): The instructions which push the value of the node.
+    """
+    return globals()[f'Lower{type(node).__name__}'](node, scope)
+
+def LowerNumberNode(node: NumberNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a NumberNode. """
+    return [(Constant, Number(node.token.value))]
+
+def LowerReturnNode(node: ReturnNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a ReturnNode, an empty return pushes None. """
+    if node.node:
+        return LowerNode(node.node, scope)
+    return [(Constant, None)]
+
+def LowerBinaryOperationNode(node: BinaryOperationNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a BinaryOperationNode. """
+    return LowerNode(node.left, scope) + LowerNode(node.right, scope) + [(Binary, type(node.operator).__name__)]
+
+def LowerLogicalOperationNode(node: LogicalOperationNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a LogicalOperationNode, the right side is skipped when the left value decides the result. """
+    right = LowerNode(node.right, scope) + [(Truncate, None)]
+    return LowerNode(node.left, scope) + [(Decide, (type(node.operator) == Or, len(right)))] + right
+
+def LowerVariableAssignNode(node: VariableAssignNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a VariableAssignNode, outside of functions the variable is global. """
+    if scope == None:
+        return LowerNode(node.node, scope) + [(StoreGlobal, node.token.value)]
+    return LowerNode(node.node, scope) + [(Store, scope.slots[node.token.value])]
+
+def LowerVariableAccessNode(node: VariableAccessNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a VariableAccessNode. """
+    return [(Load, (Locate(scope, node.token.value), node.token.value))]
+
+def LowerListNode(node: ListNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a ListNode.
+    When the list contains ReturnNodes only their values are kept, like VisitListNode. Every element
+    is guarded, so an exception only leaves out the value of that element, see Guarded. """
+    returnNodes = map(lambda element: ReturnNode == type(element), node.elements)
+    returns = reduce(add, returnNodes, 0)
+
+    def LowerElement(element: 'AllNodes') -> List[Instruction]:
+        """ Lower an element and drop its value when it isn't kept. """
+        if not returns or type(element) == ReturnNode:
+            return Guarded(LowerNode(element, scope))
+        return Guarded(LowerNode(element, scope)) + [(Pop, None)]
+
+    kept = returns if returns else len(node.elements)
+    return list(chain.from_iterable(map(LowerElement, node.elements))) + [(Collect, kept)]
+
+def LowerIfNode(node: IfNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower an IfNode, an IfNode without an else case pushes None when the condition is false. """
+    condition, expression = node.case
+    case = LowerNode(expression, scope)
+    elseCase = LowerNode(node.elseCase, scope) if node.elseCase else [(Constant, None)]
+    return LowerNode(condition, scope) + [(JumpIfFalse, len(case) + 1)] + case + [(Jump, len(elseCase))] + elseCase
+
+def LowerWhileNode(node: WhileNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a WhileNode, the loop pushes None when it is done. """
+    condition = LowerNode(node.condition, scope)
+    body = LowerNode(node.body, scope) + [(Pop, None)]
+    loop = len(condition) + 1 + len(body) + 1
+    return condition + [(JumpIfFalse, len(body) + 1)] + body + [(Jump, -loop), (Constant, None)]
+
+def LowerFunctionDefenitionNode(node: FunctionDefenitionNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a FunctionDefenitionNode, the body is lowered into its own instructions with its own scope.
+    Calls whose result is directly returned by the body become tail calls. """
+    name = node.token.value if node.token else None
+    body = FunctionScope(node, scope)
+    code = LowerTail(ReturnVariable(node.body), body) + [(Return, None)]
+    slot = scope.slots[name] if scope != None and name else None
+    return [(Define, (name, node.arguments, node.body, code, body.size, slot, node.cacheSize))]
+
+def LowerFunctionCallNode(node: FunctionCallNode, scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a FunctionCallNode. """
+    arguments = list(chain.from_iterable(map(partial(LowerNode, scope=scope), node.arguments)))
+    return LowerNode(node.node, scope) + arguments + [(Call, len(node.arguments))]
+
+def LowerTail(node: 'AllNodes', scope: Optional[Scope]) -> List[Instruction]:
+    """ Lower a node whose value is the result of the function.
+    Haskell notation:
+        LowerTail :: Node -> Scope -> [Instruction]
+    A FunctionCallNode in this position becomes a tail call. IfNodes pass the position on
+    to both cases, ReturnNodes to their value and ListNodes to the element which is their result.
+    Parameters:
+        node (Node): The node which will be lowered.
+        scope (Scope): The scope of the function.
+    Returns:
+        instructions (Lst): The instructions which push the value of the node or call a function in its place.
+    """
+    if type(node) == FunctionCallNode:
+        arguments = list(chain.from_iterable(map(partial(LowerNode, scope=scope), node.arguments)))
+        return LowerNode(node.node, scope) + arguments + [(TailCall, len(node.arguments))]
+    elif type(node) == ReturnNode and node.node:
+        return LowerTail(node.node, scope)
+    elif type(node) == IfNode:
+        condition, expression = node.case
+        case = LowerTail(expression, scope)
+        elseCase = LowerTail(node.elseCase, scope) if node.elseCase else [(Constant, None)]
+        return LowerNode(condition, scope) + [(JumpIfFalse, len(case) + 1)] + case + [(Jump, len(elseCase))] + elseCase
+    elif type(node) == ListNode and IsTailList(node):
+        elements = chain.from_iterable(map(lambda element: Guarded(LowerNode(element, scope)) + [(Pop, None)], node.elements[:-1]))
+        tail = LowerTail(node.elements[-1], scope)
+        if not any(map(lambda instruction: instruction[0] == TailCall, tail)):
+            tail = Guarded(tail)
+        return list(elements) + tail + [(Collect, 1)]
+    return LowerNode(node, scope)
+
+def Guarded(instructions: List[Instruction]) -> List[Instruction]:
+    """ Guard the instructions of a statement.
+    Haskell notation:
+        Guarded :: [Instruction] -> [Instruction]
+    When an exception occurs inside of the statement its message is printed, the statement pushes
+    None and the program continues after it, like VisitNode. A statement with a tail call isn't
+    guarded, because the call replaces the frame of the Guard.
+    Parameters:
+        instructions (Lst): The instructions of the statement, which push its value.
+    Returns:
+        instructions (Lst): The guarded instructions.
+    """
+    return [(Guard, len(instructions) + 1)] + instructions + [(EndGuard, None)]
+
+def IsTailList(node: ListNode) -> bool:
+    """ Check whether the value of the last element is the value of the ListNode.
+    Haskell notation:
+        IsTailList :: ListNode -> Boolean
+    This is the case when the last element is the only element, or the only ReturnNode.
+    Parameters:
+        node (ListNode): The ListNode which will be checked.
+    Returns:
+        tail (bool): Whether the value of the last element is the value of the ListNode.
+    """
+    returnNodes = map(lambda element: ReturnNode == type(element), node.elements)
+    returns = reduce(add, returnNodes, 0)
+    if not node.elements:
+        return False
+    if returns == 0:
+        return len(node.elements) == 1
+    return returns == 1 and type(node.elements[-1]) == ReturnNode
+
+def ReturnVariable(body: 'AllNodes') -> 'AllNodes':
+    """ Replace 'Ape x Is value' followed by 'Throw x' at the end of a body with 'Throw value'.
+    Haskell notation:
+        ReturnVariable :: Node -> Node
+    The variable only lives in the frame of the call, so the assignment can't be seen after
+    the return. This isn't the case when the body defines a function, because that function
+    can read the variable, or when the value can be None, because then the variable is
+    looked up outside of the function. In those cases the body isn't changed.
+    Parameters:
+        body (Node): The body of a function.
+    Returns:
+        body (Node): The body which returns the value directly.
+    """
+    if type(body) != ListNode or len(body.elements) < 2 or not IsTailList(body) or DefinesFunction(body):
+        return body
+    assign, returns = body.elements[-2:]
+    if type(assign) != VariableAssignNode or type(returns.node) != VariableAccessNode or assign.token.value != returns.node.token.value:
+        return body
+    if MayBeNone(assign.node):
+        return body
+    return ListNode(body.elements[:-2] + [ReturnNode(assign.node)])
+
+def MayBeNone(node: 'AllNodes') -> bool:
+    """ Check whether the value of a node can be None.
+    Haskell notation:
+        MayBeNone :: Node -> Boolean
+    Parameters:
+        node (Node): The node which will be checked.
+    Returns:
+        none (bool): Whether the value can be None.
+    """
+    if type(node) == IfNode:
+        return node.elseCase == None or MayBeNone(node.case[1]) or MayBeNone(node.elseCase)
+    elif type(node) == VariableAssignNode:
+        return MayBeNone(node.node)
+    elif type(node) == ReturnNode:
+        return node.node == None or MayBeNone(node.node)
+    return type(node) == WhileNode
+
+def DefinesFunction(node: Any) -> bool:
+    """ Check whether a node contains a FunctionDefenitionNode.
+    Haskell notation:
+        DefinesFunction :: Node -> Boolean
+    Parameters:
+        node (Node): The node which will be checked.
+    Returns:
+        defines (bool): Whether there is a FunctionDefenitionNode inside of the node.
+    """
+    if type(node) == FunctionDefenitionNode:
+        return True
+    elif type(node) in (list, tuple):
+        return any(map(DefinesFunction, node))
+    elif node == None or isinstance(node, Token):
+        return False
+    return any(map(DefinesFunction, vars(node).values()))
+
+def Lower(ast: ListNode) -> List[Instruction]:
+    """ Lower a whole program.
+    Haskell notation:
+        Lower :: ListNode -> [Instruction]
+    Parameters:
+        ast (ListNode): The AST of the program.
+    Returns:
+        instructions (Lst): The instructions of the program.
+    """
+    return LowerNode(ast, None) + [(Return, None)]
+
+def Execute(ast: ListNode, context: Context, maxFrames: int = MaxFrames) -> Union[List[Number], Number]:
+    """ Lower the AST and execute it on the virtual machine.
+    Haskell notation:
+        Execute :: ListNode -> Context -> Integer -> Number | [Number]
+    Every statement of the program is lowered and executed on its own machine, which share the
+    global variables. When an exception occurs the message is printed and the statement has no
+    value, like VisitNode does, the other statements are still executed.
+    Parameters:
+        ast (ListNode): The AST of the program.
+        context (Context): The global context.
+        maxFrames (int): The maximum amount of function calls which can be active at the same time.
+    Returns:
+        number (Number): The result of the program.
+    """
+    frame = Frame([], None, context.symbolDictionary)
+
+    def Run(element: 'AllNodes') -> Optional[Number]:
+        """ Execute a single statement, None when an exception occurs. """
+        try:
+            machine = Repeat(Step, Machine(LowerNode(element, None) + [(Return, None)], frame, maxFrames))
+            return machine.stack.pop()
+        except Exception as ex:
+            template = "An exception of type {0} occurred. Arguments:\n{1!r}"
+            message = template.format(type(ex).__name__, ex.args)
+            print(message)
+    return Gather(ast.elements, list(map(Run, ast.elements)))
+
+AllNodes = Union[NumberNode, VariableAccessNode, BinaryOperationNode, LogicalOperationNode, VariableAssignNode, IfNode, WhileNode, FunctionDefenitionNode, FunctionCallNode, ListNode, ReturnNode]
@@ -5,19 +5,16 @@
 
 even:
 	PUSH 	{ LR }
-	MOVS	R1, #0
-	SUB 	R3, R1, R0
-	NEG 	R2, R3
-	ADC 	R2, R2, R3
-	CMP 	R2, #1
-	BNE 	.L2
-	MOVS	R3, #1
-	B   	.L4
+	CMP 	R0, #0
+	BNE 	.L4
 .L2:
 	MOVS	R1, #1
-	SUB 	R0, R1
-	BL  	odd
+	B   	.L6
 .L4:
+	SUB 	R0, R0, #1
+	BL  	odd	@ R0
+	MOVS	R1, R0
+.L6:
+	MOVS	R0, R1
 END:
-	MOVS	R0, R3
 	POP 	{ PC }
\ No newline at end of file
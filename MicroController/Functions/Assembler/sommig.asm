@@ -4,19 +4,17 @@
 .global sommig
 
 sommig:
-	PUSH 	{ R4, LR }
+	PUSH 	{ LR }
 	MOVS	R1, #0
-LOOP:
-	MOVS	R2, #1
-	ASR 	R3, R0, #31
-	LSR 	R4, R2, #31
-	CMP 	R0, R2
-	ADC 	R3, R3, R4
-	ADD 	R1, R0
-	MOVS	R4, #1
-	SUB 	R0, R4
-	CMP 	R3, #1
-	BEQ 	LOOP
-END:
+.L2:
+	CMP 	R0, #1
+	BLT 	.L6
+.L4:
+	ADD 	R1, R1, R0
+	SUB 	R0, R0, #1
+	CMP 	R0, #1
+	BGE 	.L4
+.L6:
 	MOVS	R0, R1
-	POP 	{ R4, PC }
\ No newline at end of file
+END:
+	POP 	{ PC }
\ No newline at end of file
@@ -5,9 +5,9 @@
 
 equals:
 	PUSH 	{ LR }
-	SUB 	R3, R1, R0
-	NEG 	R2, R3
-	ADC 	R2, R2, R3
+	SUB 	R0, R1, R0
+	NEG 	R1, R0
+	ADC 	R1, R1, R0
+	MOVS	R0, R1
 END:
-	MOVS	R0, R2
 	POP 	{ PC }
\ No newline at end of file
@@ -7,9 +7,9 @@ greater:
 	PUSH 	{ LR }
 	MOV 	R2, #1
 	CMP 	R0, R1
-	BGT 	.L2
+	BGT 	.L4
 	MOVS	R2, #0
-.L2:
-END:
+.L4:
 	MOVS	R0, R2
+END:
 	POP 	{ PC }
\ No newline at end of file
@@ -9,6 +9,6 @@ greaterEquals:
 	LSR 	R3, R1, #31
 	CMP 	R0, R1
 	ADC 	R2, R2, R3
-END:
 	MOVS	R0, R2
+END:
 	POP 	{ PC }
\ No newline at end of file
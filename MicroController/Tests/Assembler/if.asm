@@ -5,15 +5,13 @@
 
 ifTest:
 	PUSH 	{ LR }
-	SUB 	R2, R0, R0
-	NEG 	R1, R2
-	ADC 	R1, R1, R2
-	CMP 	R1, #1
-	BNE 	.L2
-	MOVS	R2, #1
-	B   	.L4
+	CMP 	R0, R0
+	BNE 	.L4
 .L2:
+	MOVS	R0, #1
+	B   	.L6
 .L4:
+	MOVS	R0, #0
+.L6:
 END:
-	MOVS	R0, R2
 	POP 	{ PC }
\ No newline at end of file
@@ -5,9 +5,8 @@
 
 notEquals:
 	PUSH 	{ LR }
-	SUB 	R2, R1, R0
-	SUB 	R3, R2, #1
-	SBC 	R2, R2, R3
+	SUB 	R0, R1, R0
+	SUB 	R1, R0, #1
+	SBC 	R0, R0, R1
 END:
-	MOVS	R0, R2
 	POP 	{ PC }
\ No newline at end of file
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Union
+import json
+import os
+import socket
+import sys
+
+def Request(path: str, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """ Send requests to a running interpreter server, see Interpreter.daemon.
+    Haskell notation:
+        Request :: String -> [Dict] -> [Dict]
+    All requests are sent over a single connection.
+    Parameters:
+        path (str): The path of the socket of the server.
+        requests (Lst): The requests, every request contains a "source" or a "file", and optionally a "function" and its "arguments".
+    Returns:
+        responses (Lst): The response to every request, in the order of the requests.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(b"".join(map(lambda request: json.dumps(request).encode() + b"\n", requests)))
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as responses:
+            return list(map(json.loads, responses))
+
+def Argument(argument: str) -> Union[int, float]:
+    """ Convert an argument of the command line into a number for the function. """
+    try:
+        return int(argument)
+    except ValueError:
+        return float(argument)
+
+if __name__ == '__main__':
+    words = list(filter(lambda argument: not argument.startswith("--"), sys.argv[1:]))
+    options = dict(map(lambda option: (option[2:].split("=", 1) + [""])[:2], filter(lambda argument: argument.startswith("--"), sys.argv[1:])))
+    if not words:
+        print("I need an input file to do anything..")
+        sys.exit(1)
+    if "send" in options:
+        with open(words[0]) as file:
+            request = {"source": file.read()}
+    else:
+        request = {"file": os.path.abspath(words[0])}
+    if len(words) > 1:
+        request.update(function=words[1], arguments=list(map(Argument, words[2:])))
+    response = Request(options.get("socket") or "aap.sock", [request])[0]
+    if "error" in response:
+        print(response["error"])
+        sys.exit(1)
+    sys.stdout.write(response["output"])
+    if response["result"] not in (None, []):
+        print(response["result"])
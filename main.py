@@ -1,67 +1,250 @@
 from Compiler.compiler import Compiler
 from Compiler.number import Number
+from Compiler.peephole import Report
+from Interpreter.cache import LoadProgram, PrewarmCache
+from Interpreter.compact import LexCompact
+from Interpreter.compactparser import ParseCompact
 from Interpreter.context import Context, SymbolDictionary
+from Interpreter.daemon import ReadSource, Serve
 from Interpreter.interpreter import VisitNode
-from Interpreter.lexer import Lex
+from Interpreter.lexer import Lex, LexLinear, LexStream
 from Interpreter.number import Number
+from Interpreter.optimizer import IsImmediate, OptimizeProgram
+from Interpreter.parallel import VisitParallel
 from Interpreter.parser import Parse
+from Interpreter.heatmap import Heatmap, VisitHeated
+from Interpreter.profiler import Profile, VisitProfiled
+from Interpreter.purity import Memoize
+from Interpreter.runner import Jobs, StreamResults
+from Interpreter.shortcircuit import ShortCircuit
+from Interpreter.vm import Execute
+from Interpreter.closures import Evaluate
 from Interpreter.nodes import *
-from typing import List
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from Interpreter.function import CacheSize
 import Interpreter.function
 import sys
 
-def InterpretFile(filename: str) -> List[Number]:
-    """ Read and interpret a .AAP file.
+Lexers = {"recursive": Lex, "linear": LexLinear, "stream": LexStream, "compact": LexCompact}
+Parsers = {"recursive": Parse, "compact": ParseCompact}
+Engines = {"tree": VisitNode, "vm": Execute, "closures": Evaluate}
+TreeOptions = ["parallel", "profile", "heatmap"]
+
+def ReadProgram(filename: str, lexer: Callable = Lex, parser: Callable = Parse) -> ListNode:
+    """ Read a .AAP file and create its AST.
     Haskell notation:
-        InterpretFile :: String -> [Number]
-    This contains three steps:
+        ReadProgram :: String -> Callable -> Callable -> ListNode
+    This contains two steps:
         - Create tokens with the Lexer.
         - Create an AST from the tokens with the Parser.
+    Parameters:
+        filename (str): The name of the file which needs to be read.
+        lexer (Callable): The lexer which creates the tokens.
+        parser (Callable): The parser which creates the AST.
+    Returns:
+        ast (ListNode): The AST of the file.
+    """
+    tokens = lexer(filename=filename)
+    return parser(tokens, index=0)
+
+def ReadShortCircuit(filename: str, read: Callable[[str], ListNode] = ReadProgram) -> ListNode:
+    """ Read a .AAP file and let its And and Or operations skip the right side when the left side decides the result.
+    Haskell notation:
+        ReadShortCircuit :: String -> Callable -> ListNode
+    Parameters:
+        filename (str): The name of the file which needs to be read.
+        read (Callable): The function which creates the AST of the file.
+    Returns:
+        ast (ListNode): The AST of the file with short circuiting And and Or operations.
+    """
+    return ShortCircuit(read(filename))
+
+def InterpretFile(filename: str, read: Callable[[str], ListNode] = ReadProgram, execute: Callable = VisitNode, optimize: bool = True, cacheSize: int = 0) -> List[Number]:
+    """ Read and interpret a .AAP file.
+    Haskell notation:
+        InterpretFile :: String -> Callable -> Callable -> Boolean -> Integer -> [Number]
+    This contains four steps:
+        - Create an AST with the reader, see ReadProgram.
+        - Optimize the AST, see OptimizeProgram.
+        - Let pure functions store their results, see Memoize.
         - Interpret the AST with the Interpreter.
     Parameters:
         filename (str): The name of the file which needs to be interpreted.
+        read (Callable): The function which creates the AST of the file.
+        execute (Callable): The engine which interprets the AST, see Engines.
+        optimize (bool): Whether the AST is optimized.
+        cacheSize (int): The amount of results which every pure function stores, 0 to store nothing.
     Returns:
         result (Lst): List filled with all returned values.
     """
-    tokens = Lex(filename=filename)
-    ast = Parse(tokens, index=0)
-    result = VisitNode(ast, context)
+    ast = read(filename)
+    if optimize:
+        ast = OptimizeProgram(ast)
+    if cacheSize:
+        ast = Memoize(ast, cacheSize)
+    result = execute(ast, context)
     try:
         if len(result) > 1:
-            result = list(filter(lambda element: type(element) != Interpreter.function.Function, result))
+            result = list(filter(lambda element: not isinstance(element, Interpreter.function.Function), result))
             if len(result) > 0:
                 print(result)
     except:
-        if type(result) == Interpreter.function.Function:
+        if isinstance(result, Interpreter.function.Function):
             return
         print(result)
 
-def CompileFile(input: str, output: str) -> None:
+def CompileFile(input: str, output: str, read: Callable[[str], ListNode] = ReadProgram, optimize: bool = True, report: bool = False) -> None:
     """ Read and compile a .AAP file.
     Haskell notation:
-        CompileFile :: String -> String -> None
+        CompileFile :: String -> String -> Callable -> Boolean -> Boolean -> None
     This contains three steps:
-        - Create tokens with the Lexer.
-        - Create an AST from the tokens with the Parser.
+        - Create an AST with the reader, see ReadProgram.
+        - Optimize the AST, only results which fit in an immediate are calculated.
         - Compile the AST with the Compiler.
     Parameters:
         input (str): The name of the file which needs to be interpreted.
         output (str): The name of the file where the assembler code will be written to.
+        read (Callable): The function which creates the AST of the file.
+        optimize (bool): Whether the AST is optimized.
+        report (bool): Whether the instructions and cycles which every peephole rule saved are printed.
     """
-    tokens = Lex(filename=input)
-    ast = Parse(tokens, index=0)
+    ast = read(input)
+    if optimize:
+        ast = OptimizeProgram(ast, IsImmediate)
     node = ast.elements[0]
     compiler = Compiler(node)
     compiler.Compile(ast, output)
+    if report:
+        print(Report(compiler.procedure.name, compiler.savings))
+
+def PrintCaches(context: Context) -> None:
+    """ Print the counters of the ResultCache of every pure global function.
+    Haskell notation:
+        PrintCaches :: Context -> None
+    Parameters:
+        context (Context): The global context after the program is interpreted.
+    """
+    functions = filter(lambda value: isinstance(value, Interpreter.function.Function) and value.cache, context.symbolDictionary.symbols.values())
+    list(map(lambda function: print(f"{function.name}: {function.cache}"), functions))
+
+def WriteProfile(profile: Profile, filename: str) -> None:
+    """ Print the tables of a profile and write its collapsed stacks to a file.
+    Haskell notation:
+        WriteProfile :: Profile -> String -> None
+    Parameters:
+        profile (Profile): The profile of the interpreted program.
+        filename (str): The name of the file for the collapsed stacks, which flamegraph tools can read.
+    """
+    print(profile)
+    with open(filename, "w") as file:
+        file.write("".join(map(lambda line: f"{line}\n", profile.Collapsed())))
+
+def WriteHeatmap(heatmap: Heatmap, filename: str, report: str = "") -> None:
+    """ Print the source of a program with the hits and time of every line, or write it as an HTML report.
+    Haskell notation:
+        WriteHeatmap :: Heatmap -> String -> String -> None
+    Parameters:
+        heatmap (Heatmap): The heatmap of the interpreted program.
+        filename (str): The name of the .AAP file.
+        report (str): The name of the HTML report, the source is printed when it is empty.
+    """
+    with open(filename) as file:
+        source = file.readlines()
+    if not report:
+        list(map(print, heatmap.Annotate(source)))
+        return
+    with open(report, "w") as file:
+        file.write(heatmap.Html(source, filename))
+
+def ParseArguments(arguments: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """ Split the command line arguments into files and options.
+    Haskell notation:
+        ParseArguments :: [String] -> Tuple
+    Options are written as '--name=value' or '--name'.
+    Parameters:
+        arguments (Lst): The command line arguments without the script name.
+    Returns:
+        files (Lst): All arguments which are not an option.
+        options (Dict): The options with their values, flags have the value "".
+    """
+    files = list(filter(lambda argument: not argument.startswith("--"), arguments))
+    options = filter(lambda argument: argument.startswith("--"), arguments)
+    options = dict(map(lambda option: (option[2:].split("=", 1) + [""])[:2], options))
+    return files, options
+
+def CheckEngine(options: Dict[str, str]) -> None:
+    """ Stop when options which choose how the program is interpreted are combined.
+    Haskell notation:
+        CheckEngine :: Dict -> None
+    The TreeOptions interpret the program with VisitNode themselves, so they can't be combined
+    with another engine or with each other. Only the virtual machine has a maximum amount of frames.
+    Parameters:
+        options (Dict): The options with their values, see ParseArguments.
+    """
+    chosen = list(map(lambda option: f"--{option}", filter(lambda option: option in options, TreeOptions)))
+    if options.get("engine", "tree") != "tree":
+        chosen = [f"--engine={options['engine']}"] + chosen
+    if len(chosen) > 1:
+        sys.exit(f"{' and '.join(chosen)} can't be combined, each of them chooses how the program is interpreted..")
+    if "frames" in options and chosen != ["--engine=vm"]:
+        sys.exit("--frames only works with --engine=vm..")
 
 if __name__ == '__main__':
     symbols = SymbolDictionary()
     context = Context()
     context.symbolDictionary = symbols
 
-    if len(sys.argv) == 2:
-        InterpretFile(sys.argv[1])
-    elif len(sys.argv) == 3:
-        CompileFile(sys.argv[1], sys.argv[2])
+    files, options = ParseArguments(sys.argv[1:])
+    CheckEngine(options)
+    lexerName, parserName = options.get("lexer", "linear" if "heatmap" in options else "recursive"), options.get("parser", "recursive")
+    reader = f"{lexerName}/{parserName}"
+    read = partial(ReadProgram, lexer=Lexers[lexerName], parser=Parsers[parserName])
+    cacheDirectory = options.get("cache") or None
+    if "cache" in options:
+        read = partial(LoadProgram, parse=read, directory=cacheDirectory, reader=reader)
+    if "short-circuit" in options:
+        read = partial(ReadShortCircuit, read=read)
+
+    execute = Engines[options.get("engine", "tree")]
+    if "frames" in options and options.get("engine") == "vm":
+        execute = partial(execute, maxFrames=int(options["frames"]))
+    if "parallel" in options:
+        execute = partial(VisitParallel, workers=int(options["parallel"]) if options["parallel"] else None)
+    if "profile" in options:
+        profile = Profile()
+        execute = partial(VisitProfiled, profile=profile)
+    if "heatmap" in options:
+        heatmap = Heatmap()
+        execute = partial(VisitHeated, heatmap=heatmap)
+    cacheSize = int(options["memoize"] or CacheSize) if "memoize" in options else 0
+
+    if "prewarm" in options and not (options["prewarm"] or files):
+        print("I need an input file to do anything..")
+    elif "prewarm" in options:
+        print(f"{PrewarmCache(options['prewarm'] or files[0], read, cacheDirectory, reader)} files are in the cache..")
+    elif "batch" in options and not (options["batch"] or files):
+        print("I need an input file to do anything..")
+    elif "batch" in options:
+        jobs = Jobs(options["batch"] or files[0])
+        workers = int(options["workers"]) if options.get("workers") else None
+        list(map(partial(print, flush=True), StreamResults(jobs, read, execute, "no-optimize" not in options, cacheSize, workers)))
+    elif "serve" in options:
+        lexer = Lexers[options.get("lexer", "linear")]
+        readSource = partial(ReadSource, lexer=LexLinear if lexer == LexStream else lexer, parser=Parsers[options.get("parser", "recursive")])
+        if "short-circuit" in options:
+            readSource = partial(ReadShortCircuit, read=readSource)
+        workers = int(options["workers"]) if options.get("workers") else None
+        Serve(options["serve"] or "aap.sock", readSource, execute, "no-optimize" not in options, cacheSize, workers)
+    elif len(files) == 1:
+        InterpretFile(files[0], read, execute, "no-optimize" not in options, cacheSize)
+        if "memo-stats" in options:
+            PrintCaches(context)
+        if "profile" in options:
+            WriteProfile(profile, options["profile"] or "profile.folded")
+        if "heatmap" in options:
+            WriteHeatmap(heatmap, files[0], options["heatmap"])
+    elif len(files) == 2:
+        CompileFile(files[0], files[1], read, "no-optimize" not in options, "peephole-report" in options)
     else:
         print("I need an input file to do anything..")
\ No newline at end of file